@@ -0,0 +1,598 @@
+"""claude.md 생성기 성능 점검 스크립트.
+
+실행: python scripts/bench_claude_docs.py <command>
+- memory: 합성 디렉터리에서 --stream 전체 실행의 최대 메모리가 파일 수와 무관한 고정 상한 안에 있는지 tracemalloc으로 검증
+- extractors: 고정 픽스처로 추출기별 처리량을 측정하고 골든 출력·기준선(baseline)과 비교
+- sections: 튜플 리스트 인덱스와 SectionTable(array('I') + 문자열 테이블)의 보유 메모리 비교
+- adversarial: 공백 연속·닫히지 않은 블록 주석·압축 코드 같은 적대적 줄에서 마커 파서의 바이트당 시간이 줄 길이와 무관한지 검증
+- io: 같은 합성 트리를 디스크와 MemoryFileSystem 백엔드로 생성해 단계별 I/O 비용과 CPU 비용을 분리
+- daemon: 변경 없는 warm 데몬 요청이 같은 프로세스의 cold 전체 생성 대비 충분히 빠른지 검증
+
+generate_claude_docs.py·claude_docs 패키지 외의 의존성은 없으며 실패 시 종료 코드 1을 반환합니다.
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import math
+import re
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import Counter
+from pathlib import Path
+from typing import Callable, Iterator, Optional, Sequence
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from claude_docs import extraction  # noqa: E402
+from claude_docs.api import extract  # noqa: E402
+from claude_docs.cache import SectionCache  # noqa: E402
+from claude_docs.compact_index import SectionTable  # noqa: E402
+from claude_docs.daemon import WarmState, handle_daemon_request  # noqa: E402
+from claude_docs.extraction import SECTION_MARKER_MAX_CHARS  # noqa: E402
+from claude_docs.filemap import tracked_files  # noqa: E402
+from claude_docs.fs import LOCAL_FILESYSTEM, FileSystem, MemoryFileSystem, using_filesystem  # noqa: E402
+from claude_docs.indexes import load_directory_stats  # noqa: E402
+from claude_docs.model import Entry, Workspace  # noqa: E402
+from claude_docs.pipeline import RunStats, regenerate_all  # noqa: E402
+import generate_claude_docs  # noqa: E402,F401  레지스트리(add() 항목) 등록
+
+
+# SECTION: Synthetic Trees - 합성 디렉터리 생성
+SYNTHETIC_SECTIONS_PER_FILE = 8
+SYNTHETIC_LINES_PER_SECTION = 40
+
+
+def synthetic_source(sections: int = SYNTHETIC_SECTIONS_PER_FILE) -> str:
+    blocks: list[str] = []
+    for index in range(sections):
+        blocks.append(f"// SECTION: Part {index} - 합성 섹션 {index}")
+        blocks.append(f"export const value{index} = {index};")
+        blocks.extend(f"const filler{index}_{line} = {line};" for line in range(SYNTHETIC_LINES_PER_SECTION))
+    return "\n".join(blocks) + "\n"
+
+
+def build_synthetic_entry(root: Path, file_count: int) -> Entry:
+    directory = root / 'synthetic'
+    directory.mkdir(parents=True, exist_ok=True)
+    body = synthetic_source()
+    for index in range(file_count):
+        (directory / f"module_{index:06d}.ts").write_text(body, encoding='utf-8')
+    return Entry(
+        title='synthetic - 메모리 벤치마크',
+        purpose=['합성 파일로 구성된 대형 디렉터리입니다.'],
+        responsibilities=[],
+        structure=[],
+        centralization=[],
+        rules=[],
+        references=[],
+        file_map_path=directory.as_posix(),
+    )
+
+
+def measure_peak(run: Callable[[], object]) -> int:
+    tracemalloc.start()
+    try:
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+# SECTION: Memory Benchmark - 스트리밍 모드 최대 메모리 검증
+# 실제 `--stream` 실행(regenerate_all(stream=True))을 재며, 파일 수와 관계없이 고정 상한 하나로 검사합니다.
+# 파일명 정렬은 NAME_SORT_RUN개씩 임시 파일로 나눠 병합하므로 마지막 크기는 런 병합을 한 번 거치는 트리입니다.
+# pathlib이 파일명을 sys.intern()에 넣어 인터프리터의 인턴 문자열 테이블이 한 번 커지는 구간(약 0.4 MiB, 크기 조정 중 두 배)이
+# 수천~2만 파일 사이에 있으며, 그 뒤로는 파일 수가 늘어도 최대 메모리가 그대로입니다(4만 파일에서 확인).
+DEFAULT_FILE_COUNTS = (250, 1000, 4000, 20000)
+DEFAULT_TARGET_KIB = 1536
+
+
+def run_memory(file_counts: Sequence[int], target_kib: int) -> int:
+    failures = 0
+    target = target_kib * 1024
+    print(f"{'files':>8} {'buffered KiB':>13} {'stream KiB':>11} {'target KiB':>11}")
+    for count in file_counts:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            (root / '.git').mkdir()
+            entry = build_synthetic_entry(root, count)
+            entry.file_map_path = 'synthetic'
+            workspace = Workspace(root=root, docs={'synthetic/claude.md': entry})
+            output = workspace.resolve('synthetic/claude.md')
+            buffered = measure_peak(lambda: regenerate_all(SectionCache(), workspace=workspace))
+            expected, expected_stats = output.read_bytes(), load_directory_stats(workspace)
+            output.unlink()
+            streamed = measure_peak(lambda: regenerate_all(SectionCache(retain=False), stream=True, workspace=workspace))
+            if output.read_bytes() != expected or load_directory_stats(workspace) != expected_stats:
+                print(f"{count:>8} 스트리밍 출력이 일반 출력과 다릅니다", file=sys.stderr)
+                failures += 1
+        status = 'ok' if streamed <= target else 'FAIL'
+        if streamed > target:
+            failures += 1
+        print(f"{count:>8} {buffered // 1024:>13} {streamed // 1024:>11} {target_kib:>11} {status}")
+    return 1 if failures else 0
+
+
+# SECTION: Extractor Benchmarks - 추출기별 처리량과 골든 출력 검증
+# 픽스처는 실제 저장소 파일을 고정(freeze)한 사본이며, 도구가 소스로 인식하지 않도록 .txt 확장자를 붙입니다.
+# MB/s는 기계마다 크게 다르므로 기준선에는 같은 프로세스에서 잰 보정 루프 대비 비율(relative)만 저장합니다.
+# 비율은 표본 --samples개의 중앙값이고, 표본 간 흩어짐(MAD)도 함께 저장해 허용 감소율을 잡음만큼 넓힙니다.
+# 기준선 갱신: 추출기를 의도적으로 바꿨거나 CI 러너 종류가 바뀌었을 때 그 러너에서
+#   python scripts/bench_claude_docs.py extractors --update-baseline
+# 을 실행하고 바뀐 bench_fixtures/extractors/baseline.json을 커밋합니다(골든 출력이 다르면 갱신하지 않음).
+SCRIPTS_DIR = Path(__file__).resolve().parent
+FIXTURE_DIR = SCRIPTS_DIR / 'bench_fixtures' / 'extractors'
+GOLDEN_PATH = FIXTURE_DIR / 'golden.json'
+BASELINE_PATH = FIXTURE_DIR / 'baseline.json'
+DEFAULT_MAX_REGRESSION_PCT = 25.0
+DEFAULT_REPEAT = 5
+DEFAULT_SAMPLES = 9
+# 허용 감소율 = max(--max-regression, 이 값 × 현재·기준선 표본 흩어짐의 합성값)
+NOISE_SIGMAS = 3.0
+# MAD를 정규분포 표준편차로 환산하는 계수
+MAD_TO_SIGMA = 1.4826
+CALIBRATION_PATTERN = re.compile(r"\s*(?://|#|--)\s*SECTION:")
+
+EXTRACTOR_CASES: tuple[tuple[str, str, str], ...] = (
+    # (케이스 이름, 원본 경로, 추출기 함수명)
+    ('ts:ImprovedDashboard', 'src/components/dashboard/ImprovedDashboard.tsx', '_extract_ts_sections'),
+    ('ts:brand', 'src/config/brand.ts', '_extract_ts_sections'),
+    ('md:Database-Structure-Analysis-Report', 'docs/Database-Structure-Analysis-Report.md', '_extract_markdown_sections'),
+    ('md:LOCAL-STORAGE-DEVELOPMENT-TASKS', 'docs/LOCAL-STORAGE-DEVELOPMENT-TASKS.md', '_extract_markdown_sections'),
+    ('md:DUALWRITE-DESIGN-FLAW', 'docs/DUALWRITE-DESIGN-FLAW.md', '_extract_markdown_sections'),
+    ('py:generate_claude_docs', 'scripts/generate_claude_docs.py', '_extract_python_sections'),
+)
+
+
+def fixture_path(source: str) -> Path:
+    return FIXTURE_DIR / f"{Path(source).name}.txt"
+
+
+def freeze_fixtures() -> None:
+    """Copy the current repository files into the fixture set and rewrite the golden outputs."""
+    repo_root = SCRIPTS_DIR.parent
+    FIXTURE_DIR.mkdir(parents=True, exist_ok=True)
+    for _, source, _ in EXTRACTOR_CASES:
+        shutil.copyfile(repo_root / source, fixture_path(source))
+    golden = {name: [list(section) for section in run_extractor(source, func)] for name, source, func in EXTRACTOR_CASES}
+    GOLDEN_PATH.write_text(json.dumps(golden, ensure_ascii=False, indent=1) + '\n', encoding='utf-8')
+
+
+def load_fixture_lines(source: str) -> tuple[list[str], int]:
+    data = fixture_path(source).read_bytes()
+    return data.decode('utf-8').splitlines(), len(data)
+
+
+def run_extractor(source: str, func_name: str) -> list[tuple[int, int, str, str]]:
+    lines, _ = load_fixture_lines(source)
+    return getattr(extraction, func_name)(lines)
+
+
+def time_extractor(func: Callable[[list[str]], object], lines: list[str], repeat: int) -> float:
+    """Best-of-N wall time; the minimum is the least noisy estimate on shared CI runners."""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(lines)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def calibration_loop(lines: list[str]) -> int:
+    """Line loop with the same kind of work as the extractors (strip, prefix checks, one regex)."""
+    found = 0
+    for line in lines:
+        stripped = line.strip()
+        if stripped.startswith(('//', '#', '--', '/*')) and CALIBRATION_PATTERN.match(line):
+            found += len(stripped.split(' - ', 1))
+    return found
+
+
+def time_calibrated(func: Callable[[list[str]], object], lines: list[str], repeat: int) -> tuple[float, float]:
+    """(best extractor time, best calibration MB/s), alternating the two so both see the same load."""
+    text = synthetic_source(64)
+    calibration_lines = text.splitlines()
+    best = calibration = float('inf')
+    for _ in range(repeat):
+        best = min(best, time_extractor(func, lines, 1))
+        calibration = min(calibration, time_extractor(calibration_loop, calibration_lines, 1))
+    return best, len(text.encode('utf-8')) / calibration / 1e6
+
+
+def sample_throughput(
+    func: Callable[[list[str]], object], lines: list[str], size: int, repeat: int, samples: int
+) -> list[tuple[float, float]]:
+    """``samples`` independent (extractor MB/s, MB/s ÷ calibration MB/s) pairs, each from best-of-``repeat`` timings."""
+    measured = []
+    for _ in range(samples):
+        elapsed, calibration = time_calibrated(func, lines, repeat)
+        throughput = size / elapsed / 1e6
+        measured.append((throughput, throughput / calibration))
+    return measured
+
+
+def spread_pct(ratios: Sequence[float]) -> float:
+    """Noise of the samples as a percentage of their median (MAD scaled to a standard deviation)."""
+    median = statistics.median(ratios)
+    deviation = statistics.median(abs(ratio - median) for ratio in ratios)
+    return deviation * MAD_TO_SIGMA / median * 100 if median else 0.0
+
+
+def run_extractors(max_regression_pct: float, repeat: int, samples: int, update_baseline: bool) -> int:
+    golden = json.loads(GOLDEN_PATH.read_text(encoding='utf-8'))
+    baseline = json.loads(BASELINE_PATH.read_text(encoding='utf-8')) if BASELINE_PATH.exists() else {}
+    results: dict[str, dict[str, float]] = {}
+    failures = 0
+
+    # 부하 변화가 두 측정에 같이 반영되도록 케이스마다 추출기와 보정 루프를 번갈아 잼
+    print(f"relative = 추출기 MB/s ÷ 번갈아 잰 보정 루프 MB/s (표본 {samples}개 중앙값, ±는 흩어짐)")
+    print(f"{'case':<40} {'MB/s':>8} {'relative':>9} {'±%':>5} {'baseline':>9} {'delta':>8} {'allowed':>8}")
+    for name, source, func_name in EXTRACTOR_CASES:
+        lines, size = load_fixture_lines(source)
+        func = getattr(extraction, func_name)
+        output = [list(section) for section in func(lines)]
+        if output != golden.get(name):
+            print(f"{name:<40} 골든 출력과 다릅니다", file=sys.stderr)
+            failures += 1
+            continue
+
+        measured = sample_throughput(func, lines, size, repeat, samples)
+        throughput = statistics.median(value for value, _ in measured)
+        ratios = [ratio for _, ratio in measured]
+        relative = statistics.median(ratios)
+        noise = spread_pct(ratios)
+        results[name] = {'relative': round(relative, 4), 'spread_pct': round(noise, 2), 'bytes': size, 'sections': len(output)}
+
+        reference = baseline.get(name, {}).get('relative')
+        if reference:
+            delta = (relative - reference) / reference * 100
+            allowed = max(max_regression_pct, NOISE_SIGMAS * math.hypot(noise, baseline[name].get('spread_pct', 0.0)))
+            regressed = delta < -allowed
+            failures += int(regressed and not update_baseline)
+            mark = ' FAIL' if regressed else ''
+            print(
+                f"{name:<40} {throughput:>8.2f} {relative:>9.3f} {noise:>5.1f} {reference:>9.3f} "
+                f"{delta:>+7.1f}% {allowed:>7.1f}%{mark}"
+            )
+        else:
+            print(f"{name:<40} {throughput:>8.2f} {relative:>9.3f} {noise:>5.1f} {'-':>9} {'-':>8} {'-':>8}")
+
+    if update_baseline:
+        if failures:
+            print('골든 출력이 달라 기준선을 갱신하지 않았습니다', file=sys.stderr)
+        else:
+            BASELINE_PATH.write_text(json.dumps(results, ensure_ascii=False, indent=2) + '\n', encoding='utf-8')
+            print(f"기준선 갱신: {BASELINE_PATH.relative_to(SCRIPTS_DIR.parent)}")
+    return 1 if failures else 0
+
+
+# SECTION: Section Index Memory - 튜플 인덱스와 SectionTable 보유 메모리 비교
+# 저장소의 실제 섹션을 틀로 삼아 복제하되, 저장소 안에서 이미 반복되는 제목·설명만 그대로 두고
+# 나머지는 복제본마다 고유하게 바꿔 실제 중복률을 넘는 중복 제거 효과가 잡히지 않게 함
+DEFAULT_SECTION_COUNT = 100_000
+DEFAULT_MIN_SAVINGS_PCT = 40.0
+
+
+def corpus_sections() -> list[tuple[str, list[tuple[int, int, str, str]]]]:
+    workspace = Workspace(SCRIPTS_DIR.parent)
+    files = sorted({
+        file
+        for entry in workspace.docs.values()
+        for file in tracked_files(entry, root=workspace.root) or []
+    })
+    index = extract(files)
+    return [(name, index[name]) for name in index if index.section_count(name)]
+
+
+def synthetic_sections(count: int) -> Iterator[tuple[str, list[tuple[int, int, str, str]]]]:
+    """Yield (file, sections) until ``count`` sections; every string is a fresh object as after extraction."""
+    corpus = corpus_sections()
+    seen = Counter(text for _, sections in corpus for section in sections for text in section[2:])
+    produced = 0
+    for copy in itertools.count():
+        for name, sections in corpus:
+            rows = []
+            for start, end, title, desc in sections[:count - produced]:
+                title = title if seen[title] > 1 else f"{title}#{copy}"
+                desc = desc if seen[desc] > 1 else f"{desc}#{copy}"
+                rows.append((start, end, (title + '.')[:-1], (desc + '.')[:-1]))
+            produced += len(rows)
+            yield f"copy{copy}/{name}", rows
+            if produced >= count:
+                return
+
+
+def retained_bytes(build: Callable[[], object]) -> tuple[int, object]:
+    tracemalloc.start()
+    try:
+        result = build()
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return current, result
+
+
+def run_sections(count: int, min_savings_pct: float) -> int:
+    tuples_bytes, tuples = retained_bytes(lambda: dict(synthetic_sections(count)))
+
+    def build_table() -> SectionTable:
+        table = SectionTable()
+        table.update(synthetic_sections(count))
+        return table
+
+    table_bytes, table = retained_bytes(build_table)
+    if any(table[name] != sections for name, sections in tuples.items()):
+        print('SectionTable 조회 결과가 튜플 인덱스와 다릅니다', file=sys.stderr)
+        return 1
+
+    savings = (1 - table_bytes / tuples_bytes) * 100
+    print(f"{'representation':<16} {'sections':>9} {'files':>7} {'KiB':>9} {'B/section':>10}")
+    for label, size in (('tuples', tuples_bytes), ('SectionTable', table_bytes)):
+        print(f"{label:<16} {count:>9,} {len(tuples):>7,} {size // 1024:>9,} {size / count:>10.1f}")
+    print(f"문자열 테이블 {len(table.strings):,}개 · 절감 {savings:.1f}% (최소 {min_savings_pct:.1f}%)")
+    return 0 if savings >= min_savings_pct else 1
+
+
+# SECTION: Adversarial Lines - 마커 파서의 바이트당 처리 시간 상한 검증
+# 예전 정규식(지연 제목 + 선택적 설명 + 끝 공백)이 이차 시간으로 되돌아가던 줄 모양을 길이별로 만들어,
+# 가장 긴 줄의 ns/byte가 가장 짧은 줄 대비 일정 배수를 넘지 않는지 확인합니다.
+# parser 케이스는 줄 길이 상한(SECTION_MARKER_MAX_CHARS)을 거치지 않고 본문 파서를 직접 호출합니다.
+DEFAULT_LINE_LENGTHS = (256, 4096, 65_536, 1_048_576)
+DEFAULT_CORPUS_BYTES = 2 * 1024 * 1024
+DEFAULT_MAX_GROWTH = 2.0
+ADVERSARIAL_REPEAT = 3
+
+ADVERSARIAL_CASES: tuple[tuple[str, str, bool, Callable[[int], str]], ...] = (
+    # (케이스 이름, 함수명, 줄 단위 호출 여부, 길이 n의 줄 생성기)
+    ('ts:title-whitespace', '_extract_ts_sections', False, lambda n: '// SECTION: a' + ' ' * n + 'b'),
+    ('ts:unclosed-block', '_extract_ts_sections', False, lambda n: '/* SECTION: ' + 'x' * (n // 2) + ' - ' + 'y' * (n // 2)),
+    ('ts:minified', '_extract_ts_sections', False, lambda n: ('const a=1;' * (n // 10 + 1))[:n]),
+    ('css:close-whitespace', '_extract_css_sections', False, lambda n: '/* SECTION: a - b' + ' ' * n + 'c */'),
+    ('py:title-whitespace', '_extract_python_sections', False, lambda n: '# SECTION: a' + ' ' * n + 'b'),
+    ('md:heading-whitespace', '_extract_markdown_sections', False, lambda n: '## a' + ' ' * n + 'b'),
+    ('sql:title-whitespace', '_extract_sql_sections', False, lambda n: '-- SECTION: a' + '\t' * n + 'b'),
+    ('parser:title-whitespace', '_split_marker_tail', True, lambda n: ' a' + ' ' * n + 'b'),
+    ('parser:dashes', '_split_marker_tail', True, lambda n: ' a' + ' -' * (n // 2)),
+    ('parser:unclosed-block', '_split_block_marker_tail', True, lambda n: 'x' * (n // 2) + ' - ' + 'y' * (n // 2)),
+    ('parser:close-whitespace', '_split_block_marker_tail', True, lambda n: 'a - b' + ' ' * n + 'c */'),
+    ('parser:heading-whitespace', '_split_heading_tail', True, lambda n: ' a' + ' ' * n + 'b'),
+)
+
+
+def adversarial_runner(func_name: str, per_line: bool) -> Callable[[list[str]], object]:
+    func = getattr(extraction, func_name)
+    if per_line:
+        return lambda lines: [func(line) for line in lines]
+    return func
+
+
+def run_adversarial(lengths: Sequence[int], corpus_bytes: int, max_growth: float) -> int:
+    lengths = sorted(lengths)
+    failures = 0
+    header = ''.join(f"{f'{length:,}B':>11}" for length in lengths)
+    print(f"{'case (ns/byte)':<28}{header} {'growth':>8}")
+    for name, func_name, per_line, make_line in ADVERSARIAL_CASES:
+        run = adversarial_runner(func_name, per_line)
+        per_byte: list[float] = []
+        for length in lengths:
+            line = make_line(length)
+            lines = [line] * max(1, corpus_bytes // len(line))
+            elapsed = time_extractor(run, lines, ADVERSARIAL_REPEAT)
+            per_byte.append(elapsed / (len(line) * len(lines)) * 1e9)
+        growth = per_byte[-1] / per_byte[0]
+        failed = growth > max_growth
+        failures += int(failed)
+        cells = ''.join(f"{value:>11.3f}" for value in per_byte)
+        print(f"{name:<28}{cells} {growth:>7.2f}x{' FAIL' if failed else ''}")
+    print(f"마커 최대 길이 {SECTION_MARKER_MAX_CHARS:,}자 · 허용 증가 {max_growth:.1f}x")
+    return 1 if failures else 0
+
+
+# SECTION: Filesystem Backends - 디스크·메모리 백엔드 비교로 I/O 비용 분리
+# 두 백엔드는 같은 코드 경로를 타므로 단계별 시간 차이가 곧 디스크 I/O(시스템 호출) 비용입니다.
+# 메모리 트리의 파일은 같은 bytes 객체를 공유하므로 10만 파일도 내용 한 벌 크기만 차지합니다.
+DEFAULT_IO_FILES = 20_000
+DEFAULT_IO_FILES_PER_DIR = 500
+IO_BACKENDS = ('disk', 'memory')
+
+
+def synthetic_tree(file_count: int, files_per_dir: int) -> tuple[dict[str, bytes], dict[str, Entry]]:
+    """(root-relative file contents, registry) with one claude.md per directory of ``files_per_dir`` modules."""
+    body = synthetic_source().encode('utf-8')
+    files: dict[str, bytes] = {}
+    docs: dict[str, Entry] = {}
+    for index in range(file_count):
+        directory = f"synthetic/d{index // files_per_dir:04d}"
+        files[f"{directory}/module_{index:06d}.ts"] = body
+        if f"{directory}/claude.md" not in docs:
+            docs[f"{directory}/claude.md"] = Entry(
+                title=f"{directory} - I/O 벤치마크",
+                purpose=['합성 파일로 구성된 디렉터리입니다.'],
+                responsibilities=[],
+                structure=[],
+                centralization=[],
+                rules=[],
+                references=[],
+                file_map_path=directory,
+            )
+    return files, docs
+
+
+def run_backend(root: Path, docs: dict[str, Entry], backend: FileSystem) -> list[RunStats]:
+    """Cold then warm regenerate_all() on one backend; the warm run reuses the cache."""
+    cache = SectionCache()
+    runs = []
+    with using_filesystem(backend):
+        for _ in range(2):
+            stats = RunStats()
+            regenerate_all(cache, stats=stats, workspace=Workspace(root=root, docs=dict(docs)))
+            runs.append(stats)
+    return runs
+
+
+def run_io(file_count: int, files_per_dir: int, backends: Sequence[str]) -> int:
+    files, docs = synthetic_tree(file_count, files_per_dir)
+    results: dict[str, list[RunStats]] = {}
+    outputs: dict[str, list[bytes]] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        for name in backends:
+            if name == 'disk':
+                backend: FileSystem = LOCAL_FILESYSTEM
+                for relative, data in files.items():
+                    (root / relative).parent.mkdir(parents=True, exist_ok=True)
+                    (root / relative).write_bytes(data)
+            else:
+                backend = MemoryFileSystem({root / relative: data for relative, data in files.items()})
+            results[name] = run_backend(root, docs, backend)
+            outputs[name] = [backend.read_bytes(root / doc) for doc in sorted(docs)]
+
+    if len({tuple(value) for value in outputs.values()}) > 1:
+        print('백엔드별 출력이 서로 다릅니다', file=sys.stderr)
+        return 1
+
+    print(f"{file_count:,}개 파일 · 문서 {len(docs)}개 · 디렉터리당 {files_per_dir}개")
+    header = ''.join(f"{name + ' ms':>12}" for name in backends)
+    io_column = f" {'I/O ms':>9} {'I/O %':>6}" if len(backends) == 2 else ''
+    for label, position in (('cold', 0), ('warm', 1)):
+        print(f"\n[{label}]\n{'phase':<16}{header}{io_column}")
+        runs = [results[name][position] for name in backends]
+        phases = list(dict.fromkeys(phase for run in runs for phase in run.phases))
+        rows = [(phase, [run.phases.get(phase, 0.0) for run in runs]) for phase in phases]
+        rows.append(('total', [run.duration for run in runs]))
+        for phase, seconds in rows:
+            cells = ''.join(f"{value * 1000:>12.1f}" for value in seconds)
+            if io_column:
+                spent = seconds[0] - seconds[1]
+                share = spent / seconds[0] * 100 if seconds[0] else 0.0
+                cells += f" {spent * 1000:>9.1f} {share:>5.0f}%"
+            print(f"{phase:<16}{cells}")
+    return 0
+
+
+# SECTION: Daemon Latency - 변경 없는 warm 데몬 요청 지연 검증
+# 절대 ms는 기계마다 다르므로 같은 프로세스에서 잰 cold 전체 생성 시간 대비 비율로 판정하고,
+# --max-ms는 기준 기계에서만 쓰는 선택적 절대 상한입니다.
+DEFAULT_DAEMON_FILES = 2_000
+DEFAULT_DAEMON_FILES_PER_DIR = 20
+DEFAULT_DAEMON_REQUESTS = 20
+DEFAULT_MAX_DAEMON_RATIO = 0.1
+
+
+def run_daemon(file_count: int, files_per_dir: int, requests: int, max_ratio: float, max_ms: Optional[float]) -> int:
+    files, docs = synthetic_tree(file_count, files_per_dir)
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        for relative, data in files.items():
+            (root / relative).parent.mkdir(parents=True, exist_ok=True)
+            (root / relative).write_bytes(data)
+        cache = SectionCache()
+        state = WarmState(Workspace(root=root, docs=dict(docs)))
+        started = time.perf_counter()
+        state.refresh(sorted(docs), cache)
+        cold = time.perf_counter() - started
+
+        latencies: list[float] = []
+        for _ in range(requests):
+            started = time.perf_counter()
+            response = handle_daemon_request(cache, {'op': 'regenerate'}, state)
+            latencies.append(time.perf_counter() - started)
+            if response['entries']:
+                print(f"변경 없는 트리에서 문서를 다시 생성했습니다: {response['entries'][:3]}", file=sys.stderr)
+                return 1
+
+        changed = root / next(iter(files))
+        changed.write_bytes(changed.read_bytes() + b"// SECTION: Added - added\n")
+        started = time.perf_counter()
+        response = handle_daemon_request(cache, {'op': 'regenerate'}, state)
+        single = time.perf_counter() - started
+        if len(response['entries']) != 1:
+            print(f"파일 하나를 바꿨는데 문서 {len(response['entries'])}개를 다시 생성했습니다", file=sys.stderr)
+            return 1
+
+    warm = statistics.median(latencies)
+    ratio = warm / cold
+    print(f"{file_count:,}개 파일 · 문서 {len(docs)}개 · 요청 {requests}회")
+    print(f"cold 전체 생성      {cold * 1000:>9.1f} ms")
+    print(f"warm 요청 (중앙값)  {warm * 1000:>9.1f} ms  ({ratio:.3f}x, 허용 {max_ratio:.3f}x)")
+    print(f"파일 1개 변경 요청  {single * 1000:>9.1f} ms")
+    failed = ratio > max_ratio
+    if max_ms is not None and warm * 1000 > max_ms:
+        print(f"warm 요청이 {max_ms:.1f}ms 상한을 넘었습니다", file=sys.stderr)
+        failed = True
+    return 1 if failed else 0
+
+
+# SECTION: CLI Entry Point - 벤치마크 실행 지점
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='claude.md 생성기 벤치마크')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    memory_parser = subparsers.add_parser('memory', help='스트리밍 모드 최대 메모리 검증')
+    memory_parser.add_argument('--files', type=int, nargs='+', default=list(DEFAULT_FILE_COUNTS))
+    memory_parser.add_argument('--target-kib', type=int, default=DEFAULT_TARGET_KIB)
+
+    extractor_parser = subparsers.add_parser('extractors', help='추출기 처리량 측정과 회귀 검사')
+    extractor_parser.add_argument('--max-regression', type=float, default=DEFAULT_MAX_REGRESSION_PCT,
+                                  help='기준선 대비 허용하는 처리량 감소율(%%)')
+    extractor_parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help='표본 하나를 만드는 최솟값 측정 횟수')
+    extractor_parser.add_argument('--samples', type=int, default=DEFAULT_SAMPLES, help='중앙값을 낼 표본 수')
+    extractor_parser.add_argument(
+        '--update-baseline', action='store_true',
+        help='측정값(중앙값과 흩어짐)으로 baseline.json 갱신: 추출기를 의도적으로 바꿨거나 CI 러너가 바뀌었을 때 그 러너에서 실행',
+    )
+    extractor_parser.add_argument('--freeze', action='store_true', help='현재 저장소 파일로 픽스처와 골든 출력을 다시 고정')
+
+    sections_parser = subparsers.add_parser('sections', help='섹션 인덱스 표현별 메모리 비교')
+    sections_parser.add_argument('--sections', type=int, default=DEFAULT_SECTION_COUNT)
+    sections_parser.add_argument('--min-savings', type=float, default=DEFAULT_MIN_SAVINGS_PCT,
+                                 help='튜플 인덱스 대비 요구하는 최소 절감률(%%)')
+
+    adversarial_parser = subparsers.add_parser('adversarial', help='적대적 긴 줄에서 마커 파서의 선형 시간 검증')
+    adversarial_parser.add_argument('--lengths', type=int, nargs='+', default=list(DEFAULT_LINE_LENGTHS))
+    adversarial_parser.add_argument('--corpus-bytes', type=int, default=DEFAULT_CORPUS_BYTES)
+    adversarial_parser.add_argument('--max-growth', type=float, default=DEFAULT_MAX_GROWTH,
+                                    help='가장 짧은 줄 대비 가장 긴 줄의 ns/byte 허용 배수')
+
+    io_parser = subparsers.add_parser('io', help='디스크·메모리 백엔드 비교로 단계별 I/O 비용 측정')
+    io_parser.add_argument('--files', type=int, default=DEFAULT_IO_FILES)
+    io_parser.add_argument('--files-per-dir', type=int, default=DEFAULT_IO_FILES_PER_DIR)
+    io_parser.add_argument('--backends', nargs='+', choices=IO_BACKENDS, default=list(IO_BACKENDS),
+                           help='비교할 백엔드 (memory만 지정하면 디스크를 전혀 쓰지 않음)')
+
+    daemon_parser = subparsers.add_parser('daemon', help='변경 없는 warm 데몬 요청 지연 검증')
+    daemon_parser.add_argument('--files', type=int, default=DEFAULT_DAEMON_FILES)
+    daemon_parser.add_argument('--files-per-dir', type=int, default=DEFAULT_DAEMON_FILES_PER_DIR)
+    daemon_parser.add_argument('--requests', type=int, default=DEFAULT_DAEMON_REQUESTS)
+    daemon_parser.add_argument('--max-ratio', type=float, default=DEFAULT_MAX_DAEMON_RATIO,
+                               help='같은 프로세스의 cold 전체 생성 대비 허용하는 warm 요청 시간 비율')
+    daemon_parser.add_argument('--max-ms', type=float, help='warm 요청 중앙값의 절대 상한(ms, 기준 기계 전용)')
+
+    args = parser.parse_args(argv)
+    if args.command == 'memory':
+        return run_memory(args.files, args.target_kib)
+    if args.command == 'extractors':
+        if args.freeze:
+            freeze_fixtures()
+        return run_extractors(args.max_regression, args.repeat, args.samples, args.update_baseline)
+    if args.command == 'sections':
+        return run_sections(args.sections, args.min_savings)
+    if args.command == 'adversarial':
+        return run_adversarial(args.lengths, args.corpus_bytes, args.max_growth)
+    if args.command == 'io':
+        return run_io(args.files, args.files_per_dir, args.backends)
+    if args.command == 'daemon':
+        return run_daemon(args.files, args.files_per_dir, args.requests, args.max_ratio, args.max_ms)
+    return 2
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
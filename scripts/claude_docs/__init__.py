@@ -0,0 +1,8 @@
+"""claude.md 생성기 패키지.
+
+레지스트리와 CLI는 scripts/generate_claude_docs.py 에 있고, 이 패키지는 추출·렌더링·상태 관리 로직을 모듈별로 나눠 담음.
+"""
+
+from .api import extract, generate  # noqa: F401
+from .fs import LocalFileSystem, MemoryFileSystem, using_filesystem  # noqa: F401
+from .model import Entry, Workspace  # noqa: F401
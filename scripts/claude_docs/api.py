@@ -0,0 +1,96 @@
+"""프로세스 내 호출용 generate()·extract() API."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Iterable, Optional, Union
+
+from .cache import SectionCache
+from .coalesce import RunCoalescer
+from .compact_index import SectionTable
+from .extraction import DEFAULT_TOKENIZER
+from .filemap import SectionIndex, tracked_files
+from .fs import FileSystem, using_filesystem
+from .model import DEFAULT_ROOT_LABEL, Entry, Workspace, load_registry
+from .pipeline import prefetch_sections, regenerate_all, worker_pool
+from .render import render_entry, render_root_document
+
+# SECTION: Python API - 프로세스 내 호출용 진입점
+# 모든 상태(레지스트리 사본, 캐시, 워커 풀)를 호출마다 만들어 넘기므로 테스트나 다른 도구에서 반복 호출해도 서로 영향이 없음
+def generate(
+    root: Union[str, Path] = '.',
+    entries: Optional[dict[str, Entry]] = None,
+    write: bool = False,
+    jobs: int = 1,
+    *,
+    label: str = DEFAULT_ROOT_LABEL,
+    tokenizer: str = DEFAULT_TOKENIZER,
+    cache: Optional[SectionCache] = None,
+    backend: Optional[FileSystem] = None,
+) -> dict[str, str]:
+    """Render every claude.md for ``root`` and return {root-relative doc path: content}.
+
+    ``entries`` replaces the root's own registry. Nothing is written unless ``write``
+    is set, in which case outputs, manifest and indexes are written as the CLI would,
+    under the same run lock.
+    Pass the same ``cache`` to later calls to keep extraction warm. ``backend`` (e.g. a
+    :class:`MemoryFileSystem`) replaces the disk for every read and write.
+    """
+    root_path = Path(root)
+    with using_filesystem(backend):
+        workspace = Workspace(
+            root=root_path,
+            label=label,
+            docs=dict(entries) if entries is not None else load_registry(root_path),
+        )
+        cache = cache or SectionCache(tokenizer=tokenizer)
+        doc_paths = sorted(path for path in workspace.docs if path != 'CLAUDE.md')
+
+        written: dict[Path, str] = {}
+        with worker_pool(jobs) as pool:
+            if write:
+                # CLI 실행·데몬과 같은 실행 잠금을 거쳐, 다른 프로세스가 쓰는 중이면 그 실행이 이어서 다시 생성
+                for _ in RunCoalescer([workspace]).passes():
+                    written.clear()
+                    regenerate_all(cache, workspace=workspace, pool=pool, outputs=written)
+            else:
+                files = [
+                    file for path in doc_paths for file in tracked_files(workspace.docs[path], cache, root_path) or []
+                ]
+                prefetch_sections(cache, files, pool)
+
+        # 이번 호출이 쓴 문서는 쓸 때 렌더링한 내용을 그대로 돌려주고, 쓰지 않았으면(다른 실행에 합쳐짐 포함) 여기서 렌더링
+        if written:
+            outputs = {path.relative_to(root_path).as_posix(): text for path, text in written.items()}
+        else:
+            outputs = {path: render_entry(workspace.docs[path], cache, root=root_path) for path in doc_paths}
+            if 'CLAUDE.md' in workspace.docs:
+                rendered = render_root_document(workspace)
+                if rendered is not None:
+                    path, text = rendered
+                    outputs[path.relative_to(root_path).as_posix()] = text
+        cache.trim_shared()
+        return outputs
+
+
+def extract(
+    paths: Iterable[Union[str, Path]],
+    jobs: int = 1,
+    *,
+    cache: Optional[SectionCache] = None,
+    backend: Optional[FileSystem] = None,
+) -> SectionIndex:
+    """Sections for each given source file, keyed by the path as given (POSIX form).
+
+    The result is a :class:`SectionTable`; each lookup returns a fresh list of tuples.
+    """
+    cache = cache or SectionCache()
+    files = [Path(path) for path in paths]
+    with using_filesystem(backend):
+        with worker_pool(jobs) as pool:
+            prefetch_sections(cache, files, pool)
+        index = SectionTable()
+        for file in files:
+            index[file.as_posix()] = cache.sections(file)
+    cache.trim_shared()
+    return index
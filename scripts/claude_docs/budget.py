@@ -0,0 +1,200 @@
+"""--budget-ms 시간 예산 실행."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Optional
+
+import json
+import sys
+import time
+
+from .cache import SectionCache
+from .filemap import SectionIndex, _tracked_names
+from .fs import _atomic_write_text, filesystem
+from .indexes import load_directory_stats, load_extract_costs, load_section_index
+from .manifest import _fingerprint_matches, find_stale_outputs, load_manifest
+from .model import STATE_DIR, Workspace
+from .pipeline import (
+    RunStats,
+    WorkerPool,
+    document_files,
+    estimate_extract_costs,
+    prefetch_sections,
+    record_run_state,
+    save_extract_costs,
+    write_documents,
+)
+
+# SECTION: Budgeted Runs - 시간 예산 안에서 가장 오래된 문서부터 갱신
+# git hook처럼 실행 시간이 제한된 곳에서 사용하며, 남은 문서는 다음 실행이 이어서 처리
+DEFERRED_PATH = STATE_DIR / 'deferred.json'
+DEFERRED_VERSION = 1
+# 마무리 단계(루트 문서·매니페스트·인덱스) 비용을 예산에서 미리 떼어 둠: 직전 실행의 측정값을 쓰고,
+# 측정값이 없는 첫 실행은 예산의 이 비율을 예약
+FIRST_RUN_FINALIZE_SHARE = 0.25
+
+
+def _load_deferred_state(workspace: Workspace) -> dict:
+    try:
+        data = json.loads(filesystem().read_text(workspace.resolve(DEFERRED_PATH)))
+    except (OSError, ValueError):
+        return {}
+    if data.get('version') != DEFERRED_VERSION:
+        return {}
+    return data
+
+
+def load_deferred(workspace: Optional[Workspace] = None) -> list[str]:
+    return list(_load_deferred_state(workspace or Workspace()).get('docs', []))
+
+
+def finalize_reserve_ms(budget_ms: int, workspace: Optional[Workspace] = None) -> float:
+    """Time to hold back for the root/manifest/index phases: the last run's measurement, else a share."""
+    measured = _load_deferred_state(workspace or Workspace()).get('finalize_ms')
+    if isinstance(measured, (int, float)):
+        return min(float(measured), float(budget_ms))
+    return budget_ms * FIRST_RUN_FINALIZE_SHARE
+
+
+def staleness_order(workspace: Optional[Workspace] = None) -> list[str]:
+    """Stale non-root docs: previously deferred ones first, then most changed input bytes, newest input."""
+    workspace = workspace or Workspace()
+    stale = {doc for doc, _ in find_stale_outputs(workspace) if doc != 'CLAUDE.md'}
+    deferred = [doc for doc in load_deferred(workspace) if doc in stale]
+    outputs: dict = load_manifest(workspace).get('outputs', {})
+    scores: dict[str, tuple[int, int]] = {}
+    for doc in stale.difference(deferred):
+        entry = workspace.docs[doc]
+        inputs: dict = (outputs.get(doc) or {}).get('inputs', {})
+        base = Path(entry.file_map_path or '.')
+        changed = newest = 0
+        for name in _tracked_names(entry, workspace.root) or []:
+            key = (base / name).as_posix()
+            path = workspace.resolve(key)
+            try:
+                stat = filesystem().stat(path)
+            except OSError:
+                continue
+            newest = max(newest, stat.st_mtime_ns)
+            if not _fingerprint_matches(path, inputs.get(key)):
+                changed += stat.st_size
+        scores[doc] = (changed, newest)
+    return deferred + sorted(scores, key=lambda doc: (-scores[doc][0], -scores[doc][1], doc))
+
+
+def prefetch_plan(
+    order: list[str],
+    deadline: float,
+    cache: SectionCache,
+    workspace: Workspace,
+    workers: int,
+    history: dict[str, float],
+) -> list[str]:
+    """Leading docs of ``order`` whose estimated extraction fits before ``deadline`` (at least one).
+
+    Estimates come from earlier runs' timings in ``history``; without any, only the first doc is
+    planned and later ones are extracted as the loop reaches them.
+    """
+    pending = {doc: cache.pending(document_files([doc], cache, workspace)) for doc in order}
+    flat = [item for doc in order for item in pending[doc]]
+    if not any(path.as_posix() in history for path, _ in flat):
+        return order[:1]
+    estimates = iter(estimate_extract_costs(flat, history))
+    available = (deadline - time.perf_counter()) * max(workers, 1)
+    planned: list[str] = []
+    for doc in order:
+        cost = sum(next(estimates) for _ in pending[doc])
+        if planned and cost > available:
+            break
+        available -= cost
+        planned.append(doc)
+    return planned
+
+
+def regenerate_budgeted(
+    budget_ms: int,
+    cache: Optional[SectionCache] = None,
+    stats: Optional[RunStats] = None,
+    workspace: Optional[Workspace] = None,
+    pool: Optional[WorkerPool] = None,
+) -> list[str]:
+    """Regenerate stale docs in staleness order until ``budget_ms`` is spent; persists the rest.
+
+    The budget runs from ``stats.started`` and covers planning, the docs and the finalize phases
+    (root document, manifest, side indexes); the finalize cost measured by the previous run is
+    reserved up front. Interpreter start-up, imports, waiting for the run lock and the
+    worker-pool start-up happen before ``stats`` exists and are not counted.
+
+    The first doc is always processed so a budget smaller than one doc still makes progress.
+    Later docs start only if the mean time per doc so far still fits in the remaining budget.
+    With a ``pool``, the docs expected to fit (see :func:`prefetch_plan`) are extracted in one
+    prefetch, later ones as they are reached, and the extraction timings are saved once.
+    """
+    workspace = workspace or Workspace()
+    docs = workspace.docs
+    if cache is None:
+        cache = SectionCache()
+    if stats is None:
+        stats = RunStats()
+    baseline = dict(cache.counters)
+    with stats.phase('plan'):
+        deadline = stats.started + (budget_ms - finalize_reserve_ms(budget_ms, workspace)) / 1000
+        order = staleness_order(workspace)
+        doc_index: dict[str, SectionIndex] = {
+            doc: index for doc, index in load_section_index(workspace).items() if doc in docs
+        }
+        directory_stats = load_directory_stats(workspace)
+
+    prefetching = pool is not None and cache.retain
+    costs = load_extract_costs(workspace) if prefetching else {}
+    planned: list[str] = []
+    fetched: list[Path] = []
+    extracted = 0
+    if prefetching and order:
+        with stats.phase('extract'):
+            planned = prefetch_plan(order, deadline, cache, workspace, pool.workers, costs)
+            fetched = document_files(planned, cache, workspace)
+            extracted += prefetch_sections(cache, fetched, pool, costs)
+
+    written: list[str] = []
+    done: list[str] = []
+    loop_started = time.perf_counter()
+    for doc in order:
+        if done:
+            per_doc = (time.perf_counter() - loop_started) / len(done)
+            if time.perf_counter() + per_doc > deadline:
+                break
+        if prefetching and doc not in planned:
+            with stats.phase('extract'):
+                files = document_files([doc], cache, workspace)
+                extracted += prefetch_sections(cache, files, pool, costs)
+                fetched.extend(files)
+        doc_written, index, totals = write_documents([doc], cache, stats, workspace)
+        written.extend(doc_written)
+        doc_index.update(index)
+        directory_stats.update(totals)
+        done.append(doc)
+    deferred = order[len(done):]
+    stats.counters['docs_deferred'] += len(deferred)
+    if extracted:
+        save_extract_costs(costs, fetched, workspace)
+
+    finalize_started = time.perf_counter()
+    refreshed = done + (['CLAUDE.md'] if 'CLAUDE.md' in docs else [])
+    record_run_state(refreshed, doc_index, directory_stats, cache, stats, workspace)
+    payload = {
+        'version': DEFERRED_VERSION,
+        'budget_ms': budget_ms,
+        'finalize_ms': round((time.perf_counter() - finalize_started) * 1000, 3),
+        'docs': deferred,
+    }
+    _atomic_write_text(workspace.resolve(DEFERRED_PATH), json.dumps(payload, ensure_ascii=False, indent=2) + '\n')
+    if deferred:
+        print(
+            f"시간 예산 {budget_ms}ms 초과: 문서 {len(done)}개 갱신, {len(deferred)}개는 다음 실행으로 미룸",
+            file=sys.stderr,
+        )
+    stats.absorb_cache(cache, baseline)
+    stats.duration = time.perf_counter() - stats.started
+    return written
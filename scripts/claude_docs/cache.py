@@ -0,0 +1,326 @@
+"""내용 주소 기반 공유 추출 캐시와 stat 기반 프로세스 내 캐시."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Iterable, NamedTuple, Optional
+
+import functools
+import hashlib
+import inspect
+import json
+import os
+from collections import defaultdict
+
+from . import extraction
+from .extraction import DEFAULT_TOKENIZER, TOKENIZERS, extract_sized_sections, format_file_map_bullets, resolve_tokenizer
+from .fs import LOCAL_FILESYSTEM, _atomic_write_text, filesystem
+from .ignore import ignore_rules_for
+from .profiling import memory_span, trace_span
+
+try:
+    import fcntl
+except ImportError:  # Windows에는 fcntl이 없으므로 잠금 없이 실행
+    fcntl = None  # type: ignore[assignment]
+
+# SECTION: Shared Extraction Cache - 작업 트리·CI 간 공유하는 내용 주소 기반 추출 캐시
+# 키는 (추출기 버전, 토크나이저, 확장자, 파일 내용) 해시뿐이라 경로·mtime이 다른 체크아웃에서도 재사용됨
+SHARED_CACHE_ENV = 'CLAUDE_DOCS_CACHE_DIR'
+SHARED_CACHE_LAYOUT = 'v1'
+DEFAULT_SHARED_CACHE_MAX_MB = 256
+SHARED_CACHE_LOCK_NAME = 'evict.lock'
+# 상한을 넘으면 이 비율까지 줄여 매 실행마다 축출이 반복되지 않게 함
+SHARED_CACHE_EVICT_TARGET = 0.9
+
+
+@functools.lru_cache(maxsize=None)
+def extractor_version(tokenizer: str = DEFAULT_TOKENIZER) -> str:
+    """Digest of the sources that produce a shared entry: the extraction module and the tokenizer.
+
+    Edits to rendering, manifests or indexes leave cached extraction results valid, so they keep
+    the shared cache warm. A ``module:function`` tokenizer adds its own source when it has one.
+    """
+    digest = hashlib.sha256(inspect.getsource(extraction).encode('utf-8'))
+    if tokenizer not in TOKENIZERS:
+        try:
+            digest.update(inspect.getsource(resolve_tokenizer(tokenizer)).encode('utf-8'))
+        except (OSError, TypeError):  # 소스가 없는 토크나이저(C 확장 등)는 키의 이름으로만 구분
+            pass
+    return digest.hexdigest()[:16]
+
+
+class SharedExtractionCache:
+    """Content-addressed extraction results in a directory several checkouts may share.
+
+    Entries are written to a temporary name and renamed into place, so readers never see
+    a partial entry; unreadable entries count as misses. A hit refreshes the entry's
+    mtime, which is the recency eviction uses. Eviction runs under a non-blocking
+    ``flock`` so concurrent runs do not scan the directory twice; deleting an entry another
+    process is reading is harmless (it becomes a miss).
+    """
+
+    def __init__(self, directory: Path, max_bytes: int = DEFAULT_SHARED_CACHE_MAX_MB * 1024 * 1024) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.stored = 0
+
+    def key(self, data: bytes, suffix: str, tokenizer: str) -> str:
+        digest = hashlib.sha256(f"{extractor_version(tokenizer)}\0{tokenizer}\0{suffix.lower()}\0".encode('utf-8'))
+        digest.update(data)
+        return digest.hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.directory / SHARED_CACHE_LAYOUT / key[:2] / f"{key[2:]}.json"
+
+    def get(
+        self, key: str
+    ) -> Optional[tuple[list[tuple[int, int, str, str]], list[tuple[int, int]], int]]:
+        path = self._entry_path(key)
+        try:
+            data = json.loads(path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass  # 읽기 전용으로 복원된 캐시: 적중은 유지하고 최근 사용 시각만 갱신하지 못함
+        return (
+            [tuple(section) for section in data['sections']],
+            [tuple(size) for size in data['sizes']],
+            data['lines'],
+        )
+
+    def put(
+        self,
+        key: str,
+        sections: list[tuple[int, int, str, str]],
+        sizes: list[tuple[int, int]],
+        line_count: int,
+    ) -> None:
+        payload = {'sections': sections, 'sizes': sizes, 'lines': line_count}
+        try:
+            _atomic_write_text(self._entry_path(key), json.dumps(payload, ensure_ascii=False), LOCAL_FILESYSTEM)
+        except OSError:
+            return
+        self.stored += 1
+
+    def evict(self) -> int:
+        """Drop least recently used entries once the directory exceeds ``max_bytes``."""
+        root = self.directory / SHARED_CACHE_LAYOUT
+        if not root.is_dir():
+            return 0
+        handle = None
+        if fcntl is not None:
+            handle = (self.directory / SHARED_CACHE_LOCK_NAME).open('a')
+            try:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                handle.close()
+                return 0
+        try:
+            entries: list[tuple[int, int, str]] = []
+            total = 0
+            for bucket in os.scandir(root):
+                if not bucket.is_dir(follow_symlinks=False):
+                    continue
+                for item in os.scandir(bucket.path):
+                    try:
+                        stat = item.stat(follow_symlinks=False)
+                    except OSError:
+                        continue
+                    entries.append((stat.st_mtime_ns, stat.st_size, item.path))
+                    total += stat.st_size
+            if total <= self.max_bytes:
+                return 0
+            removed = 0
+            target = self.max_bytes * SHARED_CACHE_EVICT_TARGET
+            for _, size, path in sorted(entries):
+                if total <= target:
+                    break
+                try:
+                    os.unlink(path)
+                except OSError:
+                    continue
+                total -= size
+                removed += 1
+            return removed
+        finally:
+            if handle is not None:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+                handle.close()
+
+
+# SECTION: Extraction Cache - stat 기반 디렉터리 목록·섹션 캐시
+class FileFacts(NamedTuple):
+    sections: list[tuple[int, int, str, str]]
+    sizes: list[tuple[int, int]]
+    lines: int
+    bytes: int
+    bullets: list[str]
+
+
+class SectionCache:
+    """Keeps directory listings and extraction results warm between runs.
+
+    Listings are keyed by the directory mtime and sections by (mtime_ns, size),
+    so a warm regenerate only pays for stat calls on unchanged files. With
+    ``retain=False`` nothing is stored (streaming mode) but the counters still
+    describe the work done. Misses consult ``shared`` before extracting.
+    """
+
+    def __init__(
+        self,
+        retain: bool = True,
+        tokenizer: str = DEFAULT_TOKENIZER,
+        shared: Optional[SharedExtractionCache] = None,
+    ) -> None:
+        self.retain = retain
+        self.tokenizer = tokenizer
+        self.shared = shared
+        self.count_tokens = resolve_tokenizer(tokenizer)
+        self.counters: dict[str, int] = defaultdict(int)
+        self._listings: dict[str, tuple[tuple[int, tuple[int, ...]], list[Path]]] = {}
+        self._sections: dict[
+            str, tuple[tuple[int, int], list[tuple[int, int, str, str]], list[tuple[int, int]], int]
+        ] = {}
+        self._bullets: dict[str, tuple[tuple[int, int], list[str]]] = {}
+        self._prefetched: set[str] = set()
+
+    def pending(self, paths: Iterable[Path]) -> list[tuple[Path, tuple[int, int]]]:
+        """Paths whose sections are not cached yet, with the fingerprint to store them under."""
+        missing: list[tuple[Path, tuple[int, int]]] = []
+        backend = filesystem()
+        for path in paths:
+            try:
+                stat = backend.stat(path)
+            except OSError:
+                continue
+            fingerprint = (stat.st_mtime_ns, stat.st_size)
+            cached = self._sections.get(path.as_posix())
+            if not (cached and cached[0] == fingerprint):
+                missing.append((path, fingerprint))
+        return missing
+
+    def shared_lookup(self, path: Path) -> tuple[
+        Optional[str], Optional[tuple[list[tuple[int, int, str, str]], list[tuple[int, int]], int]], Optional[bytes]
+    ]:
+        """(content key, cached result, content read to hash it); all None when unavailable.
+
+        A miss hands the content back so extraction does not read the file a second time.
+        """
+        if self.shared is None:
+            return None, None, None
+        try:
+            data = filesystem().read_bytes(path)
+        except OSError:
+            return None, None, None
+        key = self.shared.key(data, path.suffix, self.tokenizer)
+        result = self.shared.get(key)
+        self.counters['shared_hits' if result is not None else 'shared_misses'] += 1
+        return key, result, data
+
+    def _extract(self, path: Path) -> tuple[list[tuple[int, int, str, str]], list[tuple[int, int]], int]:
+        key, result, data = self.shared_lookup(path)
+        if result is not None:
+            return result
+        result = extract_sized_sections(path, self.count_tokens, data)
+        if key is not None:
+            self.shared.put(key, *result)
+        return result
+
+    def trim_shared(self) -> int:
+        """Evict the shared cache if this cache added entries to it; called at the end of every run."""
+        shared = self.shared
+        if shared is None or not shared.stored:
+            return 0
+        shared.stored = 0
+        return shared.evict()
+
+    def store(
+        self,
+        path: Path,
+        fingerprint: tuple[int, int],
+        sections: list[tuple[int, int, str, str]],
+        sizes: list[tuple[int, int]],
+        line_count: int,
+    ) -> None:
+        """Insert sections extracted elsewhere (a worker); counted as the miss it replaces."""
+        key = path.as_posix()
+        self._sections[key] = (fingerprint, sections, sizes, line_count)
+        self._prefetched.add(key)
+        self.counters['section_misses'] += 1
+        self.counters['bytes_read'] += fingerprint[1]
+
+    def listing(self, directory: Path) -> Optional[list[Path]]:
+        backend = filesystem()
+        try:
+            stat = backend.stat(directory)
+        except OSError:
+            return None
+        key = directory.as_posix()
+        rules = ignore_rules_for(directory)
+        # .gitignore가 바뀌면 컴파일된 패턴 객체가 달라지므로 목록도 다시 계산
+        fingerprint = (stat.st_mtime_ns, rules.key)
+        cached = self._listings.get(key)
+        if cached and cached[0] == fingerprint:
+            self.counters['listing_hits'] += 1
+            return cached[1]
+        self.counters['listing_misses'] += 1
+        base = os.path.abspath(directory)
+        files = sorted(
+            (
+                directory / item.name
+                for item in backend.scandir(directory)
+                if item.is_file() and not rules.ignores(os.path.join(base, item.name), False)
+            ),
+            key=lambda f: f.name.lower(),
+        )
+        if self.retain:
+            self._listings[key] = (fingerprint, files)
+        return files
+
+    def file_map(self, path: Path) -> FileFacts:
+        """Sections, their sizes, file totals and rendered file-map bullets for one file."""
+        try:
+            stat = filesystem().stat(path)
+        except OSError:
+            return FileFacts([], [], 0, 0, [])
+        key = path.as_posix()
+        fingerprint = (stat.st_mtime_ns, stat.st_size)
+        self.counters['files_scanned'] += 1
+
+        cached = self._sections.get(key)
+        if cached and cached[0] == fingerprint:
+            if key in self._prefetched:
+                self._prefetched.discard(key)
+            else:
+                self.counters['section_hits'] += 1
+            sections, sizes, line_count = cached[1], cached[2], cached[3]
+        else:
+            self.counters['section_misses'] += 1
+            self.counters['bytes_read'] += stat.st_size
+            with trace_span('extract_sections', 'file', path=key, bytes=stat.st_size), memory_span('file', key):
+                sections, sizes, line_count = self._extract(path)
+            if self.retain:
+                self._sections[key] = (fingerprint, sections, sizes, line_count)
+        self.counters['sections_extracted'] += len(sections)
+        if not sections:
+            self.counters['files_skipped'] += 1
+
+        cached_bullets = self._bullets.get(key)
+        if cached_bullets and cached_bullets[0] == fingerprint:
+            return FileFacts(sections, sizes, line_count, stat.st_size, cached_bullets[1])
+        bullets = format_file_map_bullets(path.name, sections, sizes)
+        if self.retain:
+            self._bullets[key] = (fingerprint, bullets)
+        return FileFacts(sections, sizes, line_count, stat.st_size, bullets)
+
+    def sections(self, path: Path) -> list[tuple[int, int, str, str]]:
+        return self.file_map(path).sections
+
+    def invalidate(self, path: Path) -> None:
+        key = path.as_posix()
+        self._sections.pop(key, None)
+        self._bullets.pop(key, None)
+        self._listings.pop(key, None)
+        self._listings.pop(path.parent.as_posix(), None)
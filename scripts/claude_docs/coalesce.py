@@ -0,0 +1,81 @@
+"""동시 실행 요청을 합치는 fcntl 실행 잠금."""
+
+from __future__ import annotations
+
+from typing import Iterator, Sequence
+
+from .fs import LocalFileSystem, filesystem
+from .model import STATE_DIR, Workspace
+
+try:
+    import fcntl
+except ImportError:  # Windows에는 fcntl이 없으므로 잠금 없이 실행
+    fcntl = None  # type: ignore[assignment]
+
+# SECTION: Run Coalescing - 동시 실행 요청을 최대 두 번의 실행으로 합치는 잠금
+# 요청자는 먼저 dirty 표시를 남긴 뒤 잠금을 시도하고, 실패하면 바로 종료합니다.
+# 잠금을 가진 실행은 dirty 표시가 사라질 때까지 반복하므로 N개의 동시 요청은 최대 두 번의 실행으로 끝납니다.
+RUN_LOCK_NAME = 'run.lock'
+RUN_DIRTY_NAME = 'run.dirty'
+
+
+class RunCoalescer:
+    """fcntl lock plus dirty flag per workspace state dir; a no-op where fcntl is unavailable."""
+
+    def __init__(self, workspaces: Sequence[Workspace]) -> None:
+        # 여러 루트를 항상 같은 순서로 잠가 교착을 피함
+        self.state_dirs = sorted({workspace.resolve(STATE_DIR).resolve() for workspace in workspaces})
+        self._handles: list = []
+
+    def _mark_dirty(self) -> None:
+        for state_dir in self.state_dirs:
+            state_dir.mkdir(parents=True, exist_ok=True)
+            (state_dir / RUN_DIRTY_NAME).touch()
+
+    def _is_dirty(self) -> bool:
+        return any((state_dir / RUN_DIRTY_NAME).exists() for state_dir in self.state_dirs)
+
+    def _clear_dirty(self) -> None:
+        for state_dir in self.state_dirs:
+            (state_dir / RUN_DIRTY_NAME).unlink(missing_ok=True)
+
+    def _acquire(self) -> bool:
+        for state_dir in self.state_dirs:
+            handle = (state_dir / RUN_LOCK_NAME).open('a')
+            try:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                handle.close()
+                self._release()
+                return False
+            self._handles.append(handle)
+        return True
+
+    def _release(self) -> None:
+        while self._handles:
+            handle = self._handles.pop()
+            fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+            handle.close()
+
+    def passes(self) -> Iterator[int]:
+        """Yield once per generation pass this process should run; nothing if another run owns the lock."""
+        # 메모리 백엔드로의 실행은 디스크 출력을 쓰지 않아 다른 프로세스와 겨룰 일이 없으므로 잠그지 않음
+        if fcntl is None or not isinstance(filesystem(), LocalFileSystem):
+            yield 1
+            return
+        self._mark_dirty()
+        if not self._acquire():
+            return
+        count = 0
+        try:
+            while True:
+                while self._is_dirty():
+                    self._clear_dirty()
+                    count += 1
+                    yield count
+                self._release()
+                # 해제 직전에 들어온 요청은 잠금 획득에 실패하고 종료했을 수 있으므로 한 번 더 확인
+                if not self._is_dirty() or not self._acquire():
+                    return
+        finally:
+            self._release()
@@ -0,0 +1,241 @@
+"""캐시를 유지하는 Unix 소켓 상주 프로세스."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Optional, Sequence
+
+import json
+import os
+import socket
+import socketserver
+import sys
+import time
+
+from .cache import SectionCache
+from .coalesce import RunCoalescer
+from .filemap import SectionIndex, generate_file_map_lines, tracked_files
+from .fs import filesystem
+from .model import Workspace
+from .pipeline import RunStats, entries_for_paths, record_run_state, write_documents
+
+# SECTION: Daemon Mode - Unix 소켓 기반 상주 프로세스
+# 요청마다 전체를 다시 만들지 않고, 마지막 갱신 때의 문서별 stat 서명과 달라진 문서만 다시 생성
+DEFAULT_SOCKET_PATH = '.claude-docs.sock'
+
+
+def _stat_key(path: Path) -> Optional[tuple[int, int]]:
+    try:
+        stat = filesystem().stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class WarmState:
+    """Per-doc stat signatures and the full side indexes as of the daemon's last refresh.
+
+    A doc's signature covers its directory, the files it was rendered from and its output, so
+    a changed, added or removed input or an edited claude.md marks it dirty. An edit to any
+    applicable .gitignore marks every doc dirty. Until one refresh has covered every doc the
+    side indexes held here are partial, so the first refresh always writes every doc.
+    """
+
+    def __init__(self, workspace: Workspace) -> None:
+        self.workspace = workspace
+        self.doc_index: dict[str, SectionIndex] = {}
+        self.directory_stats: dict[str, dict] = {}
+        self._signatures: dict[str, tuple[list[Path], tuple]] = {}
+        self._ignore_paths = self._gitignore_paths()
+        self._ignore_signature: Optional[tuple] = None
+        self.warm = False
+
+    def _gitignore_paths(self) -> list[Path]:
+        directories = {Path('.')}
+        for entry in self.workspace.docs.values():
+            if entry.file_map_path:
+                directory = Path(entry.file_map_path)
+                directories.add(directory)
+                directories.update(directory.parents)
+        return [self.workspace.resolve('.git/info/exclude')] + [
+            self.workspace.resolve(directory / '.gitignore') for directory in sorted(directories)
+        ]
+
+    def _signature(self, doc: str, files: Sequence[Path]) -> tuple:
+        entry = self.workspace.docs[doc]
+        directory = self.workspace.resolve(entry.file_map_path) if entry.file_map_path else None
+        return (
+            _stat_key(directory) if directory is not None else None,
+            tuple(_stat_key(file) for file in files),
+            _stat_key(self.workspace.resolve(doc)),
+        )
+
+    def changed(self) -> list[str]:
+        """Non-root docs whose signature differs from the one recorded at their last refresh."""
+        docs = sorted(doc for doc in self.workspace.docs if doc != 'CLAUDE.md')
+        if tuple(_stat_key(path) for path in self._ignore_paths) != self._ignore_signature:
+            return docs
+        dirty: list[str] = []
+        for doc in docs:
+            recorded = self._signatures.get(doc)
+            if recorded is None or self._signature(doc, recorded[0]) != recorded[1]:
+                dirty.append(doc)
+        return dirty
+
+    def refresh(self, doc_paths: Sequence[str], cache: SectionCache, stats: Optional[RunStats] = None) -> list[str]:
+        """Write ``doc_paths``, then the root document and side indexes; returns the written paths."""
+        workspace = self.workspace
+        stats = stats or RunStats()
+        baseline = dict(cache.counters)
+        every_doc = sorted(doc for doc in workspace.docs if doc != 'CLAUDE.md')
+        # 시작 시 전체 갱신이 다른 실행에 합쳐져 건너뛰었으면 인덱스가 비어 있으므로, 일부만 쓰면 상태 파일이 잘림
+        if not self.warm:
+            doc_paths = every_doc
+        everything = set(doc_paths) >= set(every_doc)
+        ignore_signature = tuple(_stat_key(path) for path in self._ignore_paths)
+        written, doc_index, directory_stats = write_documents(doc_paths, cache, stats, workspace)
+        self.doc_index.update(doc_index)
+        self.directory_stats.update(directory_stats)
+        refreshed = list(doc_index) + (['CLAUDE.md'] if 'CLAUDE.md' in workspace.docs else [])
+        record_run_state(refreshed, self.doc_index, self.directory_stats, cache, stats, workspace)
+        for doc in doc_index:
+            files = tracked_files(workspace.docs[doc], cache, workspace.root) or []
+            self._signatures[doc] = (files, self._signature(doc, files))
+        if everything:
+            self._ignore_signature = ignore_signature
+            self.warm = True
+        stats.absorb_cache(cache, baseline)
+        stats.duration = time.perf_counter() - stats.started
+        return written
+
+
+def _coalesced_refresh(state: WarmState, targets: Sequence[str], cache: SectionCache) -> dict:
+    """Refresh ``targets`` under the workspace run lock shared with CLI runs and ``generate(write=True)``.
+
+    When another process owns the lock nothing is written here: that run picks up the dirty
+    flag and regenerates after its current pass, and the next request sees its outputs.
+    """
+    written: list[str] = []
+    ran = False
+    for pass_number in RunCoalescer([state.workspace]).passes():
+        ran = True
+        # 잠금을 쥔 동안 다른 프로세스가 남긴 요청은 그사이 바뀐 문서만 다시 생성해 처리
+        if pass_number > 1:
+            targets = state.changed()
+        if targets:
+            written.extend(state.refresh(targets, cache))
+    return {'ok': True, 'entries': [doc for doc in targets if doc != 'CLAUDE.md'], 'written': written, 'coalesced': not ran}
+
+
+def handle_daemon_request(cache: SectionCache, request: dict, state: WarmState) -> dict:
+    workspace = state.workspace
+    op = request.get('op')
+    if op == 'ping':
+        return {'ok': True}
+    if op == 'regenerate':
+        # "full": true 이면 서명과 관계없이 모든 문서를 다시 생성
+        targets = sorted(workspace.docs) if request.get('full') else state.changed()
+        return _coalesced_refresh(state, targets, cache)
+    if op == 'regenerate-paths':
+        paths = [str(item) for item in request.get('paths') or []]
+        for raw in paths:
+            cache.invalidate(workspace.resolve(raw))
+        return _coalesced_refresh(state, entries_for_paths(paths, workspace), cache)
+    if op == 'query':
+        path = Path(str(request.get('path') or ''))
+        posix = path.as_posix()
+        if posix in workspace.docs:
+            entry = workspace.docs[posix]
+            return {
+                'ok': True,
+                'doc': posix,
+                'title': entry.title,
+                'file_map_path': entry.file_map_path,
+                'file_map': generate_file_map_lines(entry, cache, root=workspace.root),
+            }
+        facts = cache.file_map(workspace.resolve(path))
+        return {
+            'ok': True,
+            'path': posix,
+            'sections': [
+                {'start': start, 'end': end, 'title': title, 'desc': desc, 'chars': chars, 'tokens': tokens}
+                for (start, end, title, desc), (chars, tokens) in zip(facts.sections, facts.sizes)
+            ],
+            'lines': facts.lines,
+            'bytes': facts.bytes,
+        }
+    return {'ok': False, 'error': f"unknown op: {op!r}"}
+
+
+class _DaemonHandler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        server: DocsDaemon = self.server  # type: ignore[assignment]
+        for raw in self.rfile:
+            if not raw.strip():
+                continue
+            started = time.perf_counter()
+            try:
+                request = json.loads(raw)
+                if request.get('op') == 'shutdown':
+                    response = {'ok': True}
+                    server.stopping = True
+                else:
+                    response = handle_daemon_request(server.cache, request, server.state)
+            except Exception as error:  # 요청 하나의 실패가 데몬을 종료시키지 않도록 함
+                response = {'ok': False, 'error': str(error)}
+            response['elapsed_ms'] = round((time.perf_counter() - started) * 1000, 3)
+            self.wfile.write(json.dumps(response, ensure_ascii=False).encode('utf-8') + b'\n')
+            self.wfile.flush()
+            if server.stopping:
+                break
+
+
+class DocsDaemon(socketserver.UnixStreamServer):
+    """Single-threaded server so requests never race on the shared cache or outputs."""
+
+    timeout = 0.5
+
+    def __init__(self, socket_path: str, workspace: Optional[Workspace] = None) -> None:
+        self.cache = SectionCache()
+        self.workspace = workspace or Workspace()
+        self.state = WarmState(self.workspace)
+        self.stopping = False
+        super().__init__(socket_path, _DaemonHandler)
+
+
+def serve(socket_path: str = DEFAULT_SOCKET_PATH, workspace: Optional[Workspace] = None) -> None:
+    if os.path.exists(socket_path):
+        try:
+            request_daemon({'op': 'ping'}, socket_path, timeout=0.5)
+        except OSError:
+            os.unlink(socket_path)  # 이전 프로세스가 남긴 소켓 정리
+        else:
+            raise SystemExit(f"daemon already listening on {socket_path}")
+
+    server = DocsDaemon(socket_path, workspace)
+    try:
+        # 시작 시 캐시와 문서별 서명을 채워 첫 요청부터 warm 상태로 응답
+        _coalesced_refresh(server.state, sorted(server.workspace.docs), server.cache)
+        print(f"claude docs daemon listening on {socket_path}", file=sys.stderr)
+        # serve_forever() 안에서 shutdown()을 부르면 교착되므로 플래그를 보며 직접 루프
+        while not server.stopping:
+            server.handle_request()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+
+
+def request_daemon(payload: dict, socket_path: str = DEFAULT_SOCKET_PATH, timeout: float = 30.0) -> dict:
+    """Tiny client: send one JSON request line and read one JSON response line."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(timeout)
+        client.connect(socket_path)
+        client.sendall(json.dumps(payload, ensure_ascii=False).encode('utf-8') + b'\n')
+        with client.makefile('rb') as reader:
+            line = reader.readline()
+    if not line:
+        raise ConnectionError('daemon closed the connection without a response')
+    return json.loads(line)
@@ -0,0 +1,141 @@
+"""등록되지 않은 디렉터리 탐색과 기본 문서 항목 생성."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Optional, Sequence
+
+import fnmatch
+import os
+from collections import defaultdict
+
+from .extraction import SECTION_SUFFIXES
+from .filemap import _is_tracked_name
+from .fs import filesystem
+from .ignore import IgnoreRules, ignore_rules_for
+from .model import Entry, own_registry
+
+# SECTION: Directory Discovery - 등록되지 않은 디렉터리 자동 문서화
+# 트리를 한 번만 순회하며 섹션 추출 대상 파일이 있는 디렉터리마다 기본 항목을 만들고,
+# add()로 직접 작성한 항목이 있으면 그 메타데이터를 그대로 사용
+DISCOVERY_IGNORED_DIRS = frozenset({
+    'node_modules', 'dist', 'build', 'out', 'coverage', 'claudedocs', '__pycache__', 'venv',
+})
+
+
+def _discovery_ignored(relative: str, name: str, patterns: Sequence[str]) -> bool:
+    if name.startswith('.') or name in DISCOVERY_IGNORED_DIRS:
+        return True
+    return any(fnmatch.fnmatchcase(relative, pattern) for pattern in patterns)
+
+
+def discover_directories(root: Path = Path('.'), ignore: Sequence[str] = ()) -> list[str]:
+    """Root-relative directories holding at least one extractable file, in sorted order.
+
+    A single iterative scandir pass. .gitignore rules are applied as the walk descends so
+    ignored subtrees are never entered, and directories are keyed by (st_dev, st_ino) so a
+    symlinked directory or link cycle is visited only once; links leaving the root are skipped.
+    """
+    backend = filesystem()
+    found: list[str] = []
+    visited: set[tuple[int, int]] = set()
+    stack: list[tuple[str, IgnoreRules]] = [('', ignore_rules_for(root))]
+    base = os.path.abspath(root)
+    real_base = os.path.realpath(base) + os.sep
+    # 실제 디렉터리를 모두 본 뒤에 링크를 정렬 순서로 따라가므로 같은 inode는 항상 실제 경로 이름으로 기록
+    links: list[tuple[str, IgnoreRules]] = []
+    while stack or links:
+        if not stack:
+            stack = sorted(links, key=lambda item: item[0], reverse=True)
+            links = []
+        relative, rules = stack.pop()
+        absolute = os.path.join(base, relative) if relative else base
+        try:
+            stat = backend.stat(absolute)
+        except OSError:
+            continue
+        identity = (stat.st_dev, stat.st_ino)
+        if identity in visited:
+            continue
+        visited.add(identity)
+        if relative:
+            rules = rules.child(absolute)
+
+        has_source = False
+        try:
+            for item in backend.scandir(absolute):
+                child = f"{relative}/{item.name}" if relative else item.name
+                try:
+                    is_dir = item.is_dir()
+                except OSError:
+                    continue
+                if is_dir:
+                    if _discovery_ignored(child, item.name, ignore) or rules.ignores(item.path, True):
+                        continue
+                    if item.is_symlink():
+                        # 루트 밖으로 나가는 링크는 제외
+                        if (os.path.realpath(item.path) + os.sep).startswith(real_base):
+                            links.append((child, rules))
+                        continue
+                    stack.append((child, rules))
+                elif (
+                    not has_source
+                    and os.path.splitext(item.name)[1].lower() in SECTION_SUFFIXES
+                    and _is_tracked_name(item.name, None)
+                    and not rules.ignores(item.path, False)
+                ):
+                    has_source = True
+        except (FileNotFoundError, NotADirectoryError, PermissionError):
+            continue
+        if relative and has_source:
+            found.append(relative)
+    found.sort()
+    return found
+
+
+def _nearest_documented_parent(directory: str, doc_by_directory: dict[str, str]) -> str:
+    parent = Path(directory).parent
+    while parent != Path('.'):
+        doc = doc_by_directory.get(parent.as_posix())
+        if doc is not None:
+            return doc
+        parent = parent.parent
+    return 'CLAUDE.md'
+
+
+def discover_registry(
+    root: Path = Path('.'),
+    docs: Optional[dict[str, Entry]] = None,
+    ignore: Sequence[str] = (),
+) -> dict[str, Entry]:
+    """Registered entries plus synthesized defaults for every other discovered directory."""
+    registered = own_registry() if docs is None else dict(docs)
+    covered = {entry.file_map_path for entry in registered.values() if entry.file_map_path}
+    discovered = [directory for directory in discover_directories(root, ignore) if directory not in covered]
+
+    doc_by_directory = {entry.file_map_path: doc for doc, entry in registered.items() if entry.file_map_path}
+    doc_by_directory.update({directory: f"{directory}/claude.md" for directory in discovered})
+    children: dict[str, list[str]] = defaultdict(list)
+    for directory in doc_by_directory:
+        children[Path(directory).parent.as_posix()].append(directory)
+
+    merged = dict(registered)
+    for directory in discovered:
+        structure = [
+            f"{Path(child).name}/: 하위 디렉터리 (→ {doc_by_directory[child]})"
+            for child in sorted(children.get(directory, []), key=str.lower)
+        ]
+        merged[f"{directory}/claude.md"] = Entry(
+            title=f"{directory} - 자동 생성 문서",
+            purpose=[
+                f"{directory} 디렉터리의 파일 구성을 자동으로 정리한 문서입니다.",
+                '설명을 보강하려면 generate_claude_docs.py에 add() 항목을 추가합니다.',
+            ],
+            responsibilities=[],
+            structure=structure,
+            centralization=[],
+            rules=[],
+            references=[_nearest_documented_parent(directory, doc_by_directory)],
+            file_map_path=directory,
+        )
+    return merged
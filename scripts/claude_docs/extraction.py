@@ -0,0 +1,504 @@
+"""파일 형식별 섹션 추출기와 섹션 토큰 수 추정."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Callable, Iterable, Optional, Sequence
+
+import functools
+import importlib
+import re
+
+from .fs import filesystem
+
+# SECTION: Section Extraction Utilities - 파일 섹션 파싱 로직
+
+# 마커 본문(제목/설명)은 정규식 대신 문자열 연산으로 나눠 한 줄 처리 비용이 길이에 선형이 되게 함.
+# 정규식은 고정 접두사만 확인하고, 이 길이를 넘는 줄(압축 코드, 거대한 문자열)은 마커로 보지 않음
+SECTION_MARKER_MAX_CHARS = 1024
+TS_SECTION_PREFIX = re.compile(r"\s*(?://|(?P<block>/\*))\s*SECTION:")
+BLOCK_SECTION_PREFIX = re.compile(r"\s*/\*\s*SECTION:")
+EXPORT_PATTERN = re.compile(
+    r"^\s*export\s+(?:default\s+)?(const|let|var|function|class|interface|type|enum)\s*" r"(?P<name>[A-Za-z0-9_]+)?"
+)
+MARKDOWN_HEADING_PREFIX = re.compile(r"\s*##(?=\s)")
+PY_SECTION_PREFIX = re.compile(r"\s*#\s*SECTION:")
+SQL_SECTION_PREFIX = re.compile(r"\s*--\s*SECTION:")
+SQL_CREATE_PATTERN = re.compile(
+    r"^\s*CREATE\s+(?:OR\s+REPLACE\s+)?(?:UNIQUE\s+)?(?P<kind>TABLE|FUNCTION|POLICY|INDEX|TRIGGER)\s+"
+    r"(?:CONCURRENTLY\s+)?(?:IF\s+NOT\s+EXISTS\s+)?(?P<name>\"[^\"]+\"|[A-Za-z0-9_.]+)",
+    re.IGNORECASE,
+)
+SQL_COMMENT_MAX_LINES = 8
+
+
+def _split_marker_tail(tail: str) -> Optional[tuple[str, str]]:
+    """Split ``title - desc`` running to end of line.
+
+    Linear-time equivalent of ``\\s*(?P<title>[^-]+?)(?:\\s*-\\s*(?P<desc>.*))?\\s*$``:
+    the title stops at the first ``-`` and everything after it is the description.
+    """
+    start = len(tail) - len(tail.lstrip())
+    dash = tail.find('-')
+    if dash < 0:
+        dash = len(tail)
+    if start < dash:
+        title = tail[start:len(tail[:dash].rstrip())]
+    elif start > 0:
+        # 제목 자리가 비어 있으면 정규식처럼 공백 한 글자를 제목으로 되돌려 씀
+        title = tail[start - 1]
+    else:
+        return None
+    return title, tail[dash + 1:].strip() if dash < len(tail) else ''
+
+
+def _split_block_marker_tail(tail: str) -> Optional[tuple[str, str]]:
+    """Split ``title - desc */`` inside a block comment.
+
+    Linear-time equivalent of ``\\s*(?P<title>[^-]+?)(?:\\s*-\\s*(?P<desc>.*?))?\\s*\\*/``:
+    each ``*/`` is located once with ``str.find`` instead of being retried per title length.
+    """
+    start = len(tail) - len(tail.lstrip())
+    dash = tail.find('-')
+    if dash < 0:
+        dash = len(tail)
+    desc_close = tail.find('*/', dash + 1) if dash < len(tail) else -1
+    if start < dash:
+        # 제목이 '-' 앞에서 끝나고 설명 뒤에 '*/'가 오는 경우와 제목 바로 뒤에 '*/'가 오는 경우 중 짧은 쪽
+        with_desc = len(tail[:dash].rstrip()) if desc_close >= 0 else -1
+        title_close = tail.find('*/', start + 1, dash)
+        without_desc = len(tail[:title_close].rstrip()) if title_close >= 0 else -1
+        if with_desc >= 0 and (without_desc < 0 or with_desc <= without_desc):
+            return tail[start:with_desc], tail[dash + 1:desc_close].strip()
+        if without_desc >= 0:
+            return tail[start:without_desc], ''
+    if start > 0:
+        if start == dash and desc_close >= 0:
+            return tail[start - 1], tail[dash + 1:desc_close].strip()
+        if tail.startswith('*/', start):
+            return tail[start - 1], ''
+    return None
+
+
+def _split_heading_tail(tail: str) -> Optional[str]:
+    """Linear-time equivalent of ``\\s+(?P<title>.+?)\\s*$`` after a ``##`` heading mark."""
+    title = tail.strip()
+    start = len(tail) - len(tail.lstrip())
+    if start == 0:
+        return None
+    if title:
+        return title
+    return tail[start - 1] if start > 1 else None
+
+
+def _clean_comment_line(raw: str) -> str:
+    text = raw.strip()
+    text = text.lstrip('/*').lstrip('*').lstrip('/').strip()
+    text = text.rstrip('*/').strip()
+    return text
+
+
+def _extract_preceding_comment(lines: list[str], start_index: int) -> str:
+    idx = start_index - 2  # convert to 0-based
+    collected: list[str] = []
+    encountered = False
+
+    while idx >= 0:
+        line = lines[idx]
+        stripped = line.strip()
+        if not stripped:
+            if not encountered:
+                idx -= 1
+                continue
+            break
+        if stripped.startswith('//'):
+            collected.insert(0, stripped[2:].strip())
+            encountered = True
+            idx -= 1
+            continue
+        if stripped.endswith('*/'):
+            block: list[str] = []
+            block.insert(0, stripped)
+            idx -= 1
+            while idx >= 0:
+                block.insert(0, lines[idx].strip())
+                if lines[idx].strip().startswith('/*') or lines[idx].strip().startswith('/**'):
+                    idx -= 1
+                    break
+                idx -= 1
+            cleaned = [
+                _clean_comment_line(item)
+                for item in block
+                if _clean_comment_line(item)
+            ]
+            return ' '.join(cleaned)
+        break
+    if collected:
+        return ' '.join(collected)
+    return ''
+
+
+def _extract_preceding_python_comment(lines: list[str], start_index: int) -> str:
+    idx = start_index - 2
+    collected: list[str] = []
+    while idx >= 0:
+        stripped = lines[idx].strip()
+        if not stripped:
+            if not collected:
+                idx -= 1
+                continue
+            break
+        if stripped.startswith('#'):
+            collected.insert(0, stripped.lstrip('#').strip())
+            idx -= 1
+            continue
+        break
+    return ' '.join(collected)
+
+
+def _compute_ranges(markers: list[tuple[int, str, str]], total_lines: int) -> list[tuple[int, int, str, str]]:
+    sections: list[tuple[int, int, str, str]] = []
+    for idx, (start, title, desc) in enumerate(markers):
+        end = markers[idx + 1][0] - 1 if idx + 1 < len(markers) else total_lines
+        sections.append((start, end, title.strip(), desc.strip()))
+    return sections
+
+
+def _extract_ts_sections(lines: list[str]) -> list[tuple[int, int, str, str]]:
+    markers: list[tuple[int, str, str]] = []
+    for index, line in enumerate(lines, start=1):
+        head = TS_SECTION_PREFIX.match(line)
+        if head is None or len(line) > SECTION_MARKER_MAX_CHARS:
+            continue
+        split = _split_block_marker_tail if head['block'] else _split_marker_tail
+        marker = split(line[head.end():])
+        if marker:
+            markers.append((index, *marker))
+    if markers:
+        return _compute_ranges(markers, len(lines))
+
+    exports: list[tuple[int, str]] = []
+    for index, line in enumerate(lines, start=1):
+        export_match = EXPORT_PATTERN.match(line)
+        if export_match:
+            name = export_match.group('name') or 'default export'
+            exports.append((index, f"export {name}"))
+    if exports:
+        sections: list[tuple[int, int, str, str]] = []
+        for idx, (start, title) in enumerate(exports):
+            end = exports[idx + 1][0] - 1 if idx + 1 < len(exports) else len(lines)
+            desc = _extract_preceding_comment(lines, start)
+            sections.append((start, end, title, desc))
+        return sections
+
+    definitions: list[tuple[int, str]] = []
+    for index, line in enumerate(lines, start=1):
+        class_match = re.match(r'^\s*class\s+([A-Za-z0-9_]+)', line)
+        if class_match:
+            definitions.append((index, f"class {class_match.group(1)}"))
+            continue
+        func_match = re.match(r'^\s*function\s+([A-Za-z0-9_]+)', line)
+        if func_match:
+            definitions.append((index, f"function {func_match.group(1)}"))
+            continue
+        const_match = re.match(r'^\s*(const|let|var)\s+([A-Za-z0-9_]+)\s*=', line)
+        if const_match:
+            definitions.append((index, f"{const_match.group(1)} {const_match.group(2)}"))
+
+    if not definitions:
+        return []
+
+    fallback_sections: list[tuple[int, int, str, str]] = []
+    for idx, (start, title) in enumerate(definitions):
+        end = definitions[idx + 1][0] - 1 if idx + 1 < len(definitions) else len(lines)
+        desc = _extract_preceding_comment(lines, start)
+        fallback_sections.append((start, end, title, desc))
+    return fallback_sections
+
+
+def _extract_python_sections(lines: list[str]) -> list[tuple[int, int, str, str]]:
+    markers: list[tuple[int, str, str]] = []
+    for index, line in enumerate(lines, start=1):
+        head = PY_SECTION_PREFIX.match(line)
+        if head is None or len(line) > SECTION_MARKER_MAX_CHARS:
+            continue
+        marker = _split_marker_tail(line[head.end():])
+        if marker:
+            markers.append((index, *marker))
+    if markers:
+        return _compute_ranges(markers, len(lines))
+
+    definitions: list[tuple[int, str]] = []
+    for index, line in enumerate(lines, start=1):
+        class_match = re.match(r'^\s*class\s+([A-Za-z0-9_]+)', line)
+        if class_match:
+            definitions.append((index, f"class {class_match.group(1)}"))
+            continue
+        def_match = re.match(r'^\s*def\s+([A-Za-z0-9_]+)', line)
+        if def_match:
+            definitions.append((index, f"def {def_match.group(1)}"))
+            continue
+        const_match = re.match(r'^\s*(?:[A-Z_][A-Z0-9_]*)\s*=\s*', line)
+        if const_match:
+            name = line.split('=')[0].strip()
+            definitions.append((index, name))
+    if not definitions:
+        return []
+
+    sections: list[tuple[int, int, str, str]] = []
+    for idx, (start, title) in enumerate(definitions):
+        end = definitions[idx + 1][0] - 1 if idx + 1 < len(definitions) else len(lines)
+        desc = _extract_preceding_python_comment(lines, start)
+        sections.append((start, end, title, desc))
+    return sections
+
+
+def _extract_markdown_sections(lines: list[str]) -> list[tuple[int, int, str, str]]:
+    markers: list[tuple[int, str]] = []
+    for index, line in enumerate(lines, start=1):
+        head = MARKDOWN_HEADING_PREFIX.match(line)
+        if head is None or len(line) > SECTION_MARKER_MAX_CHARS:
+            continue
+        heading = _split_heading_tail(line[head.end():])
+        if heading is not None:
+            title = heading.strip()
+            if title == '라인 가이드':
+                continue
+            markers.append((index, title))
+    if not markers:
+        return []
+
+    sections: list[tuple[int, int, str, str]] = []
+    for idx, (start, title) in enumerate(markers):
+        end = markers[idx + 1][0] - 1 if idx + 1 < len(markers) else len(lines)
+        desc = ''
+        for probe in range(start, min(end + 1, start + 10)):
+            text = lines[probe - 1].strip()
+            if not text or text.startswith('#'):
+                continue
+            if text.startswith('-') or text.startswith('*'):
+                desc = text[1:].strip()
+            else:
+                desc = text
+            if desc:
+                break
+        sections.append((start, end, title, desc))
+    return sections
+
+
+def _extract_css_sections(lines: list[str]) -> list[tuple[int, int, str, str]]:
+    markers: list[tuple[int, str, str]] = []
+    for index, line in enumerate(lines, start=1):
+        head = BLOCK_SECTION_PREFIX.match(line)
+        if head is None or len(line) > SECTION_MARKER_MAX_CHARS:
+            continue
+        marker = _split_block_marker_tail(line[head.end():])
+        if marker:
+            markers.append((index, *marker))
+    if markers:
+        return _compute_ranges(markers, len(lines))
+    return []
+
+
+def _clean_sql_comment_line(raw: str) -> str:
+    text = raw.strip()[2:].strip()
+    # 구분선(-- =====, -- -----)은 설명으로 쓰지 않음
+    if text and not text.strip('=-*#~ '):
+        return ''
+    return text
+
+
+def _extract_sql_sections(lines: Iterable[str]) -> list[tuple[int, int, str, str]]:
+    """Stream SQL lines once, keeping only markers and the current comment block."""
+    markers: list[tuple[int, str, str]] = []
+    statements: list[tuple[int, str, str]] = []
+    comment_block: list[str] = []
+    total = 0
+
+    for index, line in enumerate(lines, start=1):
+        total = index
+        stripped = line.strip()
+        if stripped.startswith('--'):
+            head = SQL_SECTION_PREFIX.match(line) if len(line) <= SECTION_MARKER_MAX_CHARS else None
+            marker = _split_marker_tail(line[head.end():]) if head else None
+            if marker:
+                markers.append((index, *marker))
+                comment_block = []
+                continue
+            cleaned = _clean_sql_comment_line(stripped)
+            if cleaned:
+                comment_block.append(cleaned)
+                if len(comment_block) > SQL_COMMENT_MAX_LINES:
+                    del comment_block[0]
+            continue
+        if not stripped:
+            continue
+        create_match = SQL_CREATE_PATTERN.match(line)
+        if create_match:
+            kind = create_match.group('kind').upper()
+            statements.append((index, f"{kind} {create_match.group('name')}", ' '.join(comment_block)))
+        comment_block = []
+
+    if markers:
+        return _compute_ranges(markers, total)
+    return _compute_ranges(statements, total)
+
+
+TS_SUFFIXES = frozenset({'.ts', '.tsx', '.js', '.jsx', '.mjs', '.cjs'})
+CSS_SUFFIXES = frozenset({'.css', '.scss', '.sass'})
+SECTION_SUFFIXES = TS_SUFFIXES | CSS_SUFFIXES | {'.md', '.py', '.sql'}
+
+
+def _extract_text_sections(suffix: str, lines: list[str]) -> list[tuple[int, int, str, str]]:
+    if suffix in TS_SUFFIXES:
+        return _extract_ts_sections(lines)
+    if suffix == '.md':
+        return _extract_markdown_sections(lines)
+    if suffix in CSS_SUFFIXES:
+        return _extract_css_sections(lines)
+    if suffix == '.py':
+        return _extract_python_sections(lines)
+    return []
+
+
+def extract_sections(path: Path) -> list[tuple[int, int, str, str]]:
+    suffix = path.suffix.lower()
+    if suffix == '.sql':
+        # 마이그레이션 파일은 클 수 있으므로 전체를 메모리에 올리지 않고 라인 단위로 스트리밍
+        try:
+            with filesystem().open(path) as handle:
+                return _extract_sql_sections(handle)
+        except UnicodeDecodeError:
+            return []
+
+    try:
+        text = filesystem().read_text(path)
+    except UnicodeDecodeError:
+        return []
+    return _extract_text_sections(suffix, text.splitlines())
+
+
+def extract_sized_sections(
+    path: Path,
+    count_tokens: Callable[[str], int],
+    data: Optional[bytes] = None,
+) -> tuple[list[tuple[int, int, str, str]], list[tuple[int, int]], int]:
+    """Sections, (chars, tokens) per section and the line count, from a single read of the file.
+
+    SQL is extracted from the same line list instead of being streamed twice; only one file
+    is held at a time, so peak memory still depends on the largest single file. ``data`` is
+    the file's content when the caller already read it (to hash it for the shared cache).
+    """
+    suffix = path.suffix.lower()
+    try:
+        text = data.decode('utf-8') if data is not None else filesystem().read_text(path)
+    except UnicodeDecodeError:
+        return [], [], 0
+    lines = text.splitlines()
+    sections = _extract_sql_sections(lines) if suffix == '.sql' else _extract_text_sections(suffix, lines)
+    return sections, measure_sections(lines, sections, count_tokens), len(lines)
+
+
+def format_file_map_bullets(
+    name: str,
+    sections: Iterable[tuple[int, int, str, str]],
+    sizes: Optional[Sequence[tuple[int, int]]] = None,
+) -> list[str]:
+    bullets: list[str] = []
+    for position, (start, end, title, desc) in enumerate(sections):
+        width = 4 if end >= 1000 else 3 if end >= 100 else 2
+        desc_part = f" - {desc}" if desc else ''
+        size_part = ''
+        if sizes is not None and position < len(sizes):
+            chars, tokens = sizes[position]
+            size_part = f" [{chars:,}자 · ~{tokens:,} tok]"
+        bullets.append(f"- {name} {start:0{width}d}~{end:0{width}d} {title}{desc_part}{size_part}")
+    return bullets
+
+
+# SECTION: Token Estimates - 섹션별 문자 수와 근사 토큰 수
+# 컨텍스트 로더가 파일을 읽지 않고 예산에 맞는 섹션을 고를 수 있도록 file map에 크기를 함께 기록
+DEFAULT_TOKENIZER = 'heuristic'
+_TOKEN_PIECE_PATTERN = re.compile(r"[A-Za-z]+|[0-9]+|[^\x00-\x7f]|[^\sA-Za-z0-9]")
+
+
+def estimate_tokens(text: str) -> int:
+    """Fast default: ~3.5 ASCII chars per token (code skews below 4) and one per non-ASCII char."""
+    ascii_chars = len(text.encode('ascii', 'ignore'))
+    return (ascii_chars * 2 + 6) // 7 + (len(text) - ascii_chars)
+
+
+def estimate_tokens_by_pieces(text: str) -> int:
+    """Closer BPE-like estimate: ~4 letters or ~3 digits per token, one per symbol or non-ASCII char."""
+    total = 0
+    for piece in _TOKEN_PIECE_PATTERN.findall(text):
+        if piece.isascii():
+            if piece.isalpha():
+                total += (len(piece) + 3) // 4
+                continue
+            if piece.isdigit():
+                total += (len(piece) + 2) // 3
+                continue
+        total += 1
+    return total
+
+
+def estimate_tokens_by_chars(text: str) -> int:
+    return (len(text) + 3) // 4
+
+
+TOKENIZERS: dict[str, Callable[[str], int]] = {
+    'heuristic': estimate_tokens,
+    'pieces': estimate_tokens_by_pieces,
+    'chars': estimate_tokens_by_chars,
+}
+
+
+@functools.lru_cache(maxsize=None)
+def resolve_tokenizer(spec: str) -> Callable[[str], int]:
+    """A TOKENIZERS name or `module:function`; the callable maps text to a token count."""
+    if spec in TOKENIZERS:
+        return TOKENIZERS[spec]
+    module_name, _, attribute = spec.partition(':')
+    if not attribute:
+        raise ValueError(f"unknown tokenizer {spec!r} (choose {', '.join(TOKENIZERS)} or module:function)")
+    return getattr(importlib.import_module(module_name), attribute)
+
+
+def measure_sections(
+    lines: Iterable[str],
+    sections: Sequence[tuple[int, int, str, str]],
+    count_tokens: Callable[[str], int],
+) -> list[tuple[int, int]]:
+    """(chars, tokens) per section; only sections covering the current line are buffered."""
+    if isinstance(lines, list):
+        # 이미 메모리에 있는 라인 목록은 슬라이스로 바로 계산
+        return [
+            (len(text), int(count_tokens(text)))
+            for text in ('\n'.join(lines[start - 1:end]) + '\n' for start, end, _, _ in sections)
+        ]
+    sizes = [(0, 0)] * len(sections)
+    order = sorted(range(len(sections)), key=lambda position: sections[position][0])
+    buffers: dict[int, list[str]] = {}
+    next_section = 0
+
+    def close(position: int) -> None:
+        text = '\n'.join(buffers.pop(position)) + '\n'
+        sizes[position] = (len(text), int(count_tokens(text)))
+
+    for number, line in enumerate(lines, start=1):
+        while next_section < len(order) and sections[order[next_section]][0] <= number:
+            buffers[order[next_section]] = []
+            next_section += 1
+        if not buffers:
+            if next_section == len(order):
+                break
+            continue
+        line = line.rstrip('\n')
+        for buffer in buffers.values():
+            buffer.append(line)
+        for position in [position for position in buffers if sections[position][1] <= number]:
+            close(position)
+    for position in list(buffers):
+        close(position)
+    return sizes
@@ -0,0 +1,254 @@
+"""디렉터리별 파일 라인 맵과 디렉터리 통계."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import IO, Callable, Iterable, Iterator, Optional
+
+import heapq
+import itertools
+import json
+import os
+import tempfile
+from collections import defaultdict
+from collections.abc import MutableMapping
+
+from .cache import FileFacts, SectionCache
+from .fs import LocalFileSystem, filesystem
+from .ignore import ignore_rules_for
+from .model import Entry
+
+# SECTION: File Map Builder - 각 파일별 라인 범위 요약
+def _is_tracked_name(name: str, extensions: Optional[tuple[str, ...]]) -> bool:
+    # Skip root-level documentation files (CLAUDE.md or claude.md)
+    if name.lower() in ('claude.md', 'CLAUDE.md'):
+        return False
+    return not (extensions and os.path.splitext(name)[1].lower() not in extensions)
+
+
+def _tracked_names(entry: Entry, root: Path = Path('.')) -> Optional[list[str]]:
+    """Sorted tracked file names only; plain strings keep the listing small for huge directories."""
+    if not entry.file_map_path:
+        return None
+    directory = root / entry.file_map_path
+    rules = ignore_rules_for(directory)
+    base = os.path.abspath(directory)
+    try:
+        names = [
+            item.name
+            for item in filesystem().scandir(directory)
+            if item.is_file()
+            and _is_tracked_name(item.name, entry.file_map_extensions)
+            and not rules.ignores(os.path.join(base, item.name), False)
+        ]
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+    names.sort(key=str.lower)
+    return names
+
+
+# 스트리밍 모드는 목록 전체를 한 번에 정렬하지 않고 이 개수씩 정렬한 런(run)을 임시 파일로 내보낸 뒤 병합하며,
+# 런이 NAME_SORT_MAX_RUNS개 쌓이면 하나로 합쳐 열린 임시 파일 수도 제한
+NAME_SORT_RUN = 1024
+NAME_SORT_MAX_RUNS = 16
+
+
+def _spill_run(names: Iterable[str]) -> IO[str]:
+    run = tempfile.TemporaryFile('w+', encoding='utf-8')
+    for name in names:
+        # 파일명에 줄바꿈이 들어 있어도 한 줄에 한 이름이 되도록 JSON 문자열로 기록
+        run.write(json.dumps(name, ensure_ascii=False))
+        run.write("\n")
+    run.seek(0)
+    return run
+
+
+def _merge_runs(runs: list[IO[str]]) -> Iterator[str]:
+    # heapq.merge는 키가 같으면 앞선 런을 먼저 내므로 list.sort(key=str.lower)와 같은 안정 정렬 순서를 유지
+    return heapq.merge(*((json.loads(line) for line in run) for run in runs), key=str.lower)
+
+
+def _external_sorted_names(first: list[str], rest: Iterator[str]) -> Iterator[str]:
+    runs: list[IO[str]] = []
+    try:
+        chunk = first
+        del first
+        while chunk:
+            chunk.sort(key=str.lower)
+            runs.append(_spill_run(chunk))
+            if len(runs) >= NAME_SORT_MAX_RUNS:
+                merged = _spill_run(_merge_runs(runs))
+                for run in runs:
+                    run.close()
+                runs = [merged]
+            chunk = list(itertools.islice(rest, NAME_SORT_RUN))
+        yield from _merge_runs(runs)
+    finally:
+        for run in runs:
+            run.close()
+
+
+def iter_tracked_names(entry: Entry, root: Path = Path('.')) -> Optional[Iterator[str]]:
+    """:func:`_tracked_names` in the same order without holding the whole listing.
+
+    Directories larger than one run are sorted in runs spilled to temporary files and merged.
+    Other backends sort in memory, so nothing touches the disk.
+    """
+    if not entry.file_map_path:
+        return None
+    directory = root / entry.file_map_path
+    rules = ignore_rules_for(directory)
+    base = os.path.abspath(directory)
+    names = (
+        item.name
+        for item in filesystem().scandir(directory)
+        if item.is_file()
+        and _is_tracked_name(item.name, entry.file_map_extensions)
+        and not rules.ignores(os.path.join(base, item.name), False)
+    )
+    try:
+        first = list(itertools.islice(names, NAME_SORT_RUN))
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+    if len(first) < NAME_SORT_RUN or not isinstance(filesystem(), LocalFileSystem):
+        first.extend(names)
+        first.sort(key=str.lower)
+        return iter(first)
+    return _external_sorted_names(first, names)
+
+
+def tracked_files(
+    entry: Entry,
+    cache: Optional[SectionCache] = None,
+    root: Path = Path('.'),
+) -> Optional[list[Path]]:
+    """Files an entry's file map is built from, in file-map order; None when the directory is missing."""
+    if not entry.file_map_path:
+        return None
+
+    base = root / entry.file_map_path
+    if cache is None or not cache.retain:
+        names = _tracked_names(entry, root)
+        return None if names is None else [base / name for name in names]
+
+    files = cache.listing(base) if filesystem().is_dir(base) else None
+    if files is None:
+        return None
+    return [file for file in files if _is_tracked_name(file.name, entry.file_map_extensions)]
+
+
+SectionIndex = MutableMapping[str, list[tuple[int, int, str, str]]]
+LARGEST_FILES_LIMIT = 3
+
+
+@dataclass
+class DirectoryStats:
+    """Per-directory totals gathered while the file map is built; no extra directory walk."""
+
+    files: int = 0
+    lines: int = 0
+    bytes: int = 0
+    sections: int = 0
+    chars: int = 0
+    tokens: int = 0
+    extensions: dict[str, int] = field(default_factory=lambda: defaultdict(int))
+    names: list[str] = field(default_factory=list)
+    # (bytes, lines, name) 내림차순 상위 LARGEST_FILES_LIMIT개만 유지
+    largest: list[tuple[int, int, str]] = field(default_factory=list)
+    # 지정하면 파일명을 names에 모으지 않고 바로 넘김 (스트리밍 실행이 stats.json에 곧바로 기록)
+    on_name: Optional[Callable[[str], None]] = None
+
+    def add(self, name: str, facts: FileFacts) -> None:
+        self.files += 1
+        self.lines += facts.lines
+        self.bytes += facts.bytes
+        self.sections += len(facts.sections)
+        self.chars += sum(chars for chars, _ in facts.sizes)
+        self.tokens += sum(tokens for _, tokens in facts.sizes)
+        self.extensions[os.path.splitext(name)[1].lower()] += 1
+        if self.on_name is not None:
+            self.on_name(name)
+        else:
+            self.names.append(name)
+        self.largest.append((facts.bytes, facts.lines, name))
+        self.largest.sort(key=lambda item: (-item[0], item[2]))
+        del self.largest[LARGEST_FILES_LIMIT:]
+
+    def summary_lines(self) -> list[str]:
+        extensions = ' · '.join(
+            f"{extension or '(없음)'} {count}"
+            for extension, count in sorted(self.extensions.items(), key=lambda item: (-item[1], item[0]))
+        )
+        largest = ' · '.join(f"{name} {lines:,}줄 ({size:,}B)" for size, lines, name in self.largest)
+        return [
+            f"- 합계: 파일 {self.files}개 · 섹션 {self.sections}개 · {self.lines:,}줄 · "
+            f"{self.chars:,}자 · ~{self.tokens:,} tok",
+            f"- 확장자별: {extensions}",
+            f"- 큰 파일: {largest}",
+        ]
+
+    def to_json(self) -> dict:
+        return {
+            'files': self.files,
+            'lines': self.lines,
+            'bytes': self.bytes,
+            'sections': self.sections,
+            'chars': self.chars,
+            'tokens': self.tokens,
+            'extensions': dict(sorted(self.extensions.items())),
+            'largest': [{'name': name, 'bytes': size, 'lines': lines} for size, lines, name in self.largest],
+            'names': self.names,
+        }
+
+
+def iter_file_map_lines(
+    entry: Entry,
+    cache: Optional[SectionCache] = None,
+    index: Optional[SectionIndex] = None,
+    root: Path = Path('.'),
+    stats: Optional[DirectoryStats] = None,
+) -> Iterator[str]:
+    """Yield file-map bullets one file at a time; each file's lines are dropped after extraction.
+
+    When ``index`` is given, every tracked file's sections are recorded into it under
+    its root-relative path; ``stats`` likewise receives the directory totals.
+    """
+    if cache is None:
+        cache = SectionCache(retain=False)
+    if cache.retain:
+        files: Optional[Iterable[Path]] = tracked_files(entry, cache, root)
+    else:
+        names = iter_tracked_names(entry, root)
+        base = root / (entry.file_map_path or '.')
+        files = None if names is None else (base / name for name in names)
+    if files is None:
+        yield "- 추적 가능한 파일이 없습니다."
+        return
+
+    relative_base = Path(entry.file_map_path or '.')
+    stats = stats if stats is not None else DirectoryStats()
+    emitted = False
+    for file in files:
+        facts = cache.file_map(file)
+        if index is not None:
+            index[(relative_base / file.name).as_posix()] = facts.sections
+        stats.add(file.name, facts)
+        for bullet in facts.bullets:
+            emitted = True
+            yield bullet
+
+    if not emitted:
+        yield "- 추적 가능한 파일이 없습니다."
+        return
+    yield from stats.summary_lines()
+
+
+def generate_file_map_lines(
+    entry: Entry,
+    cache: Optional[SectionCache] = None,
+    index: Optional[SectionIndex] = None,
+    root: Path = Path('.'),
+    stats: Optional[DirectoryStats] = None,
+) -> list[str]:
+    return list(iter_file_map_lines(entry, cache, index, root, stats))
@@ -0,0 +1,301 @@
+"""디스크·메모리 파일 시스템 백엔드와 원자적 쓰기 도우미."""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Iterator, NamedTuple, Optional, Union
+
+import contextvars
+import errno
+import hashlib
+import io
+import itertools
+import os
+import time
+from collections.abc import Mapping
+
+# SECTION: Filesystem Backend - 디스크·메모리 파일 시스템 백엔드
+# 생성 경로의 파일 접근은 모두 filesystem()을 거치므로, MemoryFileSystem으로 바꾸면 합성 트리·드라이런이
+# 디스크를 전혀 건드리지 않고, 같은 작업을 두 백엔드로 돌려 I/O 비용과 CPU 비용을 나눠 잴 수 있음.
+# 실행 잠금, 데몬 소켓, 공유 추출 캐시, 다른 루트의 레지스트리 로드는 항상 디스크를 사용
+class FileStat(NamedTuple):
+    st_size: int
+    st_mtime_ns: int
+    st_ino: int
+    st_dev: int = 0
+
+
+class LocalFileSystem:
+    """The real disk; the default backend."""
+
+    def stat(self, path: Union[str, Path]) -> os.stat_result:
+        return os.stat(path)
+
+    def exists(self, path: Union[str, Path]) -> bool:
+        return os.path.exists(path)
+
+    def is_file(self, path: Union[str, Path]) -> bool:
+        return os.path.isfile(path)
+
+    def is_dir(self, path: Union[str, Path]) -> bool:
+        return os.path.isdir(path)
+
+    def scandir(self, directory: Union[str, Path]) -> Iterator[os.DirEntry]:
+        with os.scandir(directory) as scan:
+            yield from scan
+
+    def read_bytes(self, path: Union[str, Path]) -> bytes:
+        with open(path, 'rb') as handle:
+            return handle.read()
+
+    def read_text(self, path: Union[str, Path]) -> str:
+        with open(path, encoding='utf-8') as handle:
+            return handle.read()
+
+    def open(self, path: Union[str, Path], mode: str = 'r') -> IO:
+        """``r``/``w`` are UTF-8 text with universal newlines, ``rb``/``wb`` binary."""
+        return open(path, mode, encoding=None if 'b' in mode else 'utf-8')
+
+    def write_text(self, path: Union[str, Path], text: str) -> None:
+        with open(path, 'w', encoding='utf-8') as handle:
+            handle.write(text)
+
+    def mkdir(self, path: Union[str, Path]) -> None:
+        os.makedirs(path, exist_ok=True)
+
+    def replace(self, source: Union[str, Path], target: Union[str, Path]) -> None:
+        os.replace(source, target)
+
+    def unlink(self, path: Union[str, Path]) -> None:
+        os.unlink(path)
+
+
+class MemoryDirEntry(NamedTuple):
+    name: str
+    path: str
+    directory: bool
+
+    def is_file(self) -> bool:
+        return not self.directory
+
+    def is_dir(self) -> bool:
+        return self.directory
+
+    def is_symlink(self) -> bool:
+        return False
+
+
+class _MemoryWriter(io.BytesIO):
+    """Buffer that lands in the owning MemoryFileSystem on close, like a file flushed to disk."""
+
+    def __init__(self, filesystem: MemoryFileSystem, key: str) -> None:
+        super().__init__()
+        self._filesystem = filesystem
+        self._key = key
+
+    def close(self) -> None:
+        if not self.closed:
+            self._filesystem._store(self._key, self.getvalue())
+        super().close()
+
+
+class MemoryFileSystem:
+    """Files and directories in dicts keyed by absolute path; nothing touches the disk.
+
+    Relative paths resolve against the process working directory, as on disk. Parents
+    of the initial ``files`` are created implicitly; later writes need the directory to
+    exist, which the generator always ensures. Each change advances a private clock,
+    so mtimes differ even between writes in the same nanosecond, and creating or
+    removing an entry bumps its directory's mtime as a real filesystem does.
+    """
+
+    def __init__(self, files: Optional[Mapping[Union[str, Path], Union[str, bytes]]] = None) -> None:
+        self._files: dict[str, bytes] = {}
+        self._children: dict[str, dict[str, bool]] = {}
+        # 파일·디렉터리 모두 stat 결과를 미리 만들어 두어 stat()은 dict 조회 한 번
+        self._stats: dict[str, FileStat] = {}
+        self._inodes = itertools.count(1)
+        self._clock = time.time_ns()
+        for path, data in (files or {}).items():
+            self.add(path, data)
+
+    @staticmethod
+    def _key(path: Union[str, Path]) -> str:
+        text = os.fspath(path)
+        # 이미 정규화된 절대 경로(Path가 만드는 대부분의 경로)는 abspath를 건너뜀: stat이 디스크보다 느려지지 않게 함
+        if text[:1] == os.sep and text[-1:] != os.sep and f"{os.sep}." not in text and os.sep * 2 not in text:
+            return text
+        return os.path.abspath(text)
+
+    def _tick(self, key: str) -> None:
+        """New mtime and current size for ``key``; the inode survives rewrites."""
+        self._clock += 1
+        previous = self._stats.get(key)
+        data = self._files.get(key)
+        self._stats[key] = FileStat(
+            len(data) if data is not None else 0,
+            self._clock,
+            previous.st_ino if previous is not None else next(self._inodes),
+        )
+
+    def _link(self, key: str, directory: bool) -> None:
+        parent, name = os.path.split(key)
+        children = self._children.get(parent)
+        if children is None:
+            raise FileNotFoundError(errno.ENOENT, os.strerror(errno.ENOENT), parent)
+        if name not in children:
+            children[name] = directory
+            self._tick(parent)
+
+    def _unlink(self, key: str) -> None:
+        parent, name = os.path.split(key)
+        del self._children[parent][name]
+        del self._stats[key]
+        self._tick(parent)
+
+    def _store(self, key: str, data: bytes) -> None:
+        if key in self._children:
+            raise IsADirectoryError(errno.EISDIR, os.strerror(errno.EISDIR), key)
+        self._link(key, False)
+        self._files[key] = data
+        self._tick(key)
+
+    def _data(self, path: Union[str, Path]) -> bytes:
+        key = self._key(path)
+        data = self._files.get(key)
+        if data is None:
+            if key in self._children:
+                raise IsADirectoryError(errno.EISDIR, os.strerror(errno.EISDIR), key)
+            raise FileNotFoundError(errno.ENOENT, os.strerror(errno.ENOENT), key)
+        return data
+
+    def add(self, path: Union[str, Path], data: Union[str, bytes]) -> None:
+        """Create or overwrite a file, creating missing parent directories."""
+        key = self._key(path)
+        self.mkdir(os.path.dirname(key))
+        self._store(key, data.encode('utf-8') if isinstance(data, str) else data)
+
+    def files(self) -> dict[str, bytes]:
+        """Every file as {absolute path: content}."""
+        return dict(self._files)
+
+    def stat(self, path: Union[str, Path]) -> FileStat:
+        key = self._key(path)
+        stat = self._stats.get(key)
+        if stat is None:
+            raise FileNotFoundError(errno.ENOENT, os.strerror(errno.ENOENT), key)
+        return stat
+
+    def exists(self, path: Union[str, Path]) -> bool:
+        return self._key(path) in self._stats
+
+    def is_file(self, path: Union[str, Path]) -> bool:
+        return self._key(path) in self._files
+
+    def is_dir(self, path: Union[str, Path]) -> bool:
+        return self._key(path) in self._children
+
+    def scandir(self, directory: Union[str, Path]) -> Iterator[MemoryDirEntry]:
+        key = self._key(directory)
+        children = self._children.get(key)
+        if children is None:
+            if key in self._files:
+                raise NotADirectoryError(errno.ENOTDIR, os.strerror(errno.ENOTDIR), key)
+            raise FileNotFoundError(errno.ENOENT, os.strerror(errno.ENOENT), key)
+        base = os.fspath(directory).rstrip(os.sep) + os.sep
+        for name, is_dir in list(children.items()):
+            yield MemoryDirEntry(name, base + name, is_dir)
+
+    def read_bytes(self, path: Union[str, Path]) -> bytes:
+        return self._data(path)
+
+    def read_text(self, path: Union[str, Path]) -> str:
+        return self._data(path).decode('utf-8')
+
+    def open(self, path: Union[str, Path], mode: str = 'r') -> IO:
+        if mode in ('r', 'rb'):
+            handle: io.BytesIO = io.BytesIO(self._data(path))
+        elif mode in ('w', 'wb'):
+            key = self._key(path)
+            if os.path.dirname(key) not in self._children:
+                raise FileNotFoundError(errno.ENOENT, os.strerror(errno.ENOENT), key)
+            handle = _MemoryWriter(self, key)
+        else:
+            raise ValueError(f"unsupported mode: {mode!r}")
+        return handle if 'b' in mode else io.TextIOWrapper(handle, encoding='utf-8')
+
+    def write_text(self, path: Union[str, Path], text: str) -> None:
+        self._store(self._key(path), text.encode('utf-8'))
+
+    def mkdir(self, path: Union[str, Path]) -> None:
+        key = self._key(path)
+        if key in self._children:
+            return
+        if key in self._files:
+            raise FileExistsError(errno.EEXIST, os.strerror(errno.EEXIST), key)
+        parent = os.path.dirname(key)
+        if parent != key:
+            self.mkdir(parent)
+        self._children[key] = {}
+        self._tick(key)
+        if parent != key:
+            self._link(key, True)
+
+    def replace(self, source: Union[str, Path], target: Union[str, Path]) -> None:
+        source_key, target_key = self._key(source), self._key(target)
+        data = self._data(source)
+        if target_key in self._children:
+            raise IsADirectoryError(errno.EISDIR, os.strerror(errno.EISDIR), target_key)
+        self._link(target_key, False)
+        # rename은 내용과 mtime·inode를 그대로 옮김
+        self._files[target_key] = data
+        self._stats[target_key] = self._stats[source_key]
+        del self._files[source_key]
+        self._unlink(source_key)
+
+    def unlink(self, path: Union[str, Path]) -> None:
+        key = self._key(path)
+        self._data(key)
+        del self._files[key]
+        self._unlink(key)
+
+
+FileSystem = Union[LocalFileSystem, MemoryFileSystem]
+LOCAL_FILESYSTEM = LocalFileSystem()
+
+_ACTIVE_FILESYSTEM: contextvars.ContextVar[FileSystem] = contextvars.ContextVar(
+    'claude_docs_filesystem', default=LOCAL_FILESYSTEM
+)
+
+
+def filesystem() -> FileSystem:
+    return _ACTIVE_FILESYSTEM.get()
+
+
+@contextmanager
+def using_filesystem(backend: Optional[FileSystem]) -> Iterator[None]:
+    if backend is None:
+        yield
+        return
+    token = _ACTIVE_FILESYSTEM.set(backend)
+    try:
+        yield
+    finally:
+        _ACTIVE_FILESYSTEM.reset(token)
+
+
+def _atomic_write_text(path: Path, text: str, backend: Optional[FileSystem] = None) -> None:
+    backend = backend or filesystem()
+    backend.mkdir(path.parent)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    backend.write_text(tmp, text)
+    backend.replace(tmp, path)
+
+
+def _sha256_file(path: Path, backend: Optional[FileSystem] = None) -> str:
+    digest = hashlib.sha256()
+    with (backend or filesystem()).open(path, 'rb') as handle:
+        for chunk in iter(lambda: handle.read(1 << 16), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
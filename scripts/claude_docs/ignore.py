@@ -0,0 +1,192 @@
+""".gitignore 패턴 컴파일과 경로 무시 규칙."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Optional, Union
+
+import functools
+import io
+import os
+import re
+import weakref
+
+from .fs import LOCAL_FILESYSTEM, FileSystem, LocalFileSystem, filesystem
+
+# SECTION: Ignore Rules - .gitignore 패턴을 컴파일한 경로 매처
+# 패턴은 .gitignore 파일마다 한 번만 정규식으로 컴파일하고, 순회 중 무시된 디렉터리는 내려가지 않고 건너뜀
+def _gitignore_body(pattern: str) -> str:
+    parts: list[str] = []
+    position = 0
+    while position < len(pattern):
+        char = pattern[position]
+        if pattern.startswith('**/', position):
+            parts.append('(?:.*/)?')
+            position += 3
+            continue
+        if pattern.startswith('**', position):
+            parts.append('.*')
+            position += 2
+            continue
+        if char == '*':
+            parts.append('[^/]*')
+        elif char == '?':
+            parts.append('[^/]')
+        elif char == '[':
+            close = pattern.find(']', position + 2 if pattern[position + 1:position + 2] in ('!', '^') else position + 1)
+            if close == -1:
+                parts.append(re.escape(char))
+            else:
+                content = pattern[position + 1:close]
+                if content.startswith('!'):
+                    content = '^' + content[1:]
+                parts.append(f"[{content.replace(chr(92), chr(92) * 2)}]")
+                position = close + 1
+                continue
+        elif char == '\\' and position + 1 < len(pattern):
+            parts.append(re.escape(pattern[position + 1]))
+            position += 2
+            continue
+        else:
+            parts.append(re.escape(char))
+        position += 1
+    return ''.join(parts)
+
+
+@dataclass(frozen=True)
+class GitignorePatterns:
+    """One compiled .gitignore; consecutive patterns of the same polarity share a single regex."""
+
+    base: str
+    # (negated, 디렉터리 대상 정규식, 파일 대상 정규식) - 뒤쪽 그룹일수록 우선
+    groups: tuple[tuple[bool, Optional[re.Pattern[str]], Optional[re.Pattern[str]]], ...]
+
+    @classmethod
+    def compile(cls, base: str, lines: Iterable[str]) -> GitignorePatterns:
+        grouped: list[tuple[bool, list[str], list[str]]] = []
+        for raw in lines:
+            line = raw.rstrip('\n').rstrip('\r')
+            if not line.strip() or line.startswith('#'):
+                continue
+            if not line.endswith('\\ '):
+                line = line.rstrip(' ')
+            negated = line.startswith('!')
+            if negated or line.startswith('\\!') or line.startswith('\\#'):
+                line = line[1:]
+            dir_only = line.endswith('/')
+            line = line.rstrip('/')
+            if not line:
+                continue
+            anchored = '/' in line
+            body = ('' if anchored else '(?:.*/)?') + _gitignore_body(line.lstrip('/'))
+            # 디렉터리 전용 패턴도 그 아래 파일은 모두 무시 대상
+            dir_regex = f"{body}(?:/.*)?"
+            file_regex = f"{body}/.*" if dir_only else dir_regex
+            if not grouped or grouped[-1][0] != negated:
+                grouped.append((negated, [], []))
+            grouped[-1][1].append(dir_regex)
+            grouped[-1][2].append(file_regex)
+        return cls(
+            base=base,
+            groups=tuple(
+                (negated, re.compile('|'.join(dirs)), re.compile('|'.join(files)))
+                for negated, dirs, files in grouped
+            ),
+        )
+
+    def match(self, relative: str, is_dir: bool) -> Optional[bool]:
+        """True if ignored, False if re-included by `!`, None if no pattern applies."""
+        for negated, dir_regex, file_regex in reversed(self.groups):
+            regex = dir_regex if is_dir else file_regex
+            if regex is not None and regex.fullmatch(relative):
+                return not negated
+        return None
+
+
+def _parse_gitignore(path_text: str, backend: FileSystem) -> GitignorePatterns:
+    base = os.path.dirname(path_text)
+    base = base if base.endswith('/') else base + '/'
+    if base.endswith('/.git/info/'):
+        base = base[: -len('.git/info/')]
+    with io.TextIOWrapper(backend.open(path_text, 'rb'), encoding='utf-8', errors='replace') as handle:
+        return GitignorePatterns.compile(base, handle)
+
+
+@functools.lru_cache(maxsize=1024)
+def _compile_gitignore(path_text: str, mtime_ns: int, size: int) -> GitignorePatterns:
+    # (mtime_ns, size)가 키에 포함되므로 파일이 바뀌면 자동으로 다시 컴파일
+    return _parse_gitignore(path_text, LOCAL_FILESYSTEM)
+
+
+# 디스크 외 백엔드의 컴파일 결과는 백엔드별로 두고 약한 참조로 묶어, 캐시가 MemoryFileSystem을 붙잡지 않고
+# 다른 백엔드의 같은 경로·stat과 섞이지 않게 함
+_BACKEND_GITIGNORES: weakref.WeakKeyDictionary[FileSystem, dict[tuple[str, int, int], GitignorePatterns]] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _load_gitignore(path_text: str) -> Optional[GitignorePatterns]:
+    backend = filesystem()
+    try:
+        stat = backend.stat(path_text)
+    except OSError:
+        return None
+    if isinstance(backend, LocalFileSystem):
+        return _compile_gitignore(path_text, stat.st_mtime_ns, stat.st_size)
+    compiled = _BACKEND_GITIGNORES.setdefault(backend, {})
+    key = (path_text, stat.st_mtime_ns, stat.st_size)
+    patterns = compiled.get(key)
+    if patterns is None:
+        patterns = compiled[key] = _parse_gitignore(path_text, backend)
+    return patterns
+
+
+@dataclass(frozen=True)
+class IgnoreRules:
+    """The .gitignore files that apply to one directory, outermost first."""
+
+    files: tuple[GitignorePatterns, ...] = ()
+
+    def child(self, directory: str) -> IgnoreRules:
+        patterns = _load_gitignore(os.path.join(directory, '.gitignore'))
+        return self if patterns is None else IgnoreRules(self.files + (patterns,))
+
+    def ignores(self, path: str, is_dir: bool) -> bool:
+        """`path` is absolute; the deepest .gitignore with a matching pattern decides."""
+        for patterns in reversed(self.files):
+            if not path.startswith(patterns.base):
+                continue
+            decision = patterns.match(path[len(patterns.base):], is_dir)
+            if decision is not None:
+                return decision
+        return False
+
+    @property
+    def key(self) -> tuple[int, ...]:
+        return tuple(id(patterns) for patterns in self.files)
+
+
+def ignore_rules_for(directory: Union[str, Path]) -> IgnoreRules:
+    """Rules for a directory: every .gitignore from the repository top (the dir holding .git) down."""
+    current = os.path.abspath(directory)
+    chain: list[str] = []
+    top: Optional[str] = None
+    while True:
+        chain.append(current)
+        if filesystem().exists(os.path.join(current, '.git')):
+            top = current
+            break
+        parent = os.path.dirname(current)
+        if parent == current:
+            break
+        current = parent
+
+    rules = IgnoreRules()
+    if top is not None:
+        exclude = _load_gitignore(os.path.join(top, '.git', 'info', 'exclude'))
+        if exclude is not None:
+            rules = IgnoreRules((exclude,))
+    for path in reversed(chain):
+        rules = rules.child(path)
+    return rules
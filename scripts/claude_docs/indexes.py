@@ -0,0 +1,238 @@
+"""섹션 인덱스·구조 diff, 디렉터리 통계, 추출 비용 기록."""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+from typing import AbstractSet, Iterator, Optional, Sequence
+
+import difflib
+import json
+import os
+
+from .filemap import DirectoryStats, SectionIndex
+from .fs import _atomic_write_text, filesystem
+from .manifest import ManifestDelta
+from .model import STATE_DIR, Workspace
+
+# SECTION: Section Diff Report - 실행 간 섹션 구조 변화 요약
+SECTION_INDEX_PATH = STATE_DIR / 'sections.json'
+SECTION_DIFF_PATH = STATE_DIR / 'section-diff.json'
+
+
+def load_section_index(
+    workspace: Optional[Workspace] = None,
+    only: Optional[AbstractSet[str]] = None,
+) -> dict[str, SectionIndex]:
+    """The stored index; ``only`` keeps just those files (the rest are never converted to tuples)."""
+    workspace = workspace or Workspace()
+    try:
+        data = json.loads(filesystem().read_text(workspace.resolve(SECTION_INDEX_PATH)))
+    except (OSError, ValueError):
+        return {}
+    return {
+        doc: {
+            file: [tuple(section) for section in sections]
+            for file, sections in files.items()
+            if only is None or file in only
+        }
+        for doc, files in data.get('docs', {}).items()
+    }
+
+
+def diff_file_sections(
+    old: Sequence[tuple[int, int, str, str]],
+    new: Sequence[tuple[int, int, str, str]],
+) -> dict:
+    """Align two section lists on their titles and classify the structural changes."""
+    matcher = difflib.SequenceMatcher(None, [s[2] for s in old], [s[2] for s in new], autojunk=False)
+    report: dict = {'added': [], 'removed': [], 'renamed': [], 'shifted': [], 'unchanged': 0}
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'equal':
+            for before, after in zip(old[i1:i2], new[j1:j2]):
+                if before[:2] != after[:2]:
+                    report['shifted'].append({'title': after[2], 'from': list(before[:2]), 'to': list(after[:2])})
+                else:
+                    report['unchanged'] += 1
+            continue
+        # replace 구간은 같은 위치끼리 이름 변경으로 보고, 길이 차이만큼 추가·삭제로 처리
+        paired = min(i2 - i1, j2 - j1) if tag == 'replace' else 0
+        for before, after in zip(old[i1:i1 + paired], new[j1:j1 + paired]):
+            report['renamed'].append({'from': before[2], 'to': after[2], 'range': list(after[:2])})
+        report['removed'].extend(section[2] for section in old[i1 + paired:i2])
+        report['added'].extend(section[2] for section in new[j1 + paired:j2])
+    return report
+
+
+def build_section_diff(
+    previous: dict[str, SectionIndex],
+    current: dict[str, SectionIndex],
+    only: Optional[AbstractSet[str]] = None,
+) -> dict[str, dict]:
+    """Per-file reports for files whose structure changed, tagged with the owning claude.md.
+
+    ``only`` limits the comparison to those files; the rest are taken as unchanged.
+    """
+    reports: dict[str, dict] = {}
+    for doc in sorted(set(previous) | set(current)):
+        old_files = previous.get(doc, {})
+        new_files = current.get(doc, {})
+        for file in sorted(set(old_files) | set(new_files)):
+            if only is not None and file not in only:
+                continue
+            old, new = old_files.get(file, []), new_files.get(file, [])
+            if old == new:
+                continue
+            report = diff_file_sections(old, new)
+            if report['added'] or report['removed'] or report['renamed'] or report['shifted']:
+                report['doc'] = doc
+                reports[file] = report
+    return reports
+
+
+def format_section_diff(reports: dict[str, dict]) -> list[str]:
+    if not reports:
+        return ['섹션 구조 변경 없음']
+    lines: list[str] = []
+    for file, report in reports.items():
+        parts = [
+            f"{label} {len(report[key])}"
+            for key, label in (('added', '+'), ('removed', '-'), ('renamed', '~'), ('shifted', '↕'))
+            if report[key]
+        ]
+        lines.append(f"{file} ({report['doc']}): {' '.join(parts)}")
+        lines.extend(f"  + {title}" for title in report['added'])
+        lines.extend(f"  - {title}" for title in report['removed'])
+        lines.extend(f"  ~ {item['from']} → {item['to']}" for item in report['renamed'])
+    return lines
+
+
+def record_section_index(
+    current: dict[str, SectionIndex],
+    workspace: Optional[Workspace] = None,
+    delta: Optional[ManifestDelta] = None,
+) -> dict[str, dict]:
+    """Persist this run's index and the diff against the previous run; returns the diff.
+
+    With a delta only the changed inputs are diffed, and when nothing changed the stored
+    index is kept as is and only an empty diff is written.
+    """
+    workspace = workspace or Workspace()
+    incremental = delta is not None and not delta.rebuild
+    if incremental and not delta.changed and filesystem().exists(workspace.resolve(SECTION_INDEX_PATH)):
+        _atomic_write_text(workspace.resolve(SECTION_DIFF_PATH), '{}\n')
+        return {}
+    only = delta.changed if incremental else None
+    reports = build_section_diff(load_section_index(workspace, only), current, only)
+    # json은 튜플을 배열로 쓰므로 섹션을 리스트로 바꾸지 않고 그대로 직렬화
+    payload = {
+        'version': 1,
+        'docs': {doc: dict(sorted(files.items())) for doc, files in sorted(current.items())},
+    }
+    _atomic_write_text(workspace.resolve(SECTION_INDEX_PATH), json.dumps(payload, ensure_ascii=False) + '\n')
+    _atomic_write_text(
+        workspace.resolve(SECTION_DIFF_PATH), json.dumps(reports, ensure_ascii=False, indent=2) + '\n'
+    )
+    return reports
+
+
+# SECTION: Directory Stats - 디렉터리별 파일·줄·섹션 통계 JSON
+# 파일 맵을 만드는 스캔에서 함께 집계되므로 update-claude-docs.js는 별도 디렉터리 순회 없이 이 파일을 읽음
+# (root와 파일 mtime으로 다른 루트의 통계나 디렉터리가 바뀐 뒤의 낡은 통계를 거부)
+STATS_PATH = STATE_DIR / 'stats.json'
+STATS_VERSION = 2
+
+
+def record_directory_stats(directory_stats: dict[str, dict], workspace: Optional[Workspace] = None) -> None:
+    workspace = workspace or Workspace()
+    payload = {
+        'version': STATS_VERSION,
+        'root': workspace.root.resolve().as_posix(),
+        'directories': dict(sorted(directory_stats.items())),
+    }
+    _atomic_write_text(workspace.resolve(STATS_PATH), json.dumps(payload, ensure_ascii=False) + '\n')
+
+
+class DirectoryStatsWriter:
+    """stats.json written while a streamed run writes the docs.
+
+    Each directory's file names go to disk as the file map lists them and its totals when the
+    directory is done, so the run never holds a listing or the totals of earlier directories.
+    """
+
+    def __init__(self, out, header: dict) -> None:
+        self._out = out
+        # 닫는 '}' 대신 directories 객체를 열어 두고 디렉터리마다 이어 씀
+        out.write(json.dumps(header, ensure_ascii=False)[:-1] + ', "directories": {')
+        self._directories = 0
+
+    @contextmanager
+    def directory(self, name: str) -> Iterator[DirectoryStats]:
+        out = self._out
+        out.write((', ' if self._directories else '') + json.dumps(name, ensure_ascii=False) + ': {"names": [')
+        self._directories += 1
+        written = 0
+
+        def write_name(file_name: str) -> None:
+            nonlocal written
+            out.write((', ' if written else '') + json.dumps(file_name, ensure_ascii=False))
+            written += 1
+
+        totals = DirectoryStats(on_name=write_name)
+        yield totals
+        rest = totals.to_json()
+        del rest['names']
+        out.write('], ' + json.dumps(rest, ensure_ascii=False)[1:])
+
+
+@contextmanager
+def directory_stats_writer(workspace: Optional[Workspace] = None) -> Iterator[DirectoryStatsWriter]:
+    """Stream stats.json through a temporary file that replaces the previous one only on success."""
+    workspace = workspace or Workspace()
+    backend = filesystem()
+    path = workspace.resolve(STATS_PATH)
+    backend.mkdir(path.parent)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    header = {'version': STATS_VERSION, 'root': workspace.root.resolve().as_posix()}
+    try:
+        with backend.open(tmp, 'w') as out:
+            yield DirectoryStatsWriter(out, header)
+            out.write('}}\n')
+    except BaseException:
+        if backend.exists(tmp):
+            backend.unlink(tmp)
+        raise
+    backend.replace(tmp, path)
+
+
+def load_directory_stats(workspace: Optional[Workspace] = None) -> dict[str, dict]:
+    workspace = workspace or Workspace()
+    try:
+        data = json.loads(filesystem().read_text(workspace.resolve(STATS_PATH)))
+    except (OSError, ValueError):
+        return {}
+    if data.get('version') != STATS_VERSION:
+        return {}
+    return data.get('directories', {})
+
+
+
+# SECTION: Extraction Costs - 스케줄러 비용 모델용 파일별 추출 시간 기록
+EXTRACT_COSTS_PATH = STATE_DIR / 'costs.json'
+EXTRACT_COSTS_VERSION = 1
+
+
+def load_extract_costs(workspace: Optional[Workspace] = None) -> dict[str, float]:
+    workspace = workspace or Workspace()
+    try:
+        data = json.loads(filesystem().read_text(workspace.resolve(EXTRACT_COSTS_PATH)))
+    except (OSError, ValueError):
+        return {}
+    if data.get('version') != EXTRACT_COSTS_VERSION:
+        return {}
+    return data.get('files', {})
+
+
+def record_extract_costs(costs: dict[str, float], workspace: Optional[Workspace] = None) -> None:
+    workspace = workspace or Workspace()
+    payload = {'version': EXTRACT_COSTS_VERSION, 'files': {path: round(costs[path], 6) for path in sorted(costs)}}
+    _atomic_write_text(workspace.resolve(EXTRACT_COSTS_PATH), json.dumps(payload, ensure_ascii=False) + '\n')
@@ -0,0 +1,288 @@
+"""생성 매니페스트와 stat 기반 staleness 검사."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable, Optional, Sequence
+
+import json
+
+from .cache import SectionCache
+from .filemap import _tracked_names, tracked_files
+from .fs import _atomic_write_text, _sha256_file, filesystem
+from .model import STATE_DIR, Workspace, generator_sources
+from .render import render_entry, render_root_document
+
+# SECTION: Generation Manifest - 입력·출력 지문 기록과 stat 기반 staleness 검사
+MANIFEST_PATH = STATE_DIR / 'manifest.json'
+MANIFEST_VERSION = 2
+
+
+@dataclass
+class ManifestDelta:
+    """Input changes seen by :func:`update_manifest`, so derived indexes can patch instead of rebuild.
+
+    ``changed`` holds root-relative input keys that are new, modified or gone since the previous
+    manifest. ``rebuild`` is set when there was no usable previous manifest or the generator changed;
+    derived indexes must then be rebuilt from scratch.
+    """
+
+    inputs: dict[str, dict] = field(default_factory=dict)
+    changed: set[str] = field(default_factory=set)
+    rebuild: bool = True
+
+
+def _file_fingerprint(path: Path, previous: Optional[dict] = None) -> Optional[dict]:
+    """Stat fingerprint plus content hash; reuses the previous hash when the stat is unchanged."""
+    try:
+        stat = filesystem().stat(path)
+    except OSError:
+        return None
+    if previous and previous.get('size') == stat.st_size and previous.get('mtime_ns') == stat.st_mtime_ns:
+        return previous
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': _sha256_file(path)}
+
+
+def _fingerprint_matches(path: Path, recorded: Optional[dict]) -> bool:
+    """Stat first; only hash when size matches but mtime differs (e.g. a fresh clone)."""
+    if not recorded:
+        return False
+    try:
+        stat = filesystem().stat(path)
+    except OSError:
+        return False
+    if stat.st_size != recorded.get('size'):
+        return False
+    if stat.st_mtime_ns == recorded.get('mtime_ns'):
+        return True
+    return _sha256_file(path) == recorded.get('sha256')
+
+
+def _generator_fingerprints(workspace: Workspace, previous: Optional[dict] = None) -> dict[str, dict]:
+    previous = previous or {}
+    fingerprints: dict[str, dict] = {}
+    for relative in generator_sources(workspace):
+        key = relative.as_posix()
+        fingerprint = _file_fingerprint(workspace.resolve(relative), previous.get(key))
+        if fingerprint is not None:
+            fingerprints[key] = fingerprint
+    return fingerprints
+
+
+def _generator_matches(workspace: Workspace, recorded: Optional[dict]) -> bool:
+    """The script and every package module still match; an added or removed module also counts."""
+    if not recorded:
+        return False
+    sources = [relative.as_posix() for relative in generator_sources(workspace)]
+    if sorted(sources) != sorted(recorded):
+        return False
+    return all(_fingerprint_matches(workspace.resolve(key), recorded[key]) for key in sources)
+
+
+def load_manifest(workspace: Optional[Workspace] = None) -> dict:
+    workspace = workspace or Workspace()
+    try:
+        manifest = json.loads(filesystem().read_text(workspace.resolve(MANIFEST_PATH)))
+    except (OSError, ValueError):
+        return {}
+    if manifest.get('version') != MANIFEST_VERSION:
+        return {}
+    return manifest
+
+
+def _root_document_path(workspace: Workspace) -> Optional[Path]:
+    for candidate in ('CLAUDE.md', 'claude.md'):
+        if filesystem().exists(workspace.resolve(candidate)):
+            return Path(candidate)
+    return None
+
+
+def manifest_records(
+    doc_paths: Iterable[str],
+    cache: Optional[SectionCache] = None,
+    workspace: Optional[Workspace] = None,
+    previous_outputs: Optional[dict] = None,
+) -> dict[str, Optional[dict]]:
+    """Fingerprint records per doc; None marks a doc whose output no longer exists."""
+    workspace = workspace or Workspace()
+    docs = workspace.docs
+    previous_outputs = previous_outputs or {}
+    records: dict[str, Optional[dict]] = {}
+
+    for doc_path in doc_paths:
+        if doc_path not in docs:
+            records[doc_path] = None
+            continue
+        if doc_path == 'CLAUDE.md':
+            root_path = _root_document_path(workspace)
+            if root_path is None:
+                records[doc_path] = None
+                continue
+            output_path = root_path
+            files: list[Path] = []
+            base = Path('.')
+        else:
+            output_path = Path(doc_path)
+            files = tracked_files(docs[doc_path], cache, workspace.root) or []
+            base = Path(docs[doc_path].file_map_path or '.')
+
+        old = previous_outputs.get(doc_path, {})
+        old_inputs: dict = old.get('inputs', {})
+        inputs: dict[str, dict] = {}
+        for file in files:
+            key = (base / file.name).as_posix()
+            fingerprint = _file_fingerprint(file, old_inputs.get(key))
+            if fingerprint is not None:
+                inputs[key] = fingerprint
+        output = _file_fingerprint(workspace.resolve(output_path), old.get('output'))
+        if output is None:
+            records[doc_path] = None
+            continue
+        records[doc_path] = {
+            'path': output_path.as_posix(),
+            'output': output,
+            'listing': [file.name for file in files],
+            'inputs': inputs,
+        }
+    return records
+
+
+def update_manifest(
+    doc_paths: Iterable[str],
+    cache: Optional[SectionCache] = None,
+    workspace: Optional[Workspace] = None,
+    merged: Optional[dict[str, Optional[dict]]] = None,
+) -> ManifestDelta:
+    """Refresh records for doc_paths; `merged` carries records already computed by shard runs."""
+    workspace = workspace or Workspace()
+    docs = workspace.docs
+    previous = load_manifest(workspace)
+    previous_outputs: dict = previous.get('outputs', {})
+    outputs = dict(previous_outputs)
+    records = dict(merged or {})
+    records.update(manifest_records(doc_paths, cache, workspace, previous_outputs))
+
+    delta = ManifestDelta()
+    for doc_path, record in records.items():
+        old_inputs: dict = (previous_outputs.get(doc_path) or {}).get('inputs', {})
+        new_inputs: dict = record['inputs'] if record is not None else {}
+        delta.inputs.update(new_inputs)
+        delta.changed.update(
+            key for key in old_inputs.keys() | new_inputs.keys() if old_inputs.get(key) != new_inputs.get(key)
+        )
+        if record is None:
+            outputs.pop(doc_path, None)
+        else:
+            outputs[doc_path] = record
+
+    # 레지스트리에서 사라진 항목은 매니페스트에서도 제거
+    for key in [key for key in outputs if key not in docs]:
+        delta.changed.update(outputs.pop(key).get('inputs', {}))
+    generator = _generator_fingerprints(workspace, previous.get('generator'))
+    delta.rebuild = not previous or generator != previous.get('generator')
+    manifest = {
+        'version': MANIFEST_VERSION,
+        'generator': generator,
+        'outputs': dict(sorted(outputs.items())),
+    }
+    _atomic_write_text(workspace.resolve(MANIFEST_PATH), json.dumps(manifest, ensure_ascii=False, indent=2) + '\n')
+    return delta
+
+
+def find_stale_outputs(workspace: Optional[Workspace] = None) -> list[tuple[str, str]]:
+    """Return (doc path, reason) pairs without rendering or writing anything."""
+    workspace = workspace or Workspace()
+    docs = workspace.docs
+    manifest = load_manifest(workspace)
+    if not manifest:
+        return [(doc_path, 'manifest missing') for doc_path in sorted(docs)]
+
+    if not _generator_matches(workspace, manifest.get('generator')):
+        return [(doc_path, 'generator changed') for doc_path in sorted(docs)]
+
+    outputs: dict = manifest.get('outputs', {})
+    stale: list[tuple[str, str]] = []
+    for doc_path in sorted(docs):
+        record = outputs.get(doc_path)
+        if doc_path == 'CLAUDE.md':
+            root_path = _root_document_path(workspace)
+            if root_path is None and record is None:
+                continue
+            if (
+                record is None
+                or root_path is None
+                or not _fingerprint_matches(workspace.resolve(root_path), record['output'])
+            ):
+                stale.append((doc_path, 'output changed'))
+            continue
+        if record is None:
+            stale.append((doc_path, 'not in manifest'))
+            continue
+        if not _fingerprint_matches(workspace.resolve(record['path']), record['output']):
+            stale.append((doc_path, 'output changed'))
+            continue
+        entry = docs[doc_path]
+        names = _tracked_names(entry, workspace.root) or []
+        if names != record['listing']:
+            stale.append((doc_path, 'files added or removed'))
+            continue
+        base = Path(entry.file_map_path or '.')
+        inputs: dict = record['inputs']
+        changed = next(
+            (
+                key
+                for key in ((base / name).as_posix() for name in names)
+                if not _fingerprint_matches(workspace.resolve(key), inputs.get(key))
+            ),
+            None,
+        )
+        if changed is not None:
+            stale.append((doc_path, f"input changed: {changed}"))
+    return stale
+
+
+def find_differing_outputs(workspace: Optional[Workspace] = None) -> list[tuple[str, str]]:
+    """Render every doc in memory and compare it byte for byte with the file on disk; writes nothing.
+
+    Used by ``--check`` when there is no manifest, e.g. in a fresh clone where the state
+    directory is not tracked.
+    """
+    workspace = workspace or Workspace()
+    docs = workspace.docs
+    cache = SectionCache()
+    stale: list[tuple[str, str]] = []
+    for doc_path in sorted(docs):
+        if doc_path == 'CLAUDE.md':
+            rendered = render_root_document(workspace)
+            if rendered is None:
+                continue
+            path, text = rendered
+        else:
+            path = workspace.resolve(doc_path)
+            text = render_entry(docs[doc_path], cache, root=workspace.root)
+        try:
+            current = filesystem().read_bytes(path)
+        except OSError:
+            stale.append((doc_path, 'output missing'))
+            continue
+        if current != text.encode('utf-8'):
+            stale.append((doc_path, 'output differs'))
+    return stale
+
+
+def check_outputs(workspaces: Optional[Sequence[Workspace]] = None) -> int:
+    workspaces = workspaces or [Workspace()]
+    exit_code = 0
+    for workspace in workspaces:
+        prefix = '' if len(workspaces) == 1 else f"[{workspace.root.as_posix()}] "
+        # 상태 디렉터리는 추적하지 않으므로 새로 받은 저장소(CI 등)에는 매니페스트가 없음: 렌더링해 내용으로 비교
+        stale = find_stale_outputs(workspace) if load_manifest(workspace) else find_differing_outputs(workspace)
+        if not stale:
+            print(f"{prefix}claude.md 문서가 최신 상태입니다.")
+            continue
+        exit_code = 1
+        print(f"{prefix}오래된 claude.md 문서 {len(stale)}개:")
+        for doc_path, reason in stale:
+            print(f"- {doc_path} ({reason})")
+    return exit_code
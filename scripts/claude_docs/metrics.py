@@ -0,0 +1,77 @@
+"""node_exporter textfile 형식의 실행 지표."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Callable, Sequence
+
+import time
+
+from .fs import _atomic_write_text
+from .pipeline import RunStats
+
+# SECTION: Prometheus Metrics - node_exporter textfile 내보내기
+METRIC_PREFIX = 'claude_docs'
+
+
+def _prometheus_label(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def render_prometheus_metrics(runs: Sequence[tuple[Path, RunStats]]) -> str:
+    """One metric family block per metric, with one sample set per workspace root."""
+    finished = time.time()
+    families: list[tuple[str, str, Callable[[RunStats], list[tuple[str, float]]]]] = [
+        ('run_duration_seconds', 'Wall time of the last generator run.', lambda st: [('', st.duration)]),
+        (
+            'phase_duration_seconds',
+            'Wall time per generator phase in the last run.',
+            lambda st: [(f'phase="{name}"', value) for name, value in sorted(st.phases.items())],
+        ),
+        ('files_scanned', 'Tracked files visited for file maps.',
+         lambda st: [('', st.counters.get('files_scanned', 0))]),
+        ('bytes_read', 'Bytes read from source files (cache misses only).',
+         lambda st: [('', st.counters.get('bytes_read', 0))]),
+        ('sections_extracted', 'Sections listed across all file maps.',
+         lambda st: [('', st.counters.get('sections_extracted', 0))]),
+        ('files_skipped', 'Tracked files that produced no sections.',
+         lambda st: [('', st.counters.get('files_skipped', 0))]),
+        ('dangling_references', 'References to docs or files that do not exist.',
+         lambda st: [('', st.counters.get('dangling_references', 0))]),
+        (
+            'docs',
+            'claude.md outputs by write result.',
+            lambda st: [
+                ('result="written"', st.counters.get('docs_written', 0)),
+                ('result="unchanged"', st.counters.get('docs_unchanged', 0)),
+                ('result="deferred"', st.counters.get('docs_deferred', 0)),
+            ],
+        ),
+        (
+            'cache_hit_ratio',
+            'Hit ratio of the in-process caches.',
+            lambda st: [
+                ('cache="sections"', st.hit_ratio('section')),
+                ('cache="listing"', st.hit_ratio('listing')),
+                ('cache="shared"', st.hit_ratio('shared')),
+            ],
+        ),
+        ('last_run_timestamp_seconds', 'Unix time the last run finished.', lambda st: [('', finished)]),
+    ]
+
+    lines: list[str] = []
+    for name, help_text, samples_for in families:
+        full_name = f"{METRIC_PREFIX}_{name}"
+        lines.append(f"# HELP {full_name} {help_text}")
+        lines.append(f"# TYPE {full_name} gauge")
+        for root, stats in runs:
+            base = f'root="{_prometheus_label(root.resolve().as_posix())}"'
+            for labels, value in samples_for(stats):
+                label_text = f"{base},{labels}" if labels else base
+                lines.append(f"{full_name}{{{label_text}}} {value!r}")
+    return '\n'.join(lines) + '\n'
+
+
+def write_metrics_textfile(path: Path, runs: Sequence[tuple[Path, RunStats]]) -> None:
+    # node_exporter가 반쯤 쓰인 파일을 읽지 않도록 같은 디렉터리에 쓴 뒤 rename
+    _atomic_write_text(path, render_prometheus_metrics(runs))
@@ -0,0 +1,166 @@
+"""claude.md 문서 항목 모델과 저장소 루트별 작업 공간."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field, fields
+from pathlib import Path
+from typing import Iterable, Optional, Sequence, Union
+
+import hashlib
+import importlib.util
+import sys
+
+from .fs import LOCAL_FILESYSTEM, _sha256_file, filesystem
+
+# SECTION: Data Model - claude 문서 항목 구조
+
+@dataclass
+class Entry:
+    title: str
+    purpose: list[str]
+    responsibilities: list[str]
+    structure: list[str]
+    centralization: list[str]
+    rules: list[str]
+    references: list[str]
+    file_map_path: Optional[str] = None
+    file_map_extensions: Optional[tuple[str, ...]] = None
+
+class Registry(dict[str, Entry]):
+    """Doc path -> Entry, filled by :meth:`add`; a generator script owns one as its ``DOCS``."""
+
+    def add(
+        self,
+        path: str,
+        *,
+        title: str,
+        purpose: Iterable[str],
+        responsibilities: Iterable[str] | None = None,
+        structure: Iterable[str] | None = None,
+        centralization: Iterable[str] | None = None,
+        rules: Iterable[str] | None = None,
+        references: Iterable[str] | None = None,
+        file_map_path: str | None = None,
+        file_map_extensions: Sequence[str] | None = None,
+    ) -> None:
+        if path in self:
+            raise ValueError(f"Duplicate entry for {path}")
+
+        resolved_path = Path(path)
+        if file_map_path is None:
+            parent = resolved_path.parent
+            file_map_path = None if str(parent) in ('', '.') else parent.as_posix()
+        else:
+            file_map_path = Path(file_map_path).as_posix()
+
+        extensions_tuple: Optional[tuple[str, ...]] = None
+        if file_map_extensions:
+            extensions_tuple = tuple({ext.lower() for ext in file_map_extensions})
+
+        self[path] = Entry(
+            title=title,
+            purpose=list(purpose),
+            responsibilities=list(responsibilities or []),
+            structure=list(structure or []),
+            centralization=list(centralization or []),
+            rules=list(rules or []),
+            references=list(references or []),
+            file_map_path=file_map_path,
+            file_map_extensions=extensions_tuple,
+        )
+
+
+# SECTION: Workspace - 저장소 루트별 레지스트리와 경로 해석
+DEFAULT_ROOT_LABEL = 'Weave_V3'
+# 레지스트리와 CLI를 담은 스크립트, 그리고 생성 로직 패키지 (루트 기준)
+GENERATOR_RELATIVE_PATH = Path('scripts/generate_claude_docs.py')
+GENERATOR_PACKAGE_RELATIVE_PATH = Path('scripts/claude_docs')
+STATE_DIR = Path('.claude-docs')
+PACKAGE_DIR = Path(__file__).resolve().parent
+
+
+@dataclass
+class Workspace:
+    """One checkout or worktree: its root, the label shown in the tree, and its own registry copy."""
+
+    root: Path = field(default_factory=lambda: Path('.'))
+    label: str = DEFAULT_ROOT_LABEL
+    docs: dict[str, Entry] = field(default_factory=lambda: own_registry())
+
+    def resolve(self, relative: Union[str, Path]) -> Path:
+        # Path('.') / 'src' == Path('src') 이므로 기본 루트에서는 기존 상대 경로와 동일
+        return self.root / relative
+
+
+def own_registry() -> dict[str, Entry]:
+    """Copy of this generator's registry; importing only the package still loads the script's entries."""
+    script = PACKAGE_DIR.parent / GENERATOR_RELATIVE_PATH.name
+    main = sys.modules.get('__main__')
+    # 스크립트로 실행된 경우 __main__이 이미 항목을 채웠으므로 같은 파일을 모듈로 한 번 더 실행하지 않음
+    if main is not None and getattr(main, '__file__', None) and Path(main.__file__).resolve() == script:
+        return dict(main.DOCS)
+    return dict(importlib.import_module(GENERATOR_RELATIVE_PATH.stem).DOCS)
+
+
+def load_registry(root: Path) -> dict[str, Entry]:
+    """Registry for a root; a worktree on another branch brings its own generator and entries."""
+    script = root / GENERATOR_RELATIVE_PATH
+    own = PACKAGE_DIR.parent / GENERATOR_RELATIVE_PATH.name
+    if not script.is_file() or script.resolve() == own:
+        return own_registry()
+    if _sha256_file(script, LOCAL_FILESYSTEM) == _sha256_file(own, LOCAL_FILESYSTEM):
+        return own_registry()
+
+    module_name = f"_claude_docs_registry_{hashlib.sha1(str(script.resolve()).encode()).hexdigest()[:12]}"
+    spec = importlib.util.spec_from_file_location(module_name, script)
+    if spec is None or spec.loader is None:
+        return own_registry()
+    module = importlib.util.module_from_spec(spec)
+    # dataclass 처리가 sys.modules에서 모듈을 찾으므로 실행 중에만 등록
+    # (단일 파일 생성기와 이 패키지를 쓰는 생성기 모두 스크립트 자신의 DOCS에 항목을 채움)
+    sys.modules[module_name] = module
+    try:
+        spec.loader.exec_module(module)
+    except ImportError as error:
+        raise SystemExit(f"{script}: 레지스트리를 불러올 수 없습니다 ({error})") from None
+    finally:
+        sys.modules.pop(module_name, None)
+    names = [item.name for item in fields(Entry)]
+    return {
+        path: Entry(**{name: getattr(entry, name) for name in names if hasattr(entry, name)})
+        for path, entry in getattr(module, 'DOCS', {}).items()
+    }
+
+
+def parse_root_spec(spec: str) -> Workspace:
+    """`PATH` or `PATH=LABEL`; the label defaults to the root directory's name."""
+    path_text, _, label = spec.partition('=')
+    root = Path(path_text or '.')
+    if not root.is_dir():
+        raise SystemExit(f"--root {spec}: 디렉터리가 아닙니다")
+    # 파일 시스템 루트(/)처럼 이름이 없는 경우에만 프로젝트 이름을 사용
+    return Workspace(root=root, label=label or root.resolve().name or DEFAULT_ROOT_LABEL, docs=load_registry(root))
+
+
+def generator_sources(workspace: Workspace) -> list[Path]:
+    """Root-relative generator files (the script, then the package modules) that outputs depend on."""
+    package = workspace.resolve(GENERATOR_PACKAGE_RELATIVE_PATH)
+    try:
+        names = sorted(
+            item.name for item in filesystem().scandir(package) if item.name.endswith('.py') and item.is_file()
+        )
+    except (FileNotFoundError, NotADirectoryError):
+        names = []
+    return [GENERATOR_RELATIVE_PATH] + [GENERATOR_PACKAGE_RELATIVE_PATH / name for name in names]
+
+
+def generator_digest(workspace: Workspace) -> str:
+    """One content hash over :func:`generator_sources`; missing files hash as absent."""
+    digest = hashlib.sha256()
+    for relative in generator_sources(workspace):
+        try:
+            file_digest = _sha256_file(workspace.resolve(relative))
+        except OSError:
+            file_digest = '-'
+        digest.update(f"{relative.as_posix()}\0{file_digest}\n".encode('utf-8'))
+    return digest.hexdigest()
@@ -0,0 +1,165 @@
+"""섹션 바이트 범위 인덱스와 부분 읽기."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Optional, Sequence
+
+import json
+import mmap
+import os
+
+from .extraction import extract_sections
+from .filemap import SectionIndex
+from .fs import _atomic_write_text, filesystem
+from .manifest import ManifestDelta, _file_fingerprint, _fingerprint_matches
+from .model import STATE_DIR, Workspace
+
+# SECTION: Byte Offsets - 섹션 바이트 범위 인덱스와 부분 읽기
+# 라인 범위만으로는 소비자가 파일 앞부분을 모두 읽어야 하므로 (start, length) 바이트 범위를 따로 기록
+# 매니페스트가 이미 입력 파일마다 stat·해시를 구하므로, 그 변경분(ManifestDelta)에 든 파일만 다시 계산
+OFFSET_INDEX_PATH = STATE_DIR / 'offsets.json'
+OFFSET_INDEX_VERSION = 1
+
+
+def section_byte_ranges(path: Path, sections: Sequence[tuple[int, int, str, str]]) -> list[tuple[int, int]]:
+    """(byte start, byte length) per section, splitting lines exactly as the extractors did."""
+    if not sections:
+        return []
+    data = filesystem().read_bytes(path)
+    if path.suffix.lower() == '.sql':
+        # SQL은 텍스트 모드 라인 반복(universal newlines)으로 추출하므로 \n, \r\n, \r만 줄 경계
+        line_sizes = [len(line) for line in data.splitlines(keepends=True)]
+    else:
+        text = data.decode('utf-8')
+        line_sizes = (
+            [len(line) for line in text.splitlines(keepends=True)]
+            if data.isascii()
+            else [len(line.encode('utf-8')) for line in text.splitlines(keepends=True)]
+        )
+    starts = [0]
+    for size in line_sizes:
+        starts.append(starts[-1] + size)
+
+    ranges: list[tuple[int, int]] = []
+    for start_line, end_line, _, _ in sections:
+        first = starts[min(start_line - 1, len(line_sizes))]
+        last = starts[min(end_line, len(line_sizes))]
+        ranges.append((first, last - first))
+    return ranges
+
+
+def _offset_records(path: Path, sections: Sequence[tuple[int, int, str, str]]) -> list[list]:
+    return [
+        [start_line, end_line, title, byte_start, byte_length]
+        for (start_line, end_line, title, _), (byte_start, byte_length) in zip(
+            sections, section_byte_ranges(path, sections)
+        )
+    ]
+
+
+def load_offset_index(workspace: Optional[Workspace] = None) -> dict[str, dict]:
+    workspace = workspace or Workspace()
+    try:
+        data = json.loads(filesystem().read_text(workspace.resolve(OFFSET_INDEX_PATH)))
+    except (OSError, ValueError):
+        return {}
+    if data.get('version') != OFFSET_INDEX_VERSION:
+        return {}
+    return data.get('files', {})
+
+
+def record_byte_offsets(
+    doc_index: dict[str, SectionIndex],
+    workspace: Optional[Workspace] = None,
+    delta: Optional[ManifestDelta] = None,
+) -> int:
+    """Write the side index, recomputing only files in ``delta.changed``; returns the recomputed count.
+
+    Without a delta every previous record is re-validated by stat. When the delta reports no
+    changes and the side index exists, nothing is read or written.
+    """
+    workspace = workspace or Workspace()
+    index_path = workspace.resolve(OFFSET_INDEX_PATH)
+    incremental = delta is not None and not delta.rebuild
+    if incremental and not delta.changed and filesystem().exists(index_path):
+        return 0
+    previous = load_offset_index(workspace)
+    files: dict[str, dict] = {}
+    computed = 0
+    for index in doc_index.values():
+        for relative, sections in index.items():
+            old = previous.get(relative)
+            if old is not None and incremental and relative not in delta.changed:
+                files[relative] = old
+                continue
+            path = workspace.resolve(relative)
+            if old is not None and not incremental and _fingerprint_matches(path, old.get('fingerprint')):
+                files[relative] = old
+                continue
+            fingerprint = (delta.inputs.get(relative) if delta is not None else None) or _file_fingerprint(path)
+            if fingerprint is None:
+                continue
+            try:
+                records = _offset_records(path, sections)
+            except (OSError, UnicodeDecodeError):
+                continue
+            files[relative] = {'fingerprint': fingerprint, 'sections': records}
+            computed += 1
+    payload = {'version': OFFSET_INDEX_VERSION, 'files': dict(sorted(files.items()))}
+    _atomic_write_text(index_path, json.dumps(payload, ensure_ascii=False) + '\n')
+    return computed
+
+
+def section_offsets(relative: str, workspace: Optional[Workspace] = None) -> list[list]:
+    """Offset records for one root-relative file, recomputed when the side index is stale."""
+    workspace = workspace or Workspace()
+    path = workspace.resolve(relative)
+    record = load_offset_index(workspace).get(Path(relative).as_posix())
+    if record is not None and _fingerprint_matches(path, record.get('fingerprint')):
+        return record['sections']
+    return _offset_records(path, extract_sections(path))
+
+
+def _match_section(records: Sequence[list], selector: str) -> list:
+    """`N` picks the N-th section (1-based); otherwise an exact, then unique substring, title match."""
+    if selector.isdigit():
+        position = int(selector)
+        if not 1 <= position <= len(records):
+            raise LookupError(f"section {position} out of range (1~{len(records)})")
+        return records[position - 1]
+    exact = [record for record in records if record[2] == selector]
+    if exact:
+        return exact[0]
+    lowered = selector.lower()
+    partial = [record for record in records if lowered in record[2].lower()]
+    if len(partial) == 1:
+        return partial[0]
+    if not partial:
+        raise LookupError(f"no section matching {selector!r}")
+    raise LookupError(f"{selector!r} matches {len(partial)} sections: " + ', '.join(record[2] for record in partial))
+
+
+def read_byte_range(path: Path, start: int, length: int) -> bytes:
+    """Read only [start, start + length) with pread, falling back to mmap where pread is missing.
+
+    Handles without a file descriptor (the in-memory backend) are read with seek().
+    """
+    if length <= 0:
+        return b''
+    with filesystem().open(path, 'rb') as handle:
+        try:
+            fileno = handle.fileno()
+        except OSError:
+            handle.seek(start)
+            return handle.read(length)
+        if hasattr(os, 'pread'):
+            return os.pread(fileno, length, start)
+        with mmap.mmap(fileno, 0, access=mmap.ACCESS_READ) as view:
+            return view[start:start + length]
+
+
+def read_section(relative: str, selector: str, workspace: Optional[Workspace] = None) -> bytes:
+    workspace = workspace or Workspace()
+    record = _match_section(section_offsets(relative, workspace), selector)
+    return read_byte_range(workspace.resolve(relative), record[3], record[4])
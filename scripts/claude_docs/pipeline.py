@@ -0,0 +1,378 @@
+"""문서 생성 실행: 워커 풀, 문서 작성, 실행 후 상태 기록."""
+
+from __future__ import annotations
+
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable, Iterator, NamedTuple, Optional, Sequence
+
+import concurrent.futures
+import os
+import threading
+import time
+from collections import defaultdict
+
+from .cache import SectionCache
+from .extraction import extract_sized_sections, resolve_tokenizer
+from .filemap import DirectoryStats, SectionIndex, tracked_files
+from .fs import LOCAL_FILESYSTEM, filesystem
+from .indexes import (
+    SECTION_DIFF_PATH,
+    SECTION_INDEX_PATH,
+    directory_stats_writer,
+    load_extract_costs,
+    record_directory_stats,
+    record_extract_costs,
+    record_section_index,
+)
+from .manifest import MANIFEST_PATH, update_manifest
+from .model import Workspace
+from .offsets import OFFSET_INDEX_PATH, record_byte_offsets
+from .profiling import _ACTIVE_TRACER, memory_span, trace_span
+from .references import report_dangling_references, update_reference_graph
+from .render import update_root_document, write_entry, write_entry_streaming
+
+# SECTION: Run Statistics - 실행 단계별 시간과 작업량 집계
+@dataclass
+class RunStats:
+    started: float = field(default_factory=time.perf_counter)
+    duration: float = 0.0
+    phases: dict[str, float] = field(default_factory=dict)
+    counters: dict[str, int] = field(default_factory=lambda: defaultdict(int))
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        # --memprofile의 단계 경계 스냅샷은 타이머·트레이스 구간 밖에서 찍어 단계 시간에 섞이지 않게 함
+        with memory_span('phase', name):
+            started = time.perf_counter()
+            try:
+                with trace_span(name, 'phase'):
+                    yield
+            finally:
+                self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - started
+
+    def absorb_cache(self, cache: SectionCache, baseline: dict[str, int]) -> None:
+        """Add the cache counter deltas since ``baseline`` (the cache may outlive this run)."""
+        for key, value in cache.counters.items():
+            self.counters[key] += value - baseline.get(key, 0)
+
+    def hit_ratio(self, kind: str) -> float:
+        hits = self.counters.get(f"{kind}_hits", 0)
+        total = hits + self.counters.get(f"{kind}_misses", 0)
+        return hits / total if total else 0.0
+
+
+# SECTION: Worker Pool - 여러 루트가 공유하는 추출 프로세스 풀
+# 배치 비용 하한 = 전체 비용 / (워커 수 × 이 값): 꼬리 배치가 너무 잘게 쪼개져 IPC 왕복만 늘지 않도록 함
+MIN_BATCH_DIVISOR = 32
+
+
+def _extract_batch_in_worker(
+    path_texts: Sequence[str],
+    tokenizer: str,
+) -> list[tuple[list[tuple[int, int, str, str]], list[tuple[int, int]], int, float, float, int, int]]:
+    count_tokens = resolve_tokenizer(tokenizer)
+    pid, tid = os.getpid(), threading.get_ident()
+    results = []
+    for path_text in path_texts:
+        started = time.perf_counter()
+        sections, sizes, line_count = extract_sized_sections(Path(path_text), count_tokens)
+        results.append((sections, sizes, line_count, started, time.perf_counter(), pid, tid))
+    return results
+
+
+class WorkerPool(NamedTuple):
+    executor: concurrent.futures.Executor
+    workers: int
+
+
+@contextmanager
+def worker_pool(jobs: int) -> Iterator[Optional[WorkerPool]]:
+    if jobs <= 1:
+        yield None
+        return
+    with concurrent.futures.ProcessPoolExecutor(max_workers=jobs) as executor:
+        yield WorkerPool(executor, jobs)
+
+
+def estimate_extract_costs(
+    pending: Sequence[tuple[Path, tuple[int, int]]],
+    history: Optional[dict[str, float]] = None,
+) -> list[float]:
+    """Seconds per file: the previous run's timing, else its size at the observed bytes/second.
+
+    Without any history every file is costed by its size alone, which preserves the ordering.
+    """
+    history = history or {}
+    timed = [(history[path.as_posix()], fingerprint[1]) for path, fingerprint in pending if path.as_posix() in history]
+    timed_bytes = sum(size for _, size in timed)
+    seconds_per_byte = sum(seconds for seconds, _ in timed) / timed_bytes if timed_bytes else 1.0
+    return [
+        history.get(path.as_posix(), max(fingerprint[1], 1) * seconds_per_byte)
+        for path, fingerprint in pending
+    ]
+
+
+def schedule_batches(costs: Sequence[float], workers: int) -> list[list[int]]:
+    """Longest-processing-time-first batches of indexes into ``costs`` (guided self-scheduling).
+
+    Files are taken in decreasing cost; each batch is cut at ``remaining / workers`` of the
+    cost not yet batched, but never below ``total / (workers * MIN_BATCH_DIVISOR)``. Batches
+    therefore shrink as the queue drains: expensive files go out first and alone, and the
+    tail is many cheap batches that even out the workers' finish times.
+    """
+    if not costs:
+        return []
+    workers = max(workers, 1)
+    order = sorted(range(len(costs)), key=lambda index: (-costs[index], index))
+    remaining = sum(costs)
+    floor = remaining / (workers * MIN_BATCH_DIVISOR)
+    batches: list[list[int]] = []
+    batch: list[int] = []
+    batch_cost = 0.0
+    for index in order:
+        if batch and batch_cost + costs[index] > max(remaining / workers, floor):
+            batches.append(batch)
+            remaining -= batch_cost
+            batch, batch_cost = [], 0.0
+        batch.append(index)
+        batch_cost += costs[index]
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def prefetch_sections(
+    cache: SectionCache,
+    files: Sequence[Path],
+    pool: Optional[WorkerPool],
+    costs: Optional[dict[str, float]] = None,
+) -> int:
+    """Extract cache misses in the shared pool so rendering only sees warm entries.
+
+    Batches are dispatched longest-first (see :func:`schedule_batches`) and stored as
+    they complete; the cache is keyed by path, so rendering order stays deterministic.
+    ``costs`` supplies per-file timings from an earlier run and receives this run's.
+    Shared-cache hits are resolved here and never reach the workers. Workers read the
+    disk, so with any other backend extraction stays in this process.
+    """
+    if pool is None or not cache.retain or filesystem() is not LOCAL_FILESYSTEM:
+        return 0
+    pending = cache.pending(files)
+    if not pending:
+        return 0
+    missing = len(pending)
+    shared_keys: dict[Path, str] = {}
+    if cache.shared is not None:
+        unresolved = []
+        for path, fingerprint in pending:
+            key, result, _ = cache.shared_lookup(path)
+            if result is not None:
+                cache.store(path, fingerprint, *result)
+                continue
+            if key is not None:
+                shared_keys[path] = key
+            unresolved.append((path, fingerprint))
+        pending = unresolved
+    tracer = _ACTIVE_TRACER.get()
+    batches = schedule_batches(estimate_extract_costs(pending, costs), pool.workers)
+    futures = {
+        pool.executor.submit(_extract_batch_in_worker, [pending[index][0].as_posix() for index in batch], cache.tokenizer): batch
+        for batch in batches
+    }
+    for future in concurrent.futures.as_completed(futures):
+        for index, (sections, sizes, line_count, started, finished, pid, tid) in zip(futures[future], future.result()):
+            path, fingerprint = pending[index]
+            cache.store(path, fingerprint, sections, sizes, line_count)
+            if path in shared_keys:
+                cache.shared.put(shared_keys[path], sections, sizes, line_count)
+            if costs is not None:
+                costs[path.as_posix()] = finished - started
+            if tracer is not None:
+                tracer.add('extract_sections', 'file', started, finished, {'path': path.as_posix()}, pid=pid, tid=tid)
+    return missing
+
+
+def document_files(doc_paths: Iterable[str], cache: SectionCache, workspace: Workspace) -> list[Path]:
+    """Every source file the given docs track, in registry order."""
+    return [
+        file for path_str in doc_paths for file in tracked_files(workspace.docs[path_str], cache, workspace.root) or []
+    ]
+
+
+def save_extract_costs(costs: dict[str, float], files: Sequence[Path], workspace: Workspace) -> None:
+    """Persist ``costs`` after a prefetch over ``files``, dropping entries for files that are gone."""
+    # 샤드·예산 실행은 일부 문서만 다루므로 다른 문서의 기록은 파일이 남아 있는 한 유지
+    live = {file.as_posix() for file in files}
+    record_extract_costs(
+        {path: value for path, value in costs.items() if path in live or filesystem().exists(path)}, workspace
+    )
+
+
+def write_documents(
+    doc_paths: Sequence[str],
+    cache: SectionCache,
+    stats: RunStats,
+    workspace: Workspace,
+    pool: Optional[WorkerPool] = None,
+    outputs: Optional[dict[Path, str]] = None,
+) -> tuple[list[str], dict[str, SectionIndex], dict[str, dict]]:
+    """Extract and write the given non-root docs; returns (written paths, section index, directory stats).
+
+    ``outputs`` receives each doc's rendered text by output path.
+    """
+    docs = workspace.docs
+    written: list[str] = []
+    doc_index: dict[str, SectionIndex] = {}
+    directory_stats: dict[str, dict] = {}
+    if pool is not None and cache.retain:
+        with stats.phase('extract'):
+            files = document_files(doc_paths, cache, workspace)
+            costs = load_extract_costs(workspace)
+            if prefetch_sections(cache, files, pool, costs):
+                save_extract_costs(costs, files, workspace)
+    with stats.phase('docs'):
+        for path_str in doc_paths:
+            if path_str == 'CLAUDE.md':
+                continue
+            index: SectionIndex = {}
+            totals = DirectoryStats()
+            entry = docs[path_str]
+            if write_entry(workspace.resolve(path_str), entry, cache, index, workspace.root, totals, outputs=outputs):
+                written.append(path_str)
+            doc_index[path_str] = index
+            if entry.file_map_path:
+                directory_stats[entry.file_map_path] = totals.to_json()
+    stats.counters['docs_written'] += len(written)
+    stats.counters['docs_unchanged'] += len(doc_index) - len(written)
+    return written, doc_index, directory_stats
+
+
+def stream_documents(doc_paths: Sequence[str], cache: SectionCache, stats: RunStats, workspace: Workspace) -> list[str]:
+    """Write the given non-root docs in bounded memory; returns the written paths.
+
+    Nothing is kept per doc: file names and totals go straight to stats.json and no
+    section index is built, so the run's peak does not grow with the tree.
+    """
+    docs = workspace.docs
+    written: list[str] = []
+    unchanged = 0
+    with stats.phase('docs'), directory_stats_writer(workspace) as stats_writer:
+        for path_str in doc_paths:
+            if path_str == 'CLAUDE.md':
+                continue
+            entry = docs[path_str]
+            directory = stats_writer.directory(entry.file_map_path) if entry.file_map_path else nullcontext(DirectoryStats())
+            with directory as totals:
+                if write_entry_streaming(workspace.resolve(path_str), entry, cache, None, workspace.root, totals):
+                    written.append(path_str)
+                else:
+                    unchanged += 1
+    stats.counters['docs_written'] += len(written)
+    stats.counters['docs_unchanged'] += unchanged
+    return written
+
+
+def record_run_state(
+    doc_paths: Sequence[str],
+    doc_index: dict[str, SectionIndex],
+    directory_stats: dict[str, dict],
+    cache: SectionCache,
+    stats: RunStats,
+    workspace: Workspace,
+    merged: Optional[dict[str, Optional[dict]]] = None,
+    outputs: Optional[dict[Path, str]] = None,
+) -> dict[str, dict]:
+    """Root document, manifest and derived indexes once ``doc_paths`` were written; returns the section diff.
+
+    ``doc_index`` and ``directory_stats`` must cover every doc, not only the refreshed ones, because
+    the side indexes are written whole. Only inputs the manifest saw change are re-processed.
+    ``outputs`` receives the root document's rendered text.
+    """
+    with stats.phase('root'), trace_span('update_root_document', 'root'):
+        update_root_document(workspace, outputs)
+    with stats.phase('manifest'):
+        delta = update_manifest(doc_paths, cache, workspace, merged)
+    with stats.phase('section_index'):
+        reports = record_section_index(doc_index, workspace, delta)
+    with stats.phase('stats'):
+        record_directory_stats(directory_stats, workspace)
+    with stats.phase('offsets'):
+        record_byte_offsets(doc_index, workspace, delta)
+    with stats.phase('references'):
+        graph = update_reference_graph(workspace)
+        stats.counters['dangling_references'] += report_dangling_references(graph)
+    # CLI, 데몬, API 모두 여기를 거치므로 공유 캐시 상한도 실행마다 여기서 지킴
+    cache.trim_shared()
+    return reports
+
+
+def record_streamed_run_state(cache: SectionCache, stats: RunStats, workspace: Workspace) -> None:
+    """Root document and reference graph after a streamed run, which keeps no per-doc state.
+
+    The manifest, section index, section diff and byte offsets each hold a record per source
+    file, so a streamed run removes them rather than leave ones that no longer match the docs:
+    ``--check`` then compares rendered content, and ``refs``/``slice`` extract on demand.
+    """
+    backend = filesystem()
+    with stats.phase('root'), trace_span('update_root_document', 'root'):
+        update_root_document(workspace)
+    with stats.phase('manifest'):
+        for state_path in (MANIFEST_PATH, SECTION_INDEX_PATH, SECTION_DIFF_PATH, OFFSET_INDEX_PATH):
+            try:
+                backend.unlink(workspace.resolve(state_path))
+            except FileNotFoundError:
+                pass
+    with stats.phase('references'):
+        graph = update_reference_graph(workspace)
+        stats.counters['dangling_references'] += report_dangling_references(graph)
+    cache.trim_shared()
+
+
+def regenerate_all(
+    cache: Optional[SectionCache] = None,
+    stream: bool = False,
+    stats: Optional[RunStats] = None,
+    workspace: Optional[Workspace] = None,
+    pool: Optional[WorkerPool] = None,
+    outputs: Optional[dict[Path, str]] = None,
+) -> list[str]:
+    """Write every doc and the run state; ``stream`` bounds memory (``outputs`` then stays empty)."""
+    workspace = workspace or Workspace()
+    docs = workspace.docs
+    if cache is None:
+        cache = SectionCache(retain=not stream)
+    if stats is None:
+        stats = RunStats()
+    baseline = dict(cache.counters)
+    if stream:
+        written = stream_documents(sorted(docs), cache, stats, workspace)
+        record_streamed_run_state(cache, stats, workspace)
+    else:
+        written, doc_index, directory_stats = write_documents(sorted(docs), cache, stats, workspace, pool, outputs)
+        record_run_state(sorted(docs), doc_index, directory_stats, cache, stats, workspace, outputs=outputs)
+    stats.absorb_cache(cache, baseline)
+    stats.duration = time.perf_counter() - stats.started
+    return written
+
+
+def entries_for_paths(paths: Iterable[str], workspace: Optional[Workspace] = None) -> list[str]:
+    """Map changed source files or claude.md paths to the registry entries they affect."""
+    docs = (workspace or Workspace()).docs
+    by_directory: dict[str, list[str]] = defaultdict(list)
+    for doc_path, entry in docs.items():
+        if entry.file_map_path:
+            by_directory[entry.file_map_path].append(doc_path)
+
+    affected: set[str] = set()
+    for raw in paths:
+        path = Path(raw)
+        posix = path.as_posix()
+        if posix in docs:
+            affected.add(posix)
+            continue
+        affected.update(by_directory.get(path.parent.as_posix(), []))
+        affected.update(by_directory.get(posix, []))
+    affected.discard('CLAUDE.md')
+    return sorted(affected)
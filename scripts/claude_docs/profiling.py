@@ -0,0 +1,239 @@
+"""실행 추적(Trace Event Format)과 단계별 메모리 프로파일."""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional
+
+import contextvars
+import json
+import os
+import threading
+import time
+import tracemalloc
+from collections import defaultdict
+
+from .fs import _atomic_write_text
+from .model import GENERATOR_PACKAGE_RELATIVE_PATH, PACKAGE_DIR
+
+# SECTION: Trace Events - Chrome/Perfetto Trace Event Format 기록
+class TraceRecorder:
+    """Collects complete ('X') events; safe to share between worker threads."""
+
+    def __init__(self) -> None:
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+        self._events: list[dict] = []
+        self._thread_names: dict[tuple[int, int], str] = {}
+
+    def add(
+        self,
+        name: str,
+        category: str,
+        started: float,
+        finished: float,
+        args: dict,
+        pid: Optional[int] = None,
+        tid: Optional[int] = None,
+    ) -> None:
+        """Record one span; worker processes report their own pid/tid (perf_counter is system-wide)."""
+        local = pid is None
+        pid = os.getpid() if pid is None else pid
+        tid = threading.get_ident() if tid is None else tid
+        event = {
+            'name': name,
+            'cat': category,
+            'ph': 'X',
+            'ts': round((started - self._origin) * 1e6, 3),
+            'dur': round((finished - started) * 1e6, 3),
+            'pid': pid,
+            'tid': tid,
+            'args': args,
+        }
+        with self._lock:
+            self._events.append(event)
+            name = threading.current_thread().name if local else f"worker-{pid}"
+            self._thread_names.setdefault((pid, tid), name)
+
+    def to_json(self) -> dict:
+        with self._lock:
+            metadata = [
+                {'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid, 'args': {'name': name}}
+                for (pid, tid), name in sorted(self._thread_names.items())
+            ]
+            return {'traceEvents': metadata + list(self._events), 'displayTimeUnit': 'ms'}
+
+    def write(self, path: Path) -> None:
+        _atomic_write_text(path, json.dumps(self.to_json(), ensure_ascii=False) + '\n')
+
+
+# 실행 중인 트레이서는 ContextVar로 전달해 모든 함수 시그니처에 끼워 넣지 않음
+_ACTIVE_TRACER: contextvars.ContextVar[Optional[TraceRecorder]] = contextvars.ContextVar(
+    'claude_docs_tracer', default=None
+)
+
+
+@contextmanager
+def trace_span(name: str, category: str = 'generator', **args: object) -> Iterator[None]:
+    tracer = _ACTIVE_TRACER.get()
+    if tracer is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        tracer.add(name, category, started, time.perf_counter(), args)
+
+
+@contextmanager
+def tracing(tracer: Optional[TraceRecorder]) -> Iterator[None]:
+    token = _ACTIVE_TRACER.set(tracer)
+    try:
+        yield
+    finally:
+        _ACTIVE_TRACER.reset(token)
+
+
+# SECTION: Memory Profile - 단계 경계의 tracemalloc 스냅샷으로 단계별 메모리 집계
+MEMPROFILE_VERSION = 1
+MEMPROFILE_TOP = 15
+# 이보다 작은 증감은 프로파일러 자신의 기록 비용 수준이므로 할당 위치 목록에서 제외
+MEMPROFILE_MIN_SITE_BYTES = 1024
+
+
+class MemoryProfiler:
+    """Peak and retained tracemalloc bytes per phase, plus the costliest files and docs.
+
+    Spans may nest: each span's peak is measured from its own start, and an inner span's
+    peak is folded into its parent's. Phase spans also diff snapshots taken at their
+    boundaries by allocating line of the generator package; tracebacks are one frame deep, so
+    allocations made inside Python-level stdlib code are not attributed to a site.
+    Extraction that runs in worker processes (``--jobs`` > 1) is not observed.
+
+    Snapshot time is kept out of :meth:`RunStats.phase` timings, shows up in traces as
+    ``tracemalloc snapshot`` spans and is reported as ``snapshot_ms``.
+    """
+
+    def __init__(self, top: int = MEMPROFILE_TOP) -> None:
+        self.top = top
+        self.filters = [tracemalloc.Filter(True, str(PACKAGE_DIR / '*'))]
+        self.phases: dict[str, dict] = {}
+        self.spans: dict[str, dict[str, int]] = defaultdict(dict)
+        self._stack: list[list[int]] = []
+        self.peak = 0
+        self.snapshot_seconds = 0.0
+
+    def _snapshot(self) -> tracemalloc.Snapshot:
+        started = time.perf_counter()
+        with trace_span('tracemalloc snapshot', 'memprofile'):
+            snapshot = tracemalloc.take_snapshot().filter_traces(self.filters)
+        self.snapshot_seconds += time.perf_counter() - started
+        return snapshot
+
+    @contextmanager
+    def span(self, kind: str, name: str) -> Iterator[None]:
+        # 스냅샷 객체 자체의 할당이 단계 수치에 섞이지 않도록 먼저 찍고 나서 기준값을 읽음
+        before = self._snapshot() if kind == 'phase' else None
+        current, peak = tracemalloc.get_traced_memory()
+        if self._stack:
+            self._stack[-1][1] = max(self._stack[-1][1], peak)
+        tracemalloc.reset_peak()
+        frame = [current, current]
+        self._stack.append(frame)
+        try:
+            yield
+        finally:
+            finished, peak = tracemalloc.get_traced_memory()
+            self._stack.pop()
+            frame[1] = max(frame[1], peak)
+            if self._stack:
+                self._stack[-1][1] = max(self._stack[-1][1], frame[1])
+            self.peak = max(self.peak, frame[1])
+            if before is None:
+                spans = self.spans[kind]
+                spans[name] = max(spans.get(name, 0), frame[1] - current)
+            else:
+                self._record_phase(name, current, finished, frame[1], before)
+
+    def _record_phase(
+        self, name: str, started: int, finished: int, peak: int, before: tracemalloc.Snapshot
+    ) -> None:
+        record = self.phases.setdefault(
+            name, {'count': 0, 'peak_bytes': 0, 'peak_total_bytes': 0, 'retained_bytes': 0, 'sites': defaultdict(int)}
+        )
+        record['count'] += 1
+        record['peak_bytes'] = max(record['peak_bytes'], peak - started)
+        record['peak_total_bytes'] = max(record['peak_total_bytes'], peak)
+        record['retained_bytes'] += finished - started
+        after = self._snapshot()
+        compared = time.perf_counter()
+        with trace_span('tracemalloc compare', 'memprofile', phase=name):
+            for difference in after.compare_to(before, 'lineno'):
+                frame = difference.traceback[0]
+                module = (GENERATOR_PACKAGE_RELATIVE_PATH / os.path.basename(frame.filename)).as_posix()
+                record['sites'][f"{module}:{frame.lineno}"] += difference.size_diff
+        self.snapshot_seconds += time.perf_counter() - compared
+
+    def _largest(self, kind: str) -> list[dict]:
+        spans = self.spans.get(kind, {})
+        ranked = sorted(spans.items(), key=lambda item: (-item[1], item[0]))[:self.top]
+        return [{'path': name, 'peak_bytes': size} for name, size in ranked]
+
+    def to_json(self) -> dict:
+        phases = {}
+        for name, record in self.phases.items():
+            sites = sorted(record['sites'].items(), key=lambda item: (-item[1], item[0]))[:self.top]
+            phases[name] = {key: value for key, value in record.items() if key != 'sites'}
+            phases[name]['top_sites'] = [
+                {'site': site, 'retained_bytes': size} for site, size in sites if size >= MEMPROFILE_MIN_SITE_BYTES
+            ]
+        return {
+            'version': MEMPROFILE_VERSION,
+            'peak_bytes': self.peak,
+            'snapshot_ms': round(self.snapshot_seconds * 1000, 3),
+            'phases': phases,
+            'files': self._largest('file'),
+            'docs': self._largest('doc'),
+        }
+
+    def summary_lines(self) -> list[str]:
+        lines = [f"{'phase':<16} {'peak KiB':>10} {'retained KiB':>13}"]
+        for name, record in self.phases.items():
+            lines.append(f"{name:<16} {record['peak_bytes'] // 1024:>10,} {record['retained_bytes'] // 1024:>13,}")
+        lines.append(f"{'(run)':<16} {self.peak // 1024:>10,}")
+        lines.append(f"tracemalloc 스냅샷 {self.snapshot_seconds * 1000:,.1f}ms (단계 시간에서 제외)")
+        return lines
+
+    def write(self, path: Path) -> None:
+        _atomic_write_text(path, json.dumps(self.to_json(), ensure_ascii=False, indent=2) + '\n')
+
+
+_ACTIVE_MEMPROFILER: contextvars.ContextVar[Optional[MemoryProfiler]] = contextvars.ContextVar(
+    'claude_docs_memprofiler', default=None
+)
+
+
+@contextmanager
+def memory_span(kind: str, name: str) -> Iterator[None]:
+    profiler = _ACTIVE_MEMPROFILER.get()
+    if profiler is None:
+        yield
+        return
+    with profiler.span(kind, name):
+        yield
+
+
+@contextmanager
+def memory_profiling(profiler: Optional[MemoryProfiler]) -> Iterator[None]:
+    if profiler is None:
+        yield
+        return
+    token = _ACTIVE_MEMPROFILER.set(profiler)
+    tracemalloc.start()
+    try:
+        yield
+    finally:
+        tracemalloc.stop()
+        _ACTIVE_MEMPROFILER.reset(token)
@@ -0,0 +1,174 @@
+"""문서 간 참조 그래프와 역참조 인덱스."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable, Optional
+
+import hashlib
+import json
+import re
+import sys
+from collections import defaultdict
+
+from .fs import _atomic_write_text, filesystem
+from .model import STATE_DIR, Entry, Workspace
+
+# SECTION: Reference Graph - 문서 간 참조 검증과 역참조 인덱스
+# 실행마다 한 번 그래프를 만들고, 존재 여부는 경로별 stat 대신 알려진 경로 집합 조회로 판단
+# 레지스트리의 참조가 그대로면 저장된 간선을 재사용하고 대상 파일의 존재 여부만 다시 확인
+REFERENCE_INDEX_PATH = STATE_DIR / 'references.json'
+REFERENCE_INDEX_VERSION = 2
+# 경로처럼 보이는 대상(슬래시 또는 확장자 포함)만 참조로 취급해 "A → B" 같은 설명 문구는 제외
+_STRUCTURE_LINK_PATTERN = re.compile(r"→\s*([\w.\[\]-]*/[\w./\[\]-]+|[\w\[\]-]+\.[A-Za-z]+)")
+
+
+@dataclass
+class ReferenceGraph:
+    """Doc → referenced path edges over an interned path table (ids index ``paths``)."""
+
+    paths: list[str] = field(default_factory=list)
+    ids: dict[str, int] = field(default_factory=dict)
+    forward: dict[int, list[int]] = field(default_factory=dict)
+    reverse: dict[int, list[int]] = field(default_factory=lambda: defaultdict(list))
+    known: set[int] = field(default_factory=set)
+
+    def intern(self, path: str) -> int:
+        path_id = self.ids.get(path)
+        if path_id is None:
+            path_id = self.ids[path] = len(self.paths)
+            self.paths.append(path)
+        return path_id
+
+    def dangling(self) -> dict[str, list[str]]:
+        return {
+            self.paths[doc]: [self.paths[target] for target in targets if target not in self.known]
+            for doc, targets in sorted(self.forward.items(), key=lambda item: self.paths[item[0]])
+            if any(target not in self.known for target in targets)
+        }
+
+    def referrers(self, path: str) -> list[str]:
+        path_id = self.ids.get(Path(path).as_posix())
+        if path_id is None:
+            return []
+        return sorted(self.paths[doc] for doc in self.reverse.get(path_id, []))
+
+
+def entry_references(entry: Entry) -> list[str]:
+    """Explicit references plus `(→ path)` links written in the structure summary, deduplicated."""
+    found = list(entry.references)
+    for line in entry.structure:
+        found.extend(match.rstrip('.,)') for match in _STRUCTURE_LINK_PATTERN.findall(line))
+    return list(dict.fromkeys(Path(item).as_posix() for item in found))
+
+
+def registry_digest(docs: dict[str, Entry]) -> str:
+    """Hash of everything edges are derived from: doc paths, references and structure lines."""
+    digest = hashlib.sha256()
+    for doc_path in sorted(docs):
+        entry = docs[doc_path]
+        digest.update(repr((doc_path, entry.references, entry.structure)).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def _existing_paths(workspace: Workspace, candidates: Iterable[str]) -> set[str]:
+    """One scandir per distinct parent directory instead of one stat per reference."""
+    by_parent: dict[str, set[str]] = defaultdict(set)
+    for candidate in candidates:
+        parent, _, name = candidate.rpartition('/')
+        by_parent[parent].add(name)
+    existing: set[str] = set()
+    for parent, names in by_parent.items():
+        try:
+            present = {item.name for item in filesystem().scandir(workspace.resolve(parent or '.'))}
+        except (FileNotFoundError, NotADirectoryError):
+            continue
+        existing.update(f"{parent}/{name}" if parent else name for name in names & present)
+    return existing
+
+
+def build_reference_graph(
+    workspace: Optional[Workspace] = None,
+    edges: Optional[dict[str, list[str]]] = None,
+) -> ReferenceGraph:
+    """Graph over the registry; ``edges`` (doc → targets from a stored index) skips re-parsing entries."""
+    workspace = workspace or Workspace()
+    graph = ReferenceGraph()
+    outputs = set(workspace.docs)
+    others: set[str] = set()
+    for doc_path in sorted(workspace.docs):
+        targets = edges[doc_path] if edges is not None else entry_references(workspace.docs[doc_path])
+        graph.forward[graph.intern(doc_path)] = [graph.intern(target) for target in targets]
+        # 레지스트리에 없는 claude.md는 생성되지 않으므로 실제 파일이 있어도 끊어진 참조로 취급
+        others.update(target for target in targets if target not in outputs and Path(target).name != 'claude.md')
+    known = outputs | _existing_paths(workspace, others)
+    graph.known = {path_id for path, path_id in graph.ids.items() if path in known}
+    for doc, targets in graph.forward.items():
+        for target in targets:
+            graph.reverse[target].append(doc)
+    return graph
+
+
+def record_reference_graph(graph: ReferenceGraph, workspace: Optional[Workspace] = None) -> None:
+    workspace = workspace or Workspace()
+    payload = {
+        'version': REFERENCE_INDEX_VERSION,
+        'registry': registry_digest(workspace.docs),
+        'forward': {
+            graph.paths[doc]: [graph.paths[target] for target in targets]
+            for doc, targets in sorted(graph.forward.items(), key=lambda item: graph.paths[item[0]])
+        },
+        'reverse': {
+            graph.paths[target]: sorted(graph.paths[doc] for doc in docs)
+            for target, docs in sorted(graph.reverse.items(), key=lambda item: graph.paths[item[0]])
+        },
+        'dangling': graph.dangling(),
+    }
+    _atomic_write_text(
+        workspace.resolve(REFERENCE_INDEX_PATH), json.dumps(payload, ensure_ascii=False, indent=1) + '\n'
+    )
+
+
+def _load_reference_index(workspace: Workspace) -> dict:
+    try:
+        data = json.loads(filesystem().read_text(workspace.resolve(REFERENCE_INDEX_PATH)))
+    except (OSError, ValueError):
+        return {}
+    if data.get('version') != REFERENCE_INDEX_VERSION:
+        return {}
+    return data
+
+
+def update_reference_graph(workspace: Optional[Workspace] = None) -> ReferenceGraph:
+    """Reuse the stored edges while the registry is unchanged; rewrite the index only when it differs."""
+    workspace = workspace or Workspace()
+    stored = _load_reference_index(workspace)
+    if stored.get('registry') == registry_digest(workspace.docs):
+        graph = build_reference_graph(workspace, stored['forward'])
+        if graph.dangling() == stored['dangling']:
+            return graph
+    else:
+        graph = build_reference_graph(workspace)
+    record_reference_graph(graph, workspace)
+    return graph
+
+
+def report_dangling_references(graph: ReferenceGraph, stream=sys.stderr) -> int:
+    dangling = graph.dangling()
+    count = sum(len(targets) for targets in dangling.values())
+    if count:
+        print(f"경고: 끊어진 참조 {count}개", file=stream)
+        for doc, targets in dangling.items():
+            for target in targets:
+                print(f"- {doc} → {target}", file=stream)
+    return count
+
+
+def load_referrers(path: str, workspace: Optional[Workspace] = None) -> list[str]:
+    """Docs pointing at ``path``, from the recorded reverse index (rebuilt if missing)."""
+    workspace = workspace or Workspace()
+    data = _load_reference_index(workspace)
+    if not data:
+        return build_reference_graph(workspace).referrers(path)
+    return data['reverse'].get(Path(path).as_posix(), [])
@@ -0,0 +1,350 @@
+"""claude.md 본문 렌더링과 파일 저장, 루트 문서 갱신."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Optional, Union
+
+import hashlib
+import io
+import os
+import tempfile
+from collections import defaultdict
+
+from .cache import SectionCache
+from .filemap import DirectoryStats, SectionIndex, generate_file_map_lines, iter_file_map_lines
+from .fs import LocalFileSystem, _sha256_file, filesystem
+from .model import GENERATOR_RELATIVE_PATH, Entry, Workspace
+from .profiling import memory_span, trace_span
+
+# SECTION: Root Document Helpers - 루트 claude.md 전용 유틸
+def build_directory_tree(workspace: Optional[Workspace] = None) -> list[str]:
+    workspace = workspace or Workspace()
+    claude_paths = [Path(p) for p in workspace.docs.keys() if p != 'CLAUDE.md']
+    extra_files = [GENERATOR_RELATIVE_PATH]
+
+    file_children: dict[Path, list[str]] = defaultdict(list)
+    dir_set = {Path('.')}
+
+    for file_path in claude_paths:
+        file_children[file_path.parent].append(file_path.name)
+        parent = file_path.parent
+        while parent not in dir_set:
+            dir_set.add(parent)
+            parent = parent.parent
+    for extra in extra_files:
+        if filesystem().exists(workspace.resolve(extra)):
+            file_children[extra.parent].append(extra.name)
+            parent = extra.parent
+            while parent not in dir_set:
+                dir_set.add(parent)
+                parent = parent.parent
+
+    file_children[Path('.')].append('CLAUDE.md')
+
+    dir_children: dict[Path, list[Path]] = defaultdict(list)
+    for directory in dir_set:
+        if directory == Path('.'):
+            continue
+        dir_children[directory.parent].append(directory)
+
+    for key in dir_children:
+        dir_children[key].sort(key=lambda p: p.name.lower())
+    for key in file_children:
+        file_children[key].sort(key=lambda name: name.lower())
+
+    lines: list[str] = []
+
+    def walk(directory: Path, prefix: str) -> None:
+        entries_dirs = dir_children.get(directory, [])
+        entries_files = file_children.get(directory, [])
+        total = len(entries_dirs) + len(entries_files)
+        for idx, child_dir in enumerate(entries_dirs, start=1):
+            connector = '└──' if idx == total and not entries_files else '├──'
+            lines.append(f"{prefix}{connector} {child_dir.name}/")
+            next_prefix = prefix + ('    ' if connector == '└──' and not entries_files else '│   ')
+            walk(child_dir, next_prefix)
+        for file_index, file_name in enumerate(entries_files, start=1):
+            connector = '└──' if file_index == len(entries_files) else '├──'
+            lines.append(f"{prefix}{connector} {file_name}")
+
+    lines.append(f"{workspace.label}/")
+    walk(Path('.'), '')
+    return lines
+
+
+def update_line_guide(lines: list[str]) -> list[str]:
+    heading_positions: list[tuple[str, int]] = []
+    for idx, line in enumerate(lines, start=1):
+        if line.startswith('## ') and line.strip() != '## 라인 가이드':
+            heading_positions.append((line[3:].strip(), idx))
+    if not heading_positions:
+        return lines
+
+    ranges: list[tuple[str, int, int]] = []
+    for i, (title, start) in enumerate(heading_positions):
+        end = heading_positions[i + 1][1] - 1 if i + 1 < len(heading_positions) else len(lines)
+        ranges.append((title, start, end))
+
+    guide_index = next((i for i, line in enumerate(lines) if line.strip() == '## 라인 가이드'), None)
+    if guide_index is None:
+        return lines
+
+    bullet_start = guide_index + 1
+    bullet_end = bullet_start
+    while bullet_end < len(lines) and lines[bullet_end].startswith('- '):
+        bullet_end += 1
+
+    def format_num(value: int) -> str:
+        return f"{value:02d}" if value < 100 else str(value)
+
+    new_bullets = [f"- {format_num(start)}~{format_num(end)}: {title}" for title, start, end in ranges]
+    return lines[:bullet_start] + new_bullets + lines[bullet_end:]
+
+
+def update_directory_block(lines: list[str], workspace: Optional[Workspace] = None) -> list[str]:
+    try:
+        structure_idx = next(i for i, line in enumerate(lines) if line.strip() == '## 전체 디렉토리 구조')
+        code_start = next(i for i in range(structure_idx + 1, len(lines)) if lines[i].strip() == '```')
+        code_end = next(i for i in range(code_start + 1, len(lines)) if lines[i].strip() == '```')
+    except StopIteration:
+        return lines
+
+    tree_lines = build_directory_tree(workspace)
+    new_block = ['```'] + tree_lines + ['```']
+    return lines[:code_start] + new_block + lines[code_end + 1:]
+
+
+def render_root_document(workspace: Optional[Workspace] = None) -> Optional[tuple[Path, str]]:
+    """Root document path and its refreshed text, or None when the workspace has none."""
+    workspace = workspace or Workspace()
+    backend = filesystem()
+    path = workspace.resolve('CLAUDE.md')
+    if not backend.exists(path):
+        # Fallback to lowercase for backward compatibility
+        path = workspace.resolve('claude.md')
+        if not backend.exists(path):
+            return None
+
+    lines = backend.read_text(path).splitlines()
+    lines = update_directory_block(lines, workspace)
+    lines = update_line_guide(lines)
+    return path, '\n'.join(lines) + '\n'
+
+
+def update_root_document(
+    workspace: Optional[Workspace] = None, outputs: Optional[dict[Path, str]] = None
+) -> None:
+    """Update root documentation file (CLAUDE.md or claude.md for backward compatibility)"""
+    rendered = render_root_document(workspace)
+    if rendered is not None:
+        path, text = rendered
+        filesystem().write_text(path, text)
+        if outputs is not None:
+            outputs[path] = text
+
+
+# SECTION: Document Builder - claude.md 템플릿 생성
+FILE_MAP_HEADING = "파일 라인 맵"
+
+
+def _document_sections(entry: Entry, file_map_body: list[str]) -> list[tuple[str, list[str]]]:
+    return [
+        ("디렉토리 목적", [*entry.purpose]),
+        ("핵심 책임", [f"- {item}" for item in entry.responsibilities] if entry.responsibilities else ["- 현재 정의된 책임이 없습니다."] ),
+        ("구조 요약", [f"- {item}" for item in entry.structure] if entry.structure else ["- 하위 디렉토리가 없습니다."]),
+        (FILE_MAP_HEADING, file_map_body),
+        ("중앙화·모듈화·캡슐화", [f"- {item}" for item in entry.centralization] if entry.centralization else ["- 각 모듈은 기존 중앙화 규칙을 따릅니다."]),
+        ("작업 규칙", [f"- {item}" for item in entry.rules] if entry.rules else ["- 변경 시 관련 claude.md와 설정을 함께 점검합니다."]),
+        ("관련 문서", [f"- {item}" for item in entry.references] if entry.references else ["- claude.md"]),
+    ]
+
+
+def build_lines(
+    entry: Entry,
+    cache: Optional[SectionCache] = None,
+    index: Optional[SectionIndex] = None,
+    root: Path = Path('.'),
+    stats: Optional[DirectoryStats] = None,
+) -> list[str]:
+    sections = _document_sections(entry, generate_file_map_lines(entry, cache, index, root, stats))
+
+    lines: list[str] = []
+    lines.append(f"# {entry.title}")
+    lines.append("")
+    lines.append("## 라인 가이드")
+    placeholder_keys: list[str] = []
+    for idx, (heading, _) in enumerate(sections):
+        token = f"__LG{idx}__"
+        placeholder_keys.append(token)
+        lines.append(f"- {token}: {heading}")
+    lines.append("")
+
+    for heading, body in sections:
+        lines.append(f"## {heading}")
+        lines.extend(body)
+        lines.append("")
+
+    while lines and lines[-1] == "":
+        lines.pop()
+    lines.append("")
+
+    # Compute line ranges
+    heading_positions: list[int] = []
+    for idx, line in enumerate(lines, start=1):
+        if line.startswith("## ") and line != "## 라인 가이드":
+            heading_positions.append(idx)
+    total_lines = len(lines)
+    ranges: list[tuple[int, int]] = []
+    for i, start in enumerate(heading_positions):
+        end = heading_positions[i + 1] - 1 if i + 1 < len(heading_positions) else total_lines
+        ranges.append((start, end))
+
+    width = 2 if total_lines < 100 else 3 if total_lines < 1000 else 4
+    replacements = [f"{start:0{width}d}~{end:0{width}d}" for start, end in ranges]
+
+    # 플레이스홀더는 라인 가이드 블록(제목, 빈 줄, 가이드 헤딩 다음)에만 존재
+    guide_offset = 3
+    for idx, (token, value) in enumerate(zip(placeholder_keys, replacements)):
+        lines[guide_offset + idx] = lines[guide_offset + idx].replace(token, value)
+    return lines
+
+
+def render_entry(
+    entry: Entry,
+    cache: Optional[SectionCache] = None,
+    index: Optional[SectionIndex] = None,
+    root: Path = Path('.'),
+    stats: Optional[DirectoryStats] = None,
+) -> str:
+    return "\n".join(build_lines(entry, cache, index, root, stats))
+
+
+# SECTION: File Writer - claude.md 파일 저장
+def write_entry(
+    path: Path,
+    entry: Entry,
+    cache: Optional[SectionCache] = None,
+    index: Optional[SectionIndex] = None,
+    root: Path = Path('.'),
+    stats: Optional[DirectoryStats] = None,
+    outputs: Optional[dict[Path, str]] = None,
+) -> bool:
+    """Render and save one claude.md; returns False when the content was already current.
+
+    ``outputs``, when given, receives the rendered text under ``path``.
+    """
+    with trace_span('build_lines', 'entry', doc=path.as_posix()), memory_span('doc', path.as_posix()):
+        text = render_entry(entry, cache, index, root, stats)
+    if outputs is not None:
+        outputs[path] = text
+    backend = filesystem()
+    with trace_span('write', 'io', path=path.as_posix()):
+        try:
+            if backend.read_text(path) == text:
+                return False
+        except (OSError, UnicodeDecodeError):
+            pass
+        backend.mkdir(path.parent)
+        backend.write_text(path, text)
+    return True
+
+
+def _line_guide_ranges(segments: list[Union[list[str], int]]) -> tuple[list[str], int]:
+    """Compute build_lines() guide ranges from a skeleton whose file map is only a line count."""
+    position = 0
+    heading_positions: list[int] = []
+    for segment in segments:
+        if isinstance(segment, int):
+            position += segment  # file-map bullets never start with '## '
+            continue
+        for line in segment:
+            position += 1
+            if line.startswith("## ") and line != "## 라인 가이드":
+                heading_positions.append(position)
+    total_lines = position
+    width = 2 if total_lines < 100 else 3 if total_lines < 1000 else 4
+    ranges: list[str] = []
+    for i, start in enumerate(heading_positions):
+        end = heading_positions[i + 1] - 1 if i + 1 < len(heading_positions) else total_lines
+        ranges.append(f"{start:0{width}d}~{end:0{width}d}")
+    return ranges, total_lines
+
+
+def write_entry_streaming(
+    path: Path,
+    entry: Entry,
+    cache: Optional[SectionCache] = None,
+    index: Optional[SectionIndex] = None,
+    root: Path = Path('.'),
+    stats: Optional[DirectoryStats] = None,
+) -> bool:
+    """Bounded-memory variant of write_entry() producing byte-identical output.
+
+    File-map bullets are spooled to a temporary file while they are counted, so
+    peak memory depends on the largest single source file, not on the directory.
+    A non-disk backend spools in memory instead, so it never touches the disk.
+    """
+    backend = filesystem()
+    spool = tempfile.TemporaryFile('w+', encoding='utf-8') if isinstance(backend, LocalFileSystem) else io.StringIO()
+    with spool:
+        with (
+            trace_span('build_lines', 'entry', doc=path.as_posix(), stream=True),
+            memory_span('doc', path.as_posix()),
+        ):
+            bullet_count = 0
+            for bullet in iter_file_map_lines(entry, cache, index, root, stats):
+                spool.write(bullet)
+                spool.write("\n")
+                bullet_count += 1
+
+            sections = _document_sections(entry, [])
+            skeleton: list[Union[list[str], int]] = [
+                [f"# {entry.title}", "", "## 라인 가이드", *[f"- __LG{idx}__: x" for idx in range(len(sections))], ""]
+            ]
+            for heading, body in sections:
+                skeleton.append([f"## {heading}"])
+                skeleton.append(bullet_count if heading == FILE_MAP_HEADING else body)
+                skeleton.append([""])
+            # build_lines()는 마지막 빈 줄을 하나만 남기므로 join 결과는 항상 개행으로 끝남
+            ranges, _ = _line_guide_ranges(skeleton)
+
+        digest = hashlib.sha256()
+        size = 0
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        backend.mkdir(path.parent)
+        with trace_span('write', 'io', path=path.as_posix()), backend.open(tmp, 'wb') as out:
+            def emit(line: str) -> None:
+                nonlocal size
+                data = (line + "\n").encode('utf-8')
+                digest.update(data)
+                size += len(data)
+                out.write(data)
+
+            emit(f"# {entry.title}")
+            emit("")
+            emit("## 라인 가이드")
+            for (heading, _), value in zip(sections, ranges):
+                emit(f"- {value}: {heading}")
+            emit("")
+            for position, (heading, body) in enumerate(sections):
+                emit(f"## {heading}")
+                if heading == FILE_MAP_HEADING:
+                    spool.seek(0)
+                    for bullet in spool:
+                        emit(bullet.rstrip("\n"))
+                else:
+                    for line in body:
+                        emit(line)
+                if position + 1 < len(sections):
+                    emit("")
+
+    try:
+        unchanged = backend.stat(path).st_size == size and _sha256_file(path) == digest.hexdigest()
+    except OSError:
+        unchanged = False
+    if unchanged:
+        backend.unlink(tmp)
+        return False
+    backend.replace(tmp, path)
+    return True
@@ -0,0 +1,184 @@
+"""--shard i/N 분산 생성과 merge 단계."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Optional
+
+import fnmatch
+import json
+import time
+
+from .cache import SectionCache
+from .filemap import SectionIndex, tracked_files
+from .fs import _atomic_write_text, filesystem
+from .manifest import load_manifest, manifest_records
+from .model import STATE_DIR, Workspace, generator_digest
+from .pipeline import RunStats, WorkerPool, record_run_state, write_documents
+
+# SECTION: Sharded Runs - CI 머신 간 분산 생성과 병합
+# 각 샤드는 자기 몫의 claude.md와 부분 결과를 쓰고, merge 단계가 루트 문서·매니페스트·섹션 인덱스를 완성
+SHARD_DIR = STATE_DIR / 'shards'
+SHARD_VERSION = 1
+SHARD_WEIGHTS = ('bytes', 'files')
+
+
+def parse_shard_spec(spec: str) -> tuple[int, int]:
+    """`i/N` with 1 <= i <= N, matching the 1-based numbering CI matrices use."""
+    index_text, _, count_text = spec.partition('/')
+    try:
+        index, count = int(index_text), int(count_text)
+    except ValueError:
+        raise SystemExit(f"--shard {spec}: i/N 형식이어야 합니다") from None
+    if count < 1 or not 1 <= index <= count:
+        raise SystemExit(f"--shard {spec}: 1 <= i <= N 이어야 합니다")
+    return index, count
+
+
+def _shard_path(workspace: Workspace, index: int, count: int) -> Path:
+    return workspace.resolve(SHARD_DIR / f"{index}-of-{count}.json")
+
+
+def assign_shards(
+    workspace: Workspace,
+    count: int,
+    cache: Optional[SectionCache] = None,
+    weight: str = 'bytes',
+) -> list[list[str]]:
+    """Greedy largest-first partition of the non-root docs, balanced by input bytes or file count.
+
+    Ties break on doc path and then shard number, so every machine computes the same split
+    from the same tree without coordinating.
+    """
+    docs = workspace.docs
+    weighted: list[tuple[int, str]] = []
+    for doc_path in sorted(docs):
+        if doc_path == 'CLAUDE.md':
+            continue
+        files = tracked_files(docs[doc_path], cache, workspace.root) or []
+        if weight == 'files':
+            cost = len(files)
+        else:
+            cost = 0
+            for file in files:
+                try:
+                    cost += filesystem().stat(file).st_size
+                except OSError:
+                    continue
+        # 파일 맵이 없는 문서도 템플릿 작성 비용이 있으므로 최소 1
+        weighted.append((cost + 1, doc_path))
+
+    loads = [0] * count
+    shards: list[list[str]] = [[] for _ in range(count)]
+    for cost, doc_path in sorted(weighted, key=lambda item: (-item[0], item[1])):
+        target = min(range(count), key=lambda position: (loads[position], position))
+        loads[target] += cost
+        shards[target].append(doc_path)
+    return [sorted(shard) for shard in shards]
+
+
+def regenerate_shard(
+    index: int,
+    count: int,
+    cache: Optional[SectionCache] = None,
+    stats: Optional[RunStats] = None,
+    workspace: Optional[Workspace] = None,
+    pool: Optional[WorkerPool] = None,
+    weight: str = 'bytes',
+) -> list[str]:
+    workspace = workspace or Workspace()
+    if cache is None:
+        cache = SectionCache()
+    if stats is None:
+        stats = RunStats()
+    baseline = dict(cache.counters)
+    with stats.phase('assign'):
+        doc_paths = assign_shards(workspace, count, cache, weight)[index - 1]
+    written, doc_index, directory_stats = write_documents(doc_paths, cache, stats, workspace, pool)
+    with stats.phase('manifest'):
+        records = manifest_records(doc_paths, cache, workspace, load_manifest(workspace).get('outputs', {}))
+    payload = {
+        'version': SHARD_VERSION,
+        'shard': [index, count],
+        'generator': generator_digest(workspace),
+        'docs': doc_paths,
+        'outputs': {doc: record for doc, record in records.items() if record is not None},
+        'sections': {
+            doc: {file: [list(section) for section in sections] for file, sections in sorted(files.items())}
+            for doc, files in sorted(doc_index.items())
+        },
+        'stats': directory_stats,
+    }
+    _atomic_write_text(_shard_path(workspace, index, count), json.dumps(payload, ensure_ascii=False) + '\n')
+    stats.absorb_cache(cache, baseline)
+    stats.duration = time.perf_counter() - stats.started
+    return written
+
+
+def _shard_count(workspace: Workspace) -> int:
+    """N of the shard files on disk; ambiguous when runs with different N left files behind."""
+    shard_dir = workspace.resolve(SHARD_DIR)
+    backend = filesystem()
+    names = [item.name for item in backend.scandir(shard_dir)] if backend.is_dir(shard_dir) else []
+    counts = {name[:-len('.json')].rpartition('-of-')[2] for name in fnmatch.filter(names, '*-of-*.json')}
+    if not counts:
+        raise SystemExit(f"{shard_dir}: 병합할 샤드가 없습니다")
+    if len(counts) != 1 or not next(iter(counts)).isdigit():
+        raise SystemExit(f"샤드 수가 서로 다른 파일이 있습니다 ({', '.join(sorted(counts))}): merge --shards N 으로 지정하세요")
+    return int(counts.pop())
+
+
+def merge_shards(
+    cache: Optional[SectionCache] = None,
+    stats: Optional[RunStats] = None,
+    workspace: Optional[Workspace] = None,
+    count: Optional[int] = None,
+) -> dict[str, dict]:
+    """Combine the results of shards 1..``count``; refuses incomplete or mismatched shard sets.
+
+    ``count`` defaults to the N of the shard files on disk. The merged shard files are removed
+    afterwards so a later run with a different N never picks them up.
+    """
+    workspace = workspace or Workspace()
+    if stats is None:
+        stats = RunStats()
+    if count is None:
+        count = _shard_count(workspace)
+    generator = generator_digest(workspace)
+    backend = filesystem()
+    payloads = []
+    missing: list[int] = []
+    shard_files = [_shard_path(workspace, index, count) for index in range(1, count + 1)]
+    for index, path in enumerate(shard_files, start=1):
+        try:
+            payload = json.loads(backend.read_text(path))
+        except FileNotFoundError:
+            missing.append(index)
+            continue
+        if payload.get('version') != SHARD_VERSION or payload.get('shard') != [index, count]:
+            raise SystemExit(f"{path}: 지원하지 않는 샤드 형식입니다")
+        if payload.get('generator') != generator:
+            raise SystemExit(f"{path}: 다른 버전의 생성기로 만든 샤드입니다")
+        payloads.append(payload)
+    if missing:
+        raise SystemExit(f"누락된 샤드: {', '.join(f'{index}/{count}' for index in missing)}")
+
+    covered = [doc for payload in payloads for doc in payload['docs']]
+    expected = sorted(doc for doc in workspace.docs if doc != 'CLAUDE.md')
+    if sorted(covered) != expected:
+        raise SystemExit('샤드가 레지스트리 전체를 정확히 한 번씩 포함하지 않습니다')
+
+    outputs: dict[str, Optional[dict]] = {}
+    doc_index: dict[str, SectionIndex] = {}
+    directory_stats: dict[str, dict] = {}
+    for payload in payloads:
+        outputs.update({doc: payload['outputs'].get(doc) for doc in payload['docs']})
+        directory_stats.update(payload['stats'])
+        for doc, files in payload['sections'].items():
+            doc_index[doc] = {file: [tuple(section) for section in sections] for file, sections in files.items()}
+
+    reports = record_run_state(['CLAUDE.md'], doc_index, directory_stats, cache, stats, workspace, merged=outputs)
+    for path in shard_files:
+        backend.unlink(path)
+    stats.duration = time.perf_counter() - stats.started
+    return reports
@@ -1,450 +1,35 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable, Optional, Sequence
-
-import re
-from collections import defaultdict
-
-# SECTION: Data Model - claude 문서 항목 구조
-
-@dataclass
-class Entry:
-    title: str
-    purpose: list[str]
-    responsibilities: list[str]
-    structure: list[str]
-    centralization: list[str]
-    rules: list[str]
-    references: list[str]
-    file_map_path: Optional[str] = None
-    file_map_extensions: Optional[tuple[str, ...]] = None
-
-DOCS: dict[str, Entry] = {}
-
-
-def add(
-    path: str,
-    *,
-    title: str,
-    purpose: Iterable[str],
-    responsibilities: Iterable[str] | None = None,
-    structure: Iterable[str] | None = None,
-    centralization: Iterable[str] | None = None,
-    rules: Iterable[str] | None = None,
-    references: Iterable[str] | None = None,
-    file_map_path: str | None = None,
-    file_map_extensions: Sequence[str] | None = None,
-) -> None:
-    if path in DOCS:
-        raise ValueError(f"Duplicate entry for {path}")
-
-    resolved_path = Path(path)
-    if file_map_path is None:
-        parent = resolved_path.parent
-        file_map_path = None if str(parent) in ('', '.') else parent.as_posix()
-    else:
-        file_map_path = Path(file_map_path).as_posix()
-
-    extensions_tuple: Optional[tuple[str, ...]] = None
-    if file_map_extensions:
-        extensions_tuple = tuple({ext.lower() for ext in file_map_extensions})
-
-    DOCS[path] = Entry(
-        title=title,
-        purpose=list(purpose),
-        responsibilities=list(responsibilities or []),
-        structure=list(structure or []),
-        centralization=list(centralization or []),
-        rules=list(rules or []),
-        references=list(references or []),
-        file_map_path=file_map_path,
-        file_map_extensions=extensions_tuple,
-    )
-
-
-# ---------------------------------------------------------------------------
-# Utility helpers for file section extraction
-# ---------------------------------------------------------------------------
-
-# SECTION: Section Extraction Utilities - 파일 섹션 파싱 로직
-
-SECTION_COMMENT_PATTERN = re.compile(r"^\s*//\s*SECTION:\s*(?P<title>[^-]+?)(?:\s*-\s*(?P<desc>.*))?\s*$")
-BLOCK_SECTION_PATTERN = re.compile(r"^\s*/\*\s*SECTION:\s*(?P<title>[^-]+?)(?:\s*-\s*(?P<desc>.*?))?\s*\*/")
-EXPORT_PATTERN = re.compile(
-    r"^\s*export\s+(?:default\s+)?(const|let|var|function|class|interface|type|enum)\s*" r"(?P<name>[A-Za-z0-9_]+)?"
-)
-MARKDOWN_HEADING_PATTERN = re.compile(r"^\s*##\s+(?P<title>.+?)\s*$")
-PY_SECTION_PATTERN = re.compile(r"^\s*#\s*SECTION:\s*(?P<title>[^-]+?)(?:\s*-\s*(?P<desc>.*))?\s*$")
-
-
-def _clean_comment_line(raw: str) -> str:
-    text = raw.strip()
-    text = text.lstrip('/*').lstrip('*').lstrip('/').strip()
-    text = text.rstrip('*/').strip()
-    return text
-
-
-def _extract_preceding_comment(lines: list[str], start_index: int) -> str:
-    idx = start_index - 2  # convert to 0-based
-    collected: list[str] = []
-    encountered = False
-
-    while idx >= 0:
-        line = lines[idx]
-        stripped = line.strip()
-        if not stripped:
-            if not encountered:
-                idx -= 1
-                continue
-            break
-        if stripped.startswith('//'):
-            collected.insert(0, stripped[2:].strip())
-            encountered = True
-            idx -= 1
-            continue
-        if stripped.endswith('*/'):
-            block: list[str] = []
-            block.insert(0, stripped)
-            idx -= 1
-            while idx >= 0:
-                block.insert(0, lines[idx].strip())
-                if lines[idx].strip().startswith('/*') or lines[idx].strip().startswith('/**'):
-                    idx -= 1
-                    break
-                idx -= 1
-            cleaned = [
-                _clean_comment_line(item)
-                for item in block
-                if _clean_comment_line(item)
-            ]
-            return ' '.join(cleaned)
-        break
-    if collected:
-        return ' '.join(collected)
-    return ''
-
-
-def _extract_preceding_python_comment(lines: list[str], start_index: int) -> str:
-    idx = start_index - 2
-    collected: list[str] = []
-    while idx >= 0:
-        stripped = lines[idx].strip()
-        if not stripped:
-            if not collected:
-                idx -= 1
-                continue
-            break
-        if stripped.startswith('#'):
-            collected.insert(0, stripped.lstrip('#').strip())
-            idx -= 1
-            continue
-        break
-    return ' '.join(collected)
-
-
-def _compute_ranges(markers: list[tuple[int, str, str]], total_lines: int) -> list[tuple[int, int, str, str]]:
-    sections: list[tuple[int, int, str, str]] = []
-    for idx, (start, title, desc) in enumerate(markers):
-        end = markers[idx + 1][0] - 1 if idx + 1 < len(markers) else total_lines
-        sections.append((start, end, title.strip(), desc.strip()))
-    return sections
-
-
-def _extract_ts_sections(lines: list[str]) -> list[tuple[int, int, str, str]]:
-    markers: list[tuple[int, str, str]] = []
-    for index, line in enumerate(lines, start=1):
-        section_match = SECTION_COMMENT_PATTERN.match(line)
-        if section_match:
-            markers.append((index, section_match.group('title'), section_match.group('desc') or ''))
-            continue
-        block_match = BLOCK_SECTION_PATTERN.match(line)
-        if block_match:
-            markers.append((index, block_match.group('title'), block_match.group('desc') or ''))
-    if markers:
-        return _compute_ranges(markers, len(lines))
-
-    exports: list[tuple[int, str]] = []
-    for index, line in enumerate(lines, start=1):
-        export_match = EXPORT_PATTERN.match(line)
-        if export_match:
-            name = export_match.group('name') or 'default export'
-            exports.append((index, f"export {name}"))
-    if exports:
-        sections: list[tuple[int, int, str, str]] = []
-        for idx, (start, title) in enumerate(exports):
-            end = exports[idx + 1][0] - 1 if idx + 1 < len(exports) else len(lines)
-            desc = _extract_preceding_comment(lines, start)
-            sections.append((start, end, title, desc))
-        return sections
-
-    definitions: list[tuple[int, str]] = []
-    for index, line in enumerate(lines, start=1):
-        class_match = re.match(r'^\s*class\s+([A-Za-z0-9_]+)', line)
-        if class_match:
-            definitions.append((index, f"class {class_match.group(1)}"))
-            continue
-        func_match = re.match(r'^\s*function\s+([A-Za-z0-9_]+)', line)
-        if func_match:
-            definitions.append((index, f"function {func_match.group(1)}"))
-            continue
-        const_match = re.match(r'^\s*(const|let|var)\s+([A-Za-z0-9_]+)\s*=', line)
-        if const_match:
-            definitions.append((index, f"{const_match.group(1)} {const_match.group(2)}"))
-
-    if not definitions:
-        return []
-
-    fallback_sections: list[tuple[int, int, str, str]] = []
-    for idx, (start, title) in enumerate(definitions):
-        end = definitions[idx + 1][0] - 1 if idx + 1 < len(definitions) else len(lines)
-        desc = _extract_preceding_comment(lines, start)
-        fallback_sections.append((start, end, title, desc))
-    return fallback_sections
-
-
-def _extract_python_sections(lines: list[str]) -> list[tuple[int, int, str, str]]:
-    markers: list[tuple[int, str, str]] = []
-    for index, line in enumerate(lines, start=1):
-        match = PY_SECTION_PATTERN.match(line)
-        if match:
-            markers.append((index, match.group('title'), match.group('desc') or ''))
-    if markers:
-        return _compute_ranges(markers, len(lines))
-
-    definitions: list[tuple[int, str]] = []
-    for index, line in enumerate(lines, start=1):
-        class_match = re.match(r'^\s*class\s+([A-Za-z0-9_]+)', line)
-        if class_match:
-            definitions.append((index, f"class {class_match.group(1)}"))
-            continue
-        def_match = re.match(r'^\s*def\s+([A-Za-z0-9_]+)', line)
-        if def_match:
-            definitions.append((index, f"def {def_match.group(1)}"))
-            continue
-        const_match = re.match(r'^\s*(?:[A-Z_][A-Z0-9_]*)\s*=\s*', line)
-        if const_match:
-            name = line.split('=')[0].strip()
-            definitions.append((index, name))
-    if not definitions:
-        return []
-
-    sections: list[tuple[int, int, str, str]] = []
-    for idx, (start, title) in enumerate(definitions):
-        end = definitions[idx + 1][0] - 1 if idx + 1 < len(definitions) else len(lines)
-        desc = _extract_preceding_python_comment(lines, start)
-        sections.append((start, end, title, desc))
-    return sections
-
-
-def _extract_markdown_sections(lines: list[str]) -> list[tuple[int, int, str, str]]:
-    markers: list[tuple[int, str]] = []
-    for index, line in enumerate(lines, start=1):
-        heading_match = MARKDOWN_HEADING_PATTERN.match(line)
-        if heading_match:
-            title = heading_match.group('title').strip()
-            if title == '라인 가이드':
-                continue
-            markers.append((index, title))
-    if not markers:
-        return []
-
-    sections: list[tuple[int, int, str, str]] = []
-    for idx, (start, title) in enumerate(markers):
-        end = markers[idx + 1][0] - 1 if idx + 1 < len(markers) else len(lines)
-        desc = ''
-        for probe in range(start, min(end + 1, start + 10)):
-            text = lines[probe - 1].strip()
-            if not text or text.startswith('#'):
-                continue
-            if text.startswith('-') or text.startswith('*'):
-                desc = text[1:].strip()
-            else:
-                desc = text
-            if desc:
-                break
-        sections.append((start, end, title, desc))
-    return sections
-
-
-def _extract_css_sections(lines: list[str]) -> list[tuple[int, int, str, str]]:
-    markers: list[tuple[int, str, str]] = []
-    for index, line in enumerate(lines, start=1):
-        block_match = BLOCK_SECTION_PATTERN.match(line)
-        if block_match:
-            markers.append((index, block_match.group('title'), block_match.group('desc') or ''))
-    if markers:
-        return _compute_ranges(markers, len(lines))
-    return []
-
-
-def extract_sections(path: Path) -> list[tuple[int, int, str, str]]:
-    try:
-        text = path.read_text(encoding='utf-8')
-    except UnicodeDecodeError:
-        return []
-
-    lines = text.splitlines()
-    suffix = path.suffix.lower()
-
-    if suffix in {'.ts', '.tsx', '.js', '.jsx', '.mjs', '.cjs'}:
-        return _extract_ts_sections(lines)
-    if suffix == '.md':
-        return _extract_markdown_sections(lines)
-    if suffix in {'.css', '.scss', '.sass'}:
-        return _extract_css_sections(lines)
-    if suffix == '.py':
-        return _extract_python_sections(lines)
-    return []
-
-
-# SECTION: File Map Builder - 각 파일별 라인 범위 요약
-def generate_file_map_lines(entry: Entry) -> list[str]:
-    if not entry.file_map_path:
-        return ["- 추적 가능한 파일이 없습니다."]
-
-    base = Path(entry.file_map_path)
-    if not base.exists() or not base.is_dir():
-        return ["- 추적 가능한 파일이 없습니다."]
-
-    extensions = entry.file_map_extensions
-    lines: list[str] = []
-
-    for file in sorted(base.iterdir(), key=lambda f: f.name.lower()):
-        # Skip root-level documentation files (CLAUDE.md or claude.md)
-        if file.name.lower() in ('claude.md', 'CLAUDE.md'):
-            continue
-        if not file.is_file():
-            continue
-        if extensions and file.suffix.lower() not in extensions:
-            continue
-
-        sections = extract_sections(file)
-        if not sections:
-            continue
-
-        for start, end, title, desc in sections:
-            width = 4 if end >= 1000 else 3 if end >= 100 else 2
-            desc_part = f" - {desc}" if desc else ''
-            lines.append(f"- {file.name} {start:0{width}d}~{end:0{width}d} {title}{desc_part}")
-
-    if not lines:
-        return ["- 추적 가능한 파일이 없습니다."]
-    return lines
-
-
-# SECTION: Root Document Helpers - 루트 claude.md 전용 유틸
-def build_directory_tree() -> list[str]:
-    claude_paths = [Path(p) for p in DOCS.keys() if p != 'CLAUDE.md']
-    extra_files = [Path('scripts/generate_claude_docs.py')]
-
-    file_children: dict[Path, list[str]] = defaultdict(list)
-    dir_set = {Path('.')}
-
-    for file_path in claude_paths:
-        file_children[file_path.parent].append(file_path.name)
-        parent = file_path.parent
-        while parent not in dir_set:
-            dir_set.add(parent)
-            parent = parent.parent
-    for extra in extra_files:
-        if extra.exists():
-            file_children[extra.parent].append(extra.name)
-            parent = extra.parent
-            while parent not in dir_set:
-                dir_set.add(parent)
-                parent = parent.parent
-
-    file_children[Path('.')].append('CLAUDE.md')
-
-    dir_children: dict[Path, list[Path]] = defaultdict(list)
-    for directory in dir_set:
-        if directory == Path('.'):
-            continue
-        dir_children[directory.parent].append(directory)
-
-    for key in dir_children:
-        dir_children[key].sort(key=lambda p: p.name.lower())
-    for key in file_children:
-        file_children[key].sort(key=lambda name: name.lower())
-
-    lines: list[str] = []
-
-    def walk(directory: Path, prefix: str) -> None:
-        entries_dirs = dir_children.get(directory, [])
-        entries_files = file_children.get(directory, [])
-        total = len(entries_dirs) + len(entries_files)
-        for idx, child_dir in enumerate(entries_dirs, start=1):
-            connector = '└──' if idx == total and not entries_files else '├──'
-            lines.append(f"{prefix}{connector} {child_dir.name}/")
-            next_prefix = prefix + ('    ' if connector == '└──' and not entries_files else '│   ')
-            walk(child_dir, next_prefix)
-        for file_index, file_name in enumerate(entries_files, start=1):
-            connector = '└──' if file_index == len(entries_files) else '├──'
-            lines.append(f"{prefix}{connector} {file_name}")
-
-    lines.append('Weave_V3/')
-    walk(Path('.'), '')
-    return lines
-
-
-def update_line_guide(lines: list[str]) -> list[str]:
-    heading_positions: list[tuple[str, int]] = []
-    for idx, line in enumerate(lines, start=1):
-        if line.startswith('## ') and line.strip() != '## 라인 가이드':
-            heading_positions.append((line[3:].strip(), idx))
-    if not heading_positions:
-        return lines
-
-    ranges: list[tuple[str, int, int]] = []
-    for i, (title, start) in enumerate(heading_positions):
-        end = heading_positions[i + 1][1] - 1 if i + 1 < len(heading_positions) else len(lines)
-        ranges.append((title, start, end))
-
-    guide_index = next((i for i, line in enumerate(lines) if line.strip() == '## 라인 가이드'), None)
-    if guide_index is None:
-        return lines
-
-    bullet_start = guide_index + 1
-    bullet_end = bullet_start
-    while bullet_end < len(lines) and lines[bullet_end].startswith('- '):
-        bullet_end += 1
-
-    def format_num(value: int) -> str:
-        return f"{value:02d}" if value < 100 else str(value)
-
-    new_bullets = [f"- {format_num(start)}~{format_num(end)}: {title}" for title, start, end in ranges]
-    return lines[:bullet_start] + new_bullets + lines[bullet_end:]
-
-
-def update_directory_block(lines: list[str]) -> list[str]:
-    try:
-        structure_idx = next(i for i, line in enumerate(lines) if line.strip() == '## 전체 디렉토리 구조')
-        code_start = next(i for i in range(structure_idx + 1, len(lines)) if lines[i].strip() == '```')
-        code_end = next(i for i in range(code_start + 1, len(lines)) if lines[i].strip() == '```')
-    except StopIteration:
-        return lines
-
-    tree_lines = build_directory_tree()
-    new_block = ['```'] + tree_lines + ['```']
-    return lines[:code_start] + new_block + lines[code_end + 1:]
-
-
-def update_root_document() -> None:
-    """Update root documentation file (CLAUDE.md or claude.md for backward compatibility)"""
-    path = Path('CLAUDE.md')
-    if not path.exists():
-        # Fallback to lowercase for backward compatibility
-        path = Path('claude.md')
-        if not path.exists():
-            return
-
-    lines = path.read_text(encoding='utf-8').splitlines()
-    lines = update_directory_block(lines)
-    lines = update_line_guide(lines)
-    path.write_text('\n'.join(lines) + '\n', encoding='utf-8')
-
+from typing import Optional, Sequence
+
+import argparse
+import json
+import os
+import sys
+
+from claude_docs.api import extract, generate  # noqa: F401  기존 `import generate_claude_docs` 사용처 호환
+from claude_docs.budget import regenerate_budgeted
+from claude_docs.cache import DEFAULT_SHARED_CACHE_MAX_MB, SHARED_CACHE_ENV, SectionCache, SharedExtractionCache
+from claude_docs.coalesce import RunCoalescer
+from claude_docs.daemon import DEFAULT_SOCKET_PATH, request_daemon, serve
+from claude_docs.discovery import discover_registry
+from claude_docs.extraction import DEFAULT_TOKENIZER, TOKENIZERS
+from claude_docs.fs import filesystem
+from claude_docs.indexes import SECTION_DIFF_PATH, format_section_diff
+from claude_docs.manifest import check_outputs
+from claude_docs.metrics import write_metrics_textfile
+from claude_docs.model import Registry, Workspace, parse_root_spec
+from claude_docs.offsets import read_section
+from claude_docs.pipeline import RunStats, regenerate_all, worker_pool
+from claude_docs.profiling import MemoryProfiler, TraceRecorder, memory_profiling, trace_span, tracing
+from claude_docs.references import load_referrers
+from claude_docs.shards import SHARD_WEIGHTS, merge_shards, parse_shard_spec, regenerate_shard
+
+# 레지스트리(add() 항목)와 CLI만 이 파일에 두고, 생성 로직은 같은 디렉터리의 claude_docs 패키지에 있음
+# 항목은 이 스크립트의 DOCS에만 쌓이며, 작업 공간(Workspace.docs)은 그 사본을 받음
+DOCS = Registry()
+add = DOCS.add
 
 # ---------------------------------------------------------------------------
 # 루트 및 상위 디렉터리 문서
@@ -577,6 +162,10 @@ add(
         '로컬 스토리지 데이터 검증과 통계 수집',
         '경량 통합 테스트와 시뮬레이션 지원'
     ],
+    structure=[
+        'claude_docs/: claude.md 생성 로직 패키지 (→ scripts/claude_docs/claude.md)',
+        'tests/: claude_docs 패키지 pytest 테스트 (→ scripts/tests/claude.md)'
+    ],
     centralization=[
         '스크립트에서 사용하는 상수는 config 또는 환경 변수에서 주입하여 하드코딩을 방지'
     ],
@@ -591,6 +180,59 @@ add(
     ]
 )
 
+add(
+    'scripts/claude_docs/claude.md',
+    title='scripts/claude_docs - 문서 생성 엔진',
+    purpose=[
+        'generate_claude_docs.py 의 추출·렌더링·상태 관리 로직을 모듈 단위로 제공합니다.',
+        '레지스트리와 CLI는 스크립트에 두고 이 패키지는 재사용 가능한 구성 요소만 담습니다.'
+    ],
+    responsibilities=[
+        'SECTION 마커 추출과 토큰 추정',
+        'claude.md 렌더링과 원자적 쓰기',
+        '매니페스트·인덱스·캐시 등 .claude-docs/ 상태 관리',
+        '데몬·샤드·예산 실행 모드 지원'
+    ],
+    centralization=[
+        '상태 파일 경로는 model.STATE_DIR 아래에서만 정의',
+        '파일 입출력은 fs.filesystem() 백엔드를 통해서만 수행'
+    ],
+    rules=[
+        '모듈 추가·삭제 시 매니페스트가 생성기 변경으로 인식하므로 전체 재생성이 일어남',
+        '새 모듈은 파일 상단 docstring과 SECTION 마커로 역할을 기록'
+    ],
+    references=[
+        'scripts/claude.md',
+        'scripts/generate_claude_docs.py',
+        'scripts/bench_claude_docs.py'
+    ]
+)
+
+add(
+    'scripts/tests/claude.md',
+    title='scripts/tests - 문서 생성기 테스트',
+    purpose=[
+        'scripts/claude_docs 패키지의 동작을 pytest로 검증합니다.',
+        '임시 디렉터리에 만든 작은 저장소에서 생성·점검·병합 결과를 비교합니다.'
+    ],
+    responsibilities=[
+        '언어별 섹션 추출기(SQL 포함)와 마커 파서 동작 확인',
+        '.gitignore 패턴과 중첩 규칙 확인',
+        '--shard/merge, --check, --stream 등 실행 모드의 결과와 추출 배치 스케줄링 확인',
+        '.claude-docs/ 상태 파일과 사용자에게 보이는 출력 형식 확인'
+    ],
+    centralization=[
+        '공용 픽스처와 예제 저장소 내용은 conftest.py에서만 정의'
+    ],
+    rules=[
+        'scripts/ 에서 python -m pytest tests 로 실행',
+        '테스트는 실제 저장소의 claude.md나 .claude-docs/를 건드리지 않고 tmp_path 안에서만 씀'
+    ],
+    references=[
+        'scripts/claude_docs/claude.md'
+    ]
+)
+
 add(
     'supabase/claude.md',
     title='supabase - 프로젝트 설정 가이드',
@@ -636,6 +278,7 @@ add(
     ],
     rules=[
         '새 마이그레이션 작성 후 Supabase CLI로 검증',
+        '긴 마이그레이션은 `-- SECTION: 제목 - 설명` 주석으로 파일 라인 맵 구간을 지정',
         'Storage 타입과 구조가 일치하는지 확인',
         'RLS 정책 변경 시 인증 문서와 동기화'
     ],
@@ -1989,76 +1632,199 @@ add(
 )
 
 
+# SECTION: CLI Entry Point - 스크립트 실행 지점
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='claude.md 문서 생성기')
+    parser.add_argument('--check', action='store_true', help='문서를 쓰지 않고 최신 여부만 검사 (매니페스트가 없으면 메모리에서 렌더링해 내용 비교)')
+    parser.add_argument('--stream', action='store_true', help='대형 트리용 메모리 상한 스트리밍 모드로 문서 작성 (매니페스트·섹션 인덱스·오프셋 기록은 남기지 않음)')
+    parser.add_argument('--diff-report', action='store_true', help='이전 실행 대비 섹션 구조 변화를 출력')
+    parser.add_argument('--metrics-file', type=Path, help='node_exporter textfile(.prom) 경로에 실행 지표 기록')
+    parser.add_argument('--trace', type=Path, help='Chrome/Perfetto Trace Event Format JSON 경로')
+    parser.add_argument(
+        '--memprofile',
+        type=Path,
+        metavar='PATH',
+        help=(
+            '단계별 최대·잔류 메모리와 할당 위치를 tracemalloc으로 측정해 JSON으로 기록 (파일별 추출 측정은 --jobs 1). '
+            '단계 경계 스냅샷은 단계 시간에서 빠지지만 tracemalloc 추적 자체가 전체 실행을 느리게 함'
+        ),
+    )
+    parser.add_argument(
+        '--root',
+        action='append',
+        metavar='PATH[=LABEL]',
+        help='생성할 작업 공간 루트와 트리에 표시할 이름 (반복 지정 가능, 기본값: 현재 디렉터리, 이름 생략 시 디렉터리 이름)',
+    )
+    parser.add_argument('--jobs', type=int, default=1, help='섹션 추출에 사용할 워커 프로세스 수 (모든 루트가 공유)')
+    parser.add_argument(
+        '--tokenizer',
+        default=DEFAULT_TOKENIZER,
+        metavar='NAME|MODULE:FUNC',
+        help=f"섹션 토큰 수 추정기 ({', '.join(TOKENIZERS)} 또는 module:function)",
+    )
+    parser.add_argument(
+        '--cache-dir',
+        type=Path,
+        default=os.environ.get(SHARED_CACHE_ENV) or None,
+        metavar='DIR',
+        help=f"작업 트리·CI가 공유하는 내용 주소 기반 추출 캐시 디렉터리 (기본값: ${SHARED_CACHE_ENV})",
+    )
+    parser.add_argument(
+        '--cache-max-mb',
+        type=int,
+        default=DEFAULT_SHARED_CACHE_MAX_MB,
+        help='공유 캐시 크기 상한(MB), 넘으면 오래 쓰지 않은 항목부터 삭제',
+    )
+    parser.add_argument('--no-lock', action='store_true', help='실행 잠금과 동시 요청 병합을 사용하지 않음')
+    parser.add_argument('--discover', action='store_true', help='등록되지 않은 디렉터리도 탐색해 기본 문서를 생성')
+    parser.add_argument(
+        '--discover-ignore',
+        action='append',
+        default=[],
+        metavar='PATTERN',
+        help='탐색에서 제외할 루트 기준 경로 패턴 (fnmatch, 반복 지정 가능)',
+    )
+    parser.add_argument(
+        '--budget-ms',
+        type=int,
+        metavar='N',
+        help='N밀리초 안에서 오래된 문서부터 갱신하고 남은 문서는 다음 실행으로 미룸 (git hook용). '
+        '계획·문서 작성·마무리(매니페스트·인덱스) 단계를 포함하며 인터프리터 시작·import·실행 잠금 대기는 제외',
+    )
+    parser.add_argument('--shard', metavar='i/N', help='N개 샤드 중 i번째 몫만 생성 (루트 문서는 merge 단계에서 작성)')
+    parser.add_argument(
+        '--shard-weight', choices=SHARD_WEIGHTS, default='bytes', help='샤드 균형 기준 (입력 바이트 또는 파일 수)'
+    )
+    subparsers = parser.add_subparsers(dest='command')
+
+    serve_parser = subparsers.add_parser('serve', help='캐시를 유지하는 상주 데몬 실행')
+    serve_parser.add_argument('--socket', default=DEFAULT_SOCKET_PATH)
 
-# SECTION: Document Builder - claude.md 템플릿 생성
-def build_lines(entry: Entry) -> list[str]:
-    file_map_lines = generate_file_map_lines(entry)
-    sections = [
-        ("디렉토리 목적", [*entry.purpose]),
-        ("핵심 책임", [f"- {item}" for item in entry.responsibilities] if entry.responsibilities else ["- 현재 정의된 책임이 없습니다."] ),
-        ("구조 요약", [f"- {item}" for item in entry.structure] if entry.structure else ["- 하위 디렉토리가 없습니다."]),
-        ("파일 라인 맵", file_map_lines),
-        ("중앙화·모듈화·캡슐화", [f"- {item}" for item in entry.centralization] if entry.centralization else ["- 각 모듈은 기존 중앙화 규칙을 따릅니다."]),
-        ("작업 규칙", [f"- {item}" for item in entry.rules] if entry.rules else ["- 변경 시 관련 claude.md와 설정을 함께 점검합니다."]),
-        ("관련 문서", [f"- {item}" for item in entry.references] if entry.references else ["- claude.md"]),
-    ]
+    client_parser = subparsers.add_parser('client', help='실행 중인 데몬에 요청 전송')
+    client_parser.add_argument('--socket', default=DEFAULT_SOCKET_PATH)
+    client_parser.add_argument('op', choices=['regenerate', 'regenerate-paths', 'query', 'shutdown'])
+    client_parser.add_argument('paths', nargs='*')
+    client_parser.add_argument(
+        '--full', action='store_true', help='regenerate: 변경 여부와 관계없이 모든 문서를 다시 생성'
+    )
 
-    lines: list[str] = []
-    lines.append(f"# {entry.title}")
-    lines.append("")
-    lines.append("## 라인 가이드")
-    placeholder_keys: list[str] = []
-    for idx, (heading, _) in enumerate(sections):
-        token = f"__LG{idx}__"
-        placeholder_keys.append(token)
-        lines.append(f"- {token}: {heading}")
-    lines.append("")
-
-    for heading, body in sections:
-        lines.append(f"## {heading}")
-        lines.extend(body)
-        lines.append("")
-
-    while lines and lines[-1] == "":
-        lines.pop()
-    lines.append("")
-
-    # Compute line ranges
-    heading_positions: list[int] = []
-    for idx, line in enumerate(lines, start=1):
-        if line.startswith("## ") and line != "## 라인 가이드":
-            heading_positions.append(idx)
-    total_lines = len(lines)
-    ranges: list[tuple[int, int]] = []
-    for i, start in enumerate(heading_positions):
-        end = heading_positions[i + 1] - 1 if i + 1 < len(heading_positions) else total_lines
-        ranges.append((start, end))
-
-    width = 2 if total_lines < 100 else 3 if total_lines < 1000 else 4
-    replacements = [f"{start:0{width}d}~{end:0{width}d}" for start, end in ranges]
-
-    for token, value in zip(placeholder_keys, replacements):
-        for idx, line in enumerate(lines):
-            if token in line:
-                lines[idx] = line.replace(token, value)
-    return lines
-
-
-# SECTION: File Writer - claude.md 파일 저장
-def write_entry(path: Path, entry: Entry) -> None:
-    lines = build_lines(entry)
-    text = "\n".join(lines)
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(text, encoding='utf-8')
+    slice_parser = subparsers.add_parser('slice', help='파일 하나를 모두 읽지 않고 섹션 하나의 바이트만 출력')
+    slice_parser.add_argument('file', help='루트 기준 파일 경로')
+    slice_parser.add_argument('section', help='섹션 제목(부분 일치 가능) 또는 1부터 시작하는 순번')
 
+    refs_parser = subparsers.add_parser('refs', help='경로를 참조하는 claude.md 문서 목록 출력 (역참조 인덱스)')
+    refs_parser.add_argument('path', help='루트 기준 claude.md 또는 소스 파일 경로')
 
-# SECTION: CLI Entry Point - 스크립트 실행 지점
-def main() -> None:
-    for path_str in sorted(DOCS.keys()):
-        if path_str == 'CLAUDE.md':
-            continue
-        write_entry(Path(path_str), DOCS[path_str])
-    update_root_document()
+    merge_parser = subparsers.add_parser('merge', help='--shard 실행 결과를 모아 루트 문서·매니페스트·섹션 인덱스 작성')
+    merge_parser.add_argument(
+        '--shards', type=int, metavar='N',
+        help='병합할 샤드 수 (생략 시 상태 디렉터리의 샤드 파일에서 추론하며, 병합한 샤드 파일은 삭제)',
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    args = parse_args(argv)
+    if args.command == 'client':
+        payload: dict = {'op': args.op}
+        if args.op == 'regenerate' and args.full:
+            payload['full'] = True
+        elif args.op == 'regenerate-paths':
+            payload['paths'] = args.paths
+        elif args.op == 'query':
+            if len(args.paths) != 1:
+                raise SystemExit('query takes exactly one path')
+            payload['path'] = args.paths[0]
+        response = request_daemon(payload, args.socket)
+        print(json.dumps(response, ensure_ascii=False, indent=2))
+        if not response.get('ok'):
+            raise SystemExit(1)
+        return
+    workspaces = [parse_root_spec(spec) for spec in args.root] if args.root else [Workspace()]
+    if args.discover:
+        for workspace in workspaces:
+            workspace.docs = discover_registry(workspace.root, workspace.docs, args.discover_ignore)
+    if args.command in ('serve', 'refs', 'slice') and len(workspaces) > 1:
+        # 데몬은 루트 하나의 캐시를 유지하고, refs·slice는 루트 기준 경로 하나를 조회하므로 루트를 골라 따로 실행
+        raise SystemExit(f"{args.command}: --root는 하나만 지정할 수 있습니다")
+    if args.command == 'serve':
+        serve(args.socket, workspaces[0])
+        return
+    if args.check:
+        raise SystemExit(check_outputs(workspaces))
+    if args.command == 'refs':
+        for doc in load_referrers(args.path, workspaces[0]):
+            print(doc)
+        return
+    if args.command == 'slice':
+        try:
+            data = read_section(args.file, args.section, workspaces[0])
+        except (OSError, LookupError) as error:
+            raise SystemExit(f"slice: {error}") from None
+        sys.stdout.buffer.write(data)
+        return
+    shard = parse_shard_spec(args.shard) if args.shard else None
+    if args.command == 'merge' and args.shards is not None and args.shards < 1:
+        raise SystemExit(f"merge --shards {args.shards}: 1 이상이어야 합니다")
+    if args.budget_ms is not None:
+        if args.budget_ms < 0:
+            raise SystemExit('--budget-ms: 0 이상의 값이어야 합니다')
+        if shard is not None or args.command == 'merge':
+            raise SystemExit('--budget-ms는 --shard 또는 merge와 함께 사용할 수 없습니다')
+    if args.stream:
+        # 스트리밍 실행은 문서별 섹션 인덱스·매니페스트 기록을 메모리에 모으지 않으므로 이를 잇는 모드와 함께 쓸 수 없음
+        for flag, used in (
+            ('--budget-ms', args.budget_ms is not None),
+            ('--shard', shard is not None),
+            ('merge', args.command == 'merge'),
+            ('--diff-report', args.diff_report),
+        ):
+            if used:
+                raise SystemExit(f"--stream은 {flag}와 함께 사용할 수 없습니다")
+
+    # 루트 간에 섹션 캐시와 워커 풀을 공유해 같은 파일(예: worktree 간 공통 경로)을 중복 파싱하지 않음
+    shared = SharedExtractionCache(Path(args.cache_dir), args.cache_max_mb * 1024 * 1024) if args.cache_dir else None
+    try:
+        cache = SectionCache(retain=not args.stream, tokenizer=args.tokenizer, shared=shared)
+    except (ImportError, AttributeError, ValueError) as error:
+        raise SystemExit(f"--tokenizer: {error}") from None
+    runs: list[tuple[Path, RunStats]] = []
+    tracer = TraceRecorder() if args.trace else None
+    memprofiler = MemoryProfiler() if args.memprofile else None
+    passes = iter([1]) if args.no_lock else RunCoalescer(workspaces).passes()
+    with memory_profiling(memprofiler), tracing(tracer), trace_span('run', 'run'), worker_pool(args.jobs) as pool:
+        for pass_number in passes:
+            # 실행 중 들어온 요청으로 다시 도는 경우 마지막 패스의 통계만 남김
+            runs = []
+            for workspace in workspaces:
+                stats = RunStats()
+                with trace_span('workspace', 'run', root=workspace.root.as_posix(), run_pass=pass_number):
+                    if args.command == 'merge':
+                        merge_shards(cache, stats, workspace, args.shards)
+                    elif shard is not None:
+                        regenerate_shard(*shard, cache, stats, workspace, pool, args.shard_weight)
+                    elif args.budget_ms is not None:
+                        regenerate_budgeted(args.budget_ms, cache, stats, workspace, pool)
+                    else:
+                        regenerate_all(cache, stream=args.stream, stats=stats, workspace=workspace, pool=pool)
+                runs.append((workspace.root, stats))
+    if not runs:
+        print('다른 생성 실행이 진행 중입니다. 변경 사항은 해당 실행이 이어서 반영합니다.', file=sys.stderr)
+        return
+    if tracer is not None:
+        tracer.write(args.trace)
+    if memprofiler is not None:
+        memprofiler.write(args.memprofile)
+        print('\n'.join(memprofiler.summary_lines()), file=sys.stderr)
+    if args.metrics_file:
+        write_metrics_textfile(args.metrics_file, runs)
+    # 샤드 실행은 섹션 diff를 만들지 않으며 merge 단계에서 출력
+    if args.diff_report and shard is None:
+        for workspace in workspaces:
+            if len(workspaces) > 1:
+                print(f"[{workspace.root.as_posix()}]")
+            reports = json.loads(filesystem().read_text(workspace.resolve(SECTION_DIFF_PATH)))
+            print('\n'.join(format_section_diff(reports)))
 
 
 if __name__ == "__main__":
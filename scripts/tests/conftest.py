@@ -0,0 +1,67 @@
+"""claude_docs 테스트 공용 픽스처."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import shutil
+import sys
+
+import pytest
+
+# 생성기는 scripts/에서 스크립트로 실행되므로 패키지를 설치하지 않고 같은 경로에서 가져옴
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+if str(SCRIPTS_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS_DIR))
+
+from claude_docs.model import (  # noqa: E402
+    GENERATOR_PACKAGE_RELATIVE_PATH,
+    GENERATOR_RELATIVE_PATH,
+    PACKAGE_DIR,
+    Entry,
+    Workspace,
+)
+
+SAMPLE_FILES = {
+    '.gitignore': 'build/\n*.log\n',
+    'CLAUDE.md': '# Sample\n\n## 개요\n- 테스트용 루트 문서\n',
+    'src/app.ts': (
+        '// SECTION: App - 진입점\nexport const app = 1;\n\n// SECTION: Helpers - 보조 함수\nexport function help() {}\n'
+    ),
+    'src/util.py': '# SECTION: Util - 유틸리티\nVALUE = 1\n\n\ndef util():\n    return VALUE\n',
+    'src/debug.log': 'ignored\n',
+    'src/lib/format.ts': 'export const format = (value: number) => value.toFixed(2);\n',
+    'src/lib/parse.ts': '/* SECTION: Parse - 파서 */\nexport function parse() {}\n',
+    'docs/guide.md': '# Guide\n\n## 설치\n설치 방법\n\n## 사용법\n사용 방법\n',
+    'sql/schema.sql': '-- SECTION: Tables - 테이블\nCREATE TABLE items (id int);\n',
+    'build/out.ts': '// SECTION: Built - 무시되어야 함\n',
+}
+
+
+def sample_entry(title: str, file_map_path: str | None = None) -> Entry:
+    return Entry(title, [f"{title} 문서"], [], [], [], [], [], file_map_path=file_map_path)
+
+
+@pytest.fixture
+def workspace(tmp_path: Path) -> Workspace:
+    """A small on-disk repository with one claude.md per source directory.
+
+    The generator sources are copied in as well, since manifests fingerprint them per root.
+    """
+    (tmp_path / '.git').mkdir()
+    shutil.copytree(
+        PACKAGE_DIR, tmp_path / GENERATOR_PACKAGE_RELATIVE_PATH, ignore=shutil.ignore_patterns('__pycache__')
+    )
+    shutil.copy2(PACKAGE_DIR.parent / GENERATOR_RELATIVE_PATH.name, tmp_path / GENERATOR_RELATIVE_PATH)
+    for relative, text in SAMPLE_FILES.items():
+        path = tmp_path / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding='utf-8')
+    docs = {
+        'CLAUDE.md': sample_entry('Sample'),
+        'src/claude.md': sample_entry('Source', 'src'),
+        'src/lib/claude.md': sample_entry('Library', 'src/lib'),
+        'docs/claude.md': sample_entry('Docs', 'docs'),
+        'sql/claude.md': sample_entry('SQL', 'sql'),
+    }
+    return Workspace(root=tmp_path, docs=docs)
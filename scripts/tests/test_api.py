@@ -0,0 +1,73 @@
+"""generate()·extract() API와 작업 공간별 레지스트리 확인."""
+
+from __future__ import annotations
+
+from dataclasses import replace
+
+import pytest
+
+from claude_docs import generate, render
+from claude_docs.fs import MemoryFileSystem
+from claude_docs.model import GENERATOR_RELATIVE_PATH, Registry, Workspace, load_registry, own_registry
+
+
+def test_write_renders_each_doc_once(workspace: Workspace, monkeypatch: pytest.MonkeyPatch) -> None:
+    rendered = []
+    build_lines = render.build_lines
+    monkeypatch.setattr(render, 'build_lines', lambda entry, *args: rendered.append(entry.title) or build_lines(entry, *args))
+
+    outputs = generate(workspace.root, workspace.docs, write=True)
+
+    assert sorted(rendered) == sorted(entry.title for doc, entry in workspace.docs.items() if doc != 'CLAUDE.md')
+    for doc, text in outputs.items():
+        assert workspace.resolve(doc).read_text(encoding='utf-8') == text
+
+
+def test_write_returns_what_a_dry_run_renders(workspace: Workspace) -> None:
+    dry = generate(workspace.root, workspace.docs)
+    assert not workspace.resolve('src/claude.md').exists()
+    assert generate(workspace.root, workspace.docs, write=True) == dry
+
+
+def test_memory_backend_leaves_the_disk_untouched(workspace: Workspace) -> None:
+    backend = MemoryFileSystem()
+    for path in sorted(workspace.root.rglob('*')):
+        if path.is_file() and '.git' not in path.parts:
+            backend.mkdir(path.parent)
+            backend.write_text(path, path.read_text(encoding='utf-8'))
+
+    outputs = generate(workspace.root, workspace.docs, write=True, backend=backend)
+
+    assert backend.read_text(workspace.resolve('src/claude.md')) == outputs['src/claude.md']
+    assert not workspace.resolve('src/claude.md').exists()
+
+
+def test_registry_rejects_duplicates() -> None:
+    registry = Registry()
+    registry.add('src/claude.md', title='Source', purpose=['소스'])
+    assert registry['src/claude.md'].file_map_path == 'src'
+    with pytest.raises(ValueError, match='Duplicate'):
+        registry.add('src/claude.md', title='Again', purpose=[])
+
+
+def test_workspaces_get_independent_registry_copies(workspace: Workspace) -> None:
+    first, second = Workspace(), Workspace()
+    first.docs['extra/claude.md'] = replace(next(iter(first.docs.values())), title='Extra')
+    assert 'extra/claude.md' not in second.docs
+    assert 'extra/claude.md' not in own_registry()
+
+
+def test_other_roots_load_their_own_registry(workspace: Workspace) -> None:
+    script = workspace.resolve(GENERATOR_RELATIVE_PATH)
+    script.write_text(
+        'from claude_docs.model import Registry\n\n'
+        'DOCS = Registry()\n'
+        "DOCS.add('lib/claude.md', title='Lib', purpose=['라이브러리'])\n",
+        encoding='utf-8',
+    )
+
+    docs = load_registry(workspace.root)
+
+    assert list(docs) == ['lib/claude.md']
+    assert docs['lib/claude.md'].title == 'Lib'
+    assert 'lib/claude.md' not in own_registry()
@@ -0,0 +1,46 @@
+"""--budget-ms 실행이 추출 비용을 한 번에 미리 읽고 한 번만 기록하는지 확인."""
+
+from __future__ import annotations
+
+import time
+
+import pytest
+
+from claude_docs import pipeline
+from claude_docs.budget import prefetch_plan, regenerate_budgeted
+from claude_docs.cache import SectionCache
+from claude_docs.indexes import load_extract_costs
+from claude_docs.manifest import find_stale_outputs
+from claude_docs.model import Workspace
+from claude_docs.pipeline import RunStats, document_files, worker_pool
+
+
+def test_budgeted_run_records_extract_costs_once(workspace: Workspace, monkeypatch: pytest.MonkeyPatch) -> None:
+    calls = []
+    record = pipeline.record_extract_costs
+    monkeypatch.setattr(pipeline, 'record_extract_costs', lambda costs, ws: (calls.append(dict(costs)), record(costs, ws)))
+
+    with worker_pool(2) as pool:
+        regenerate_budgeted(60_000, SectionCache(), stats=RunStats(), workspace=workspace, pool=pool)
+
+    assert len(calls) == 1
+    docs = sorted(path for path in workspace.docs if path != 'CLAUDE.md')
+    tracked = {file.as_posix() for file in document_files(docs, SectionCache(), workspace)}
+    assert set(load_extract_costs(workspace)) == tracked
+    assert find_stale_outputs(workspace) == []
+
+
+def test_prefetch_plan_without_history_plans_only_the_first_doc(workspace: Workspace) -> None:
+    order = ['src/claude.md', 'src/lib/claude.md', 'docs/claude.md']
+    plan = prefetch_plan(order, time.perf_counter() + 60, SectionCache(), workspace, 2, {})
+    assert plan == order[:1]
+
+
+def test_prefetch_plan_stops_at_the_estimated_budget(workspace: Workspace) -> None:
+    order = ['src/claude.md', 'src/lib/claude.md', 'docs/claude.md']
+    cache = SectionCache()
+    # 파일 하나당 1초: 첫 문서는 항상 포함되고, 다음 문서(파일 2개)는 남은 1.5초(워커 2개 × 0.75초)에 들어가지 않음
+    history = {file.as_posix(): 1.0 for file in document_files(order, cache, workspace)}
+    plan = prefetch_plan(order, time.perf_counter() + 0.75, cache, workspace, 2, history)
+    assert plan == ['src/claude.md']
+    assert prefetch_plan(order, time.perf_counter() + 60, cache, workspace, 2, history) == order
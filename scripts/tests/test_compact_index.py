@@ -0,0 +1,75 @@
+"""StringTable·SectionTable 압축 섹션 인덱스가 dict 인덱스와 같은 값을 돌려주는지 확인."""
+
+from __future__ import annotations
+
+from claude_docs import extract
+from claude_docs.compact_index import SectionTable, StringTable
+from claude_docs.extraction import extract_sections
+from claude_docs.model import Workspace
+
+
+def test_strings_are_interned_once_with_stable_ids() -> None:
+    table = StringTable()
+    values = ['', 'export default', '한글 제목', 'export default', *(f"name{index}" for index in range(100))]
+
+    ids = [table.intern(value) for value in values]
+
+    # 슬롯 표가 여러 번 커져도(rehash) id와 값은 그대로
+    assert ids[1] == ids[3]
+    assert len(table) == len(set(values))
+    assert [table[string_id] for string_id in ids] == values
+    assert table.intern('name42') == ids[values.index('name42')]
+
+
+def test_section_table_round_trips_tuples() -> None:
+    table = SectionTable()
+    sections = {
+        'src/a.ts': [(1, 3, 'App', '진입점'), (4, 9, 'export default', '')],
+        'src/b.ts': [(1, 2, 'export default', '')],
+        'src/empty.ts': [],
+    }
+    for file, rows in sections.items():
+        table[file] = rows
+
+    assert dict(table) == sections
+    assert list(table) == list(sections)
+    assert table.section_count('src/a.ts') == 2
+    # 반복되는 제목은 문자열 테이블에 한 번만 저장
+    assert len(table.strings) == 4
+
+
+def test_replace_delete_and_compact() -> None:
+    table = SectionTable()
+    table['a'] = [(1, 2, 'One', '')]
+    table['b'] = [(1, 5, 'Two', 'x'), (6, 8, 'Three', '')]
+    table['a'] = [(1, 4, 'One', 'changed')]
+    del table['b']
+    table['c'] = [(2, 3, 'Four', '')]
+    rows_before = len(table.starts)
+
+    table.compact()
+
+    assert len(table.starts) == 2 < rows_before
+    assert dict(table) == {'a': [(1, 4, 'One', 'changed')], 'c': [(2, 3, 'Four', '')]}
+    table['d'] = [(7, 7, 'Five', '')]
+    assert table['d'] == [(7, 7, 'Five', '')]
+
+
+def test_size_counts_columns_and_unique_strings() -> None:
+    table = SectionTable()
+    for index in range(500):
+        table[f"src/file{index}.ts"] = [(1, 10, 'export default', ''), (11, 40, f"Component{index}", '컴포넌트')]
+
+    # 제목·설명 중 고유한 것만 저장: 'export default', '', '컴포넌트', Component0~499
+    assert len(table.strings) == 503
+    # 행마다 4바이트 열 4개, 파일마다 offset·count 4바이트씩
+    assert table.nbytes() == 1000 * 16 + 500 * 8 + table.strings.nbytes()
+
+
+def test_extract_returns_a_section_table(workspace: Workspace) -> None:
+    paths = [workspace.resolve('src/app.ts'), workspace.resolve('src/util.py')]
+
+    index = extract(paths)
+
+    assert isinstance(index, SectionTable)
+    assert {file: index[file] for file in index} == {path.as_posix(): extract_sections(path) for path in paths}
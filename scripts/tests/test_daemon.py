@@ -0,0 +1,61 @@
+"""상주 데몬이 --root로 지정한 루트를 쓰고, 첫 갱신이 상태 파일을 자르지 않는지 확인."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+import generate_claude_docs
+from claude_docs.cache import SectionCache
+from claude_docs.daemon import WarmState
+from claude_docs.indexes import load_directory_stats, load_section_index
+from claude_docs.model import Workspace
+from claude_docs.pipeline import regenerate_all
+
+
+def test_serve_uses_the_given_root(workspace: Workspace, monkeypatch: pytest.MonkeyPatch) -> None:
+    served: list[tuple[str, Workspace]] = []
+    monkeypatch.setattr(generate_claude_docs, 'serve', lambda socket_path, ws: served.append((socket_path, ws)))
+
+    generate_claude_docs.main(['--root', f"{workspace.root}=Sample", 'serve', '--socket', 'docs.sock'])
+
+    [(socket_path, served_workspace)] = served
+    assert socket_path == 'docs.sock'
+    assert served_workspace.root == workspace.root
+    assert served_workspace.label == 'Sample'
+
+
+def test_serve_rejects_several_roots(workspace: Workspace, tmp_path: Path) -> None:
+    other = tmp_path / 'other'
+    other.mkdir()
+    with pytest.raises(SystemExit, match='serve'):
+        generate_claude_docs.main(['--root', str(workspace.root), '--root', str(other), 'serve'])
+
+
+def test_first_partial_refresh_writes_every_doc(workspace: Workspace) -> None:
+    regenerate_all(SectionCache(), workspace=workspace)
+    full_index = load_section_index(workspace)
+    full_stats = load_directory_stats(workspace)
+
+    # 시작 시 전체 갱신이 다른 실행에 합쳐져 건너뛴 상태에서 파일 하나가 바뀐 경우
+    state = WarmState(workspace)
+    written = state.refresh(['src/claude.md'], SectionCache())
+
+    assert written == []
+    assert state.warm
+    assert load_section_index(workspace) == full_index
+    assert load_directory_stats(workspace) == full_stats
+    assert state.changed() == []
+
+
+def test_warm_refresh_keeps_other_docs(workspace: Workspace) -> None:
+    cache = SectionCache()
+    state = WarmState(workspace)
+    state.refresh(sorted(workspace.docs), cache)
+    source = workspace.resolve('src/app.ts')
+    source.write_text(source.read_text(encoding='utf-8') + '// SECTION: Extra - 추가\n', encoding='utf-8')
+
+    assert state.changed() == ['src/claude.md']
+    assert state.refresh(state.changed(), cache) == ['src/claude.md']
+    assert set(load_section_index(workspace)) == {doc for doc in workspace.docs if doc != 'CLAUDE.md'}
@@ -0,0 +1,86 @@
+"""선형 시간 마커 파서가 user-049 이전 정규식과 같은 결과를 내는지 확인."""
+
+from __future__ import annotations
+
+from typing import Iterator, Optional
+
+import itertools
+import random
+import re
+
+import pytest
+
+from claude_docs.extraction import (
+    MARKDOWN_HEADING_PREFIX,
+    PY_SECTION_PREFIX,
+    SECTION_MARKER_MAX_CHARS,
+    SQL_SECTION_PREFIX,
+    TS_SECTION_PREFIX,
+    _extract_python_sections,
+    _split_block_marker_tail,
+    _split_heading_tail,
+    _split_marker_tail,
+)
+
+# SECTION: Reference Patterns - 선형 시간 파서로 바꾸기 전의 마커 정규식
+OLD_LINE_PATTERNS = {
+    '//': re.compile(r"^\s*//\s*SECTION:\s*(?P<title>[^-]+?)(?:\s*-\s*(?P<desc>.*))?\s*$"),
+    '#': re.compile(r"^\s*#\s*SECTION:\s*(?P<title>[^-]+?)(?:\s*-\s*(?P<desc>.*))?\s*$"),
+    '--': re.compile(r"^\s*--\s*SECTION:\s*(?P<title>[^-]+?)(?:\s*-\s*(?P<desc>.*))?\s*$"),
+}
+OLD_BLOCK_PATTERN = re.compile(r"^\s*/\*\s*SECTION:\s*(?P<title>[^-]+?)(?:\s*-\s*(?P<desc>.*?))?\s*\*/")
+OLD_HEADING_PATTERN = re.compile(r"^\s*##\s+(?P<title>.+?)\s*$")
+NEW_LINE_PREFIXES = {'//': TS_SECTION_PREFIX, '#': PY_SECTION_PREFIX, '--': SQL_SECTION_PREFIX}
+
+# 공백 묶음, 대시, 블록 닫기처럼 예전 정규식이 되돌아가며 다르게 잘라 내는 문자만 조합
+TAIL_ALPHABET = ' \t-a*/'
+EXHAUSTIVE_TAIL_LENGTH = 5
+RANDOM_TAILS = 2000
+
+
+# SECTION: Parity Tests - 짧은 꼬리 전수 조합과 무작위 꼬리로 예전 정규식과 결과 비교
+def _tails() -> Iterator[str]:
+    for length in range(EXHAUSTIVE_TAIL_LENGTH + 1):
+        for chars in itertools.product(TAIL_ALPHABET, repeat=length):
+            yield ''.join(chars)
+    rng = random.Random(49)
+    for _ in range(RANDOM_TAILS):
+        yield ''.join(rng.choice(TAIL_ALPHABET + 'bc') for _ in range(rng.randint(6, 40)))
+
+
+def _old_marker(pattern: re.Pattern[str], line: str) -> Optional[tuple[str, str]]:
+    match = pattern.match(line)
+    return None if match is None else (match['title'], (match['desc'] or '').strip())
+
+
+@pytest.mark.parametrize('marker', sorted(OLD_LINE_PATTERNS))
+def test_line_marker_tail_matches_old_pattern(marker: str) -> None:
+    for tail in _tails():
+        line = f"  {marker} SECTION:{tail}"
+        head = NEW_LINE_PREFIXES[marker].match(line)
+        assert head is not None and not head.groupdict().get('block')
+        assert _split_marker_tail(line[head.end():]) == _old_marker(OLD_LINE_PATTERNS[marker], line), repr(line)
+
+
+def test_block_marker_tail_matches_old_pattern() -> None:
+    for tail in _tails():
+        line = f"/* SECTION:{tail}"
+        head = TS_SECTION_PREFIX.match(line)
+        assert head is not None and head['block']
+        assert _split_block_marker_tail(line[head.end():]) == _old_marker(OLD_BLOCK_PATTERN, line), repr(line)
+
+
+def test_heading_tail_matches_old_pattern() -> None:
+    for tail in _tails():
+        line = f"##{tail}"
+        head = MARKDOWN_HEADING_PREFIX.match(line)
+        old = OLD_HEADING_PATTERN.match(line)
+        new = None if head is None else _split_heading_tail(line[head.end():])
+        assert new == (None if old is None else old['title']), repr(line)
+
+
+def test_marker_lines_over_length_limit_are_not_markers() -> None:
+    long_title = 'x' * SECTION_MARKER_MAX_CHARS
+    lines = [f"# SECTION: {long_title} - 너무 긴 줄", 'VALUE = 1']
+    # 마커로 인정되지 않으므로 대문자 상수 대체 규칙으로 나뉨
+    assert [section[:3] for section in _extract_python_sections(lines)] == [(2, 2, 'VALUE')]
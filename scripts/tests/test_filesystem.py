@@ -0,0 +1,107 @@
+"""MemoryFileSystem의 mtime·inode가 replace·덮어쓰기·삭제에서 디스크와 같은 규칙을 따르는지 확인."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import errno
+
+import pytest
+
+from claude_docs.fs import FileSystem, LocalFileSystem, MemoryFileSystem, _atomic_write_text
+
+
+@pytest.fixture(params=['disk', 'memory'])
+def backend(request: pytest.FixtureRequest) -> FileSystem:
+    return LocalFileSystem() if request.param == 'disk' else MemoryFileSystem()
+
+
+def _write(backend: FileSystem, path: Path, data: bytes) -> None:
+    with backend.open(path, 'wb') as handle:
+        handle.write(data)
+
+
+def test_rewrite_keeps_the_inode(backend: FileSystem, tmp_path: Path) -> None:
+    backend.mkdir(tmp_path)
+    path = tmp_path / 'doc.md'
+    _write(backend, path, b'one')
+    before = backend.stat(path)
+
+    _write(backend, path, b'three')
+
+    after = backend.stat(path)
+    assert after.st_ino == before.st_ino
+    assert after.st_size == 5
+    assert after.st_mtime_ns >= before.st_mtime_ns
+
+
+def test_replace_moves_the_source_stat_onto_the_target(backend: FileSystem, tmp_path: Path) -> None:
+    backend.mkdir(tmp_path / 'out')
+    target, source = tmp_path / 'out' / 'doc.md', tmp_path / 'out' / '.doc.md.tmp'
+    _write(backend, target, b'old')
+    _write(backend, source, b'new content')
+    old, new = backend.stat(target), backend.stat(source)
+
+    backend.replace(source, target)
+
+    replaced = backend.stat(target)
+    # rename은 원본의 inode와 mtime을 그대로 옮기고, 대상의 이전 inode는 사라짐
+    assert (replaced.st_ino, replaced.st_mtime_ns, replaced.st_size) == (new.st_ino, new.st_mtime_ns, 11)
+    assert replaced.st_ino != old.st_ino
+    assert not backend.exists(source)
+    assert backend.read_bytes(target) == b'new content'
+    assert sorted(item.name for item in backend.scandir(tmp_path / 'out')) == ['doc.md']
+
+
+def test_atomic_write_gives_a_fresh_inode(backend: FileSystem, tmp_path: Path) -> None:
+    path = tmp_path / 'state' / 'manifest.json'
+    _atomic_write_text(path, '{}\n', backend)
+    first = backend.stat(path)
+
+    _atomic_write_text(path, '{"a": 1}\n', backend)
+
+    assert backend.stat(path).st_ino != first.st_ino
+    assert backend.read_text(path) == '{"a": 1}\n'
+
+
+def test_replace_errors_match_the_disk(backend: FileSystem, tmp_path: Path) -> None:
+    backend.mkdir(tmp_path / 'dir')
+    _write(backend, tmp_path / 'file', b'x')
+    with pytest.raises(FileNotFoundError):
+        backend.replace(tmp_path / 'missing', tmp_path / 'other')
+    with pytest.raises(OSError) as raised:
+        backend.replace(tmp_path / 'file', tmp_path / 'dir')
+    assert raised.value.errno == errno.EISDIR
+    assert backend.read_bytes(tmp_path / 'file') == b'x'
+
+
+def test_memory_mtimes_advance_on_every_change(tmp_path: Path) -> None:
+    backend = MemoryFileSystem({tmp_path / 'a' / 'doc.md': 'one'})
+    directory, path = tmp_path / 'a', tmp_path / 'a' / 'doc.md'
+    stamps = [backend.stat(path).st_mtime_ns]
+
+    # 같은 나노초 안의 연속 쓰기도 mtime이 달라야 fingerprint 비교가 변경을 놓치지 않음
+    for text in ('two', 'three'):
+        backend.write_text(path, text)
+        stamps.append(backend.stat(path).st_mtime_ns)
+    assert stamps == sorted(set(stamps))
+
+    listed = backend.stat(directory).st_mtime_ns
+    backend.write_text(path, 'four')
+    assert backend.stat(directory).st_mtime_ns == listed
+    backend.write_text(directory / 'new.md', 'x')
+    created = backend.stat(directory).st_mtime_ns
+    assert created > listed
+    backend.replace(directory / 'new.md', path)
+    assert backend.stat(directory).st_mtime_ns > created
+
+
+def test_replace_across_directories_updates_both_parents(tmp_path: Path) -> None:
+    backend = MemoryFileSystem({tmp_path / 'src' / 'a.md': 'a', tmp_path / 'dst' / 'keep.md': 'k'})
+    source_dir, target_dir = backend.stat(tmp_path / 'src'), backend.stat(tmp_path / 'dst')
+
+    backend.replace(tmp_path / 'src' / 'a.md', tmp_path / 'dst' / 'a.md')
+
+    assert backend.stat(tmp_path / 'src').st_mtime_ns > source_dir.st_mtime_ns
+    assert backend.stat(tmp_path / 'dst').st_mtime_ns > target_dir.st_mtime_ns
+    assert backend.stat(tmp_path / 'src').st_ino == source_dir.st_ino
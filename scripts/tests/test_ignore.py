@@ -0,0 +1,85 @@
+""".gitignore 패턴 컴파일과 중첩 .gitignore 우선순위."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from claude_docs.fs import MemoryFileSystem, using_filesystem
+from claude_docs.ignore import GitignorePatterns, ignore_rules_for
+
+ROOT_GITIGNORE = """\
+# 주석과 빈 줄은 무시
+
+*.log
+!keep.log
+build/
+/top-only.txt
+docs/**/draft.md
+cache[0-9]
+\\#literal
+trailing-space\\ 
+"""
+
+
+@pytest.mark.parametrize(
+    ('relative', 'is_dir', 'ignored'),
+    [
+        ('debug.log', False, True),
+        ('nested/deep/debug.log', False, True),
+        ('keep.log', False, False),
+        ('nested/keep.log', False, False),
+        ('build', True, True),
+        ('build', False, None),
+        ('src/build', True, True),
+        ('build/out.js', False, True),
+        ('top-only.txt', False, True),
+        ('src/top-only.txt', False, None),
+        ('docs/draft.md', False, True),
+        ('docs/a/b/draft.md', False, True),
+        ('other/draft.md', False, None),
+        ('cache7', False, True),
+        ('cachex', False, None),
+        ('#literal', False, True),
+        ('trailing-space ', False, True),
+        ('readme.md', False, None),
+    ],
+)
+def test_root_patterns(relative: str, is_dir: bool, ignored: bool | None) -> None:
+    patterns = GitignorePatterns.compile('/repo/', ROOT_GITIGNORE.splitlines())
+    assert patterns.match(relative, is_dir) is ignored
+
+
+def test_nested_gitignore_overrides_parent() -> None:
+    backend = MemoryFileSystem({
+        '/repo/.git/HEAD': 'ref: refs/heads/main\n',
+        '/repo/.git/info/exclude': 'secret.txt\n',
+        '/repo/.gitignore': '*.log\ngenerated/\n',
+        '/repo/pkg/.gitignore': '!important.log\n*.tmp\n',
+        '/repo/pkg/module.py': '',
+    })
+    with using_filesystem(backend):
+        root_rules = ignore_rules_for('/repo')
+        package_rules = ignore_rules_for(Path('/repo/pkg'))
+
+    assert root_rules.ignores('/repo/app.log', False)
+    assert root_rules.ignores('/repo/secret.txt', False)
+    assert root_rules.ignores('/repo/generated', True)
+    assert not root_rules.ignores('/repo/pkg/scratch.tmp', False)
+
+    assert package_rules.ignores('/repo/pkg/app.log', False)
+    assert not package_rules.ignores('/repo/pkg/important.log', False)
+    assert package_rules.ignores('/repo/pkg/scratch.tmp', False)
+    assert package_rules.ignores('/repo/pkg/secret.txt', False)
+    assert not package_rules.ignores('/repo/pkg/module.py', False)
+
+
+def test_edited_gitignore_is_recompiled() -> None:
+    backend = MemoryFileSystem({'/repo/.git/HEAD': '', '/repo/.gitignore': '*.log\n'})
+    with using_filesystem(backend):
+        assert ignore_rules_for('/repo').ignores('/repo/app.log', False)
+        backend.write_text('/repo/.gitignore', '*.tmp\n')
+        rules = ignore_rules_for('/repo')
+    assert not rules.ignores('/repo/app.log', False)
+    assert rules.ignores('/repo/app.tmp', False)
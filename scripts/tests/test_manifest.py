@@ -0,0 +1,92 @@
+"""매니페스트 기반 --check가 렌더링 없이 오래된 문서를 찾는지 확인."""
+
+from __future__ import annotations
+
+import os
+
+import pytest
+
+from claude_docs.cache import SectionCache
+from claude_docs.manifest import MANIFEST_PATH, check_outputs, find_stale_outputs
+from claude_docs.model import GENERATOR_PACKAGE_RELATIVE_PATH, Workspace
+from claude_docs.pipeline import regenerate_all
+
+
+@pytest.fixture
+def generated(workspace: Workspace) -> Workspace:
+    regenerate_all(SectionCache(), workspace=workspace)
+    return workspace
+
+
+def test_fresh_outputs_pass_check(generated: Workspace, capsys: pytest.CaptureFixture[str]) -> None:
+    assert find_stale_outputs(generated) == []
+    assert check_outputs([generated]) == 0
+    assert '최신 상태' in capsys.readouterr().out
+
+
+def test_missing_manifest_marks_every_doc(workspace: Workspace) -> None:
+    assert find_stale_outputs(workspace) == [(doc, 'manifest missing') for doc in sorted(workspace.docs)]
+
+
+def test_edited_input_marks_only_its_doc(generated: Workspace, capsys: pytest.CaptureFixture[str]) -> None:
+    source = generated.resolve('src/app.ts')
+    source.write_text(source.read_text(encoding='utf-8') + 'export const extra = 2;\n', encoding='utf-8')
+
+    assert find_stale_outputs(generated) == [('src/claude.md', 'input changed: src/app.ts')]
+    assert check_outputs([generated]) == 1
+    assert '- src/claude.md (input changed: src/app.ts)' in capsys.readouterr().out
+
+
+def test_touched_input_with_same_content_stays_fresh(generated: Workspace) -> None:
+    source = generated.resolve('src/app.ts')
+    stat = source.stat()
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert find_stale_outputs(generated) == []
+
+
+def test_added_file_marks_doc_but_ignored_file_does_not(generated: Workspace) -> None:
+    generated.resolve('src/trace.log').write_text('ignored by .gitignore\n', encoding='utf-8')
+    assert find_stale_outputs(generated) == []
+
+    generated.resolve('src/lib/extra.ts').write_text('export const extra = 1;\n', encoding='utf-8')
+    assert find_stale_outputs(generated) == [('src/lib/claude.md', 'files added or removed')]
+
+
+def test_hand_edited_output_is_stale(generated: Workspace) -> None:
+    output = generated.resolve('docs/claude.md')
+    output.write_text(output.read_text(encoding='utf-8') + '\n손으로 고친 줄\n', encoding='utf-8')
+    assert find_stale_outputs(generated) == [('docs/claude.md', 'output changed')]
+
+
+def test_generator_change_marks_every_doc(generated: Workspace) -> None:
+    module = generated.resolve(GENERATOR_PACKAGE_RELATIVE_PATH / 'render.py')
+    module.write_text(module.read_text(encoding='utf-8') + '\n# 변경\n', encoding='utf-8')
+    assert find_stale_outputs(generated) == [(doc, 'generator changed') for doc in sorted(generated.docs)]
+
+
+def test_regenerating_clears_stale_outputs(generated: Workspace) -> None:
+    schema = generated.resolve('sql/schema.sql')
+    schema.write_text('-- SECTION: Views - 뷰\nCREATE VIEW v AS SELECT 1;\n', encoding='utf-8')
+    assert find_stale_outputs(generated) != []
+    regenerate_all(SectionCache(), workspace=generated)
+    assert find_stale_outputs(generated) == []
+    assert generated.resolve(MANIFEST_PATH).is_file()
+
+
+def test_check_without_manifest_compares_rendered_content(
+    generated: Workspace, capsys: pytest.CaptureFixture[str]
+) -> None:
+    # 상태 디렉터리를 추적하지 않는 새 clone(CI)과 같은 상황
+    generated.resolve(MANIFEST_PATH).unlink()
+    assert check_outputs([generated]) == 0
+    assert '최신 상태' in capsys.readouterr().out
+
+    source = generated.resolve('src/app.ts')
+    source.write_text(source.read_text(encoding='utf-8') + '// SECTION: Extra - 추가\n', encoding='utf-8')
+    generated.resolve('docs/claude.md').unlink()
+    assert check_outputs([generated]) == 1
+    out = capsys.readouterr().out
+    assert '- src/claude.md (output differs)' in out
+    assert '- docs/claude.md (output missing)' in out
+    assert 'src/lib/claude.md' not in out
+    assert not generated.resolve(MANIFEST_PATH).exists()
@@ -0,0 +1,73 @@
+"""--memprofile의 단계별 최대·잔류 메모리, 중첩 구간, 파일·문서 순위, JSON 출력 확인."""
+
+from __future__ import annotations
+
+import json
+import tracemalloc
+from pathlib import Path
+
+from claude_docs.cache import SectionCache
+from claude_docs.model import Workspace
+from claude_docs.pipeline import RunStats, regenerate_all
+from claude_docs.profiling import MEMPROFILE_VERSION, MemoryProfiler, memory_profiling, memory_span
+
+MIB = 1024 * 1024
+
+
+def test_nested_spans_fold_into_their_phase() -> None:
+    profiler = MemoryProfiler()
+    with memory_profiling(profiler):
+        with memory_span('phase', 'work'):
+            kept = bytearray(MIB // 4)
+            with memory_span('doc', 'big.md'):
+                scratch = bytearray(MIB)
+                del scratch
+            with memory_span('doc', 'small.md'):
+                scratch = bytearray(MIB // 16)
+                del scratch
+    assert not tracemalloc.is_tracing()
+
+    spans = profiler.spans['doc']
+    assert MIB <= spans['big.md'] < MIB + MIB // 8
+    assert MIB // 16 <= spans['small.md'] < MIB // 8
+    phase = profiler.phases['work']
+    # 안쪽 구간의 최대치가 바깥 단계에 합쳐지고, 끝난 뒤 남은 것은 kept뿐
+    assert phase['peak_bytes'] >= MIB + MIB // 4
+    assert MIB // 4 <= phase['retained_bytes'] < MIB // 4 + MIB // 8
+    assert profiler.peak >= phase['peak_total_bytes'] >= phase['peak_bytes']
+    assert [item['path'] for item in profiler.to_json()['docs']] == ['big.md', 'small.md']
+    del kept
+
+
+def test_repeated_phases_accumulate() -> None:
+    profiler = MemoryProfiler()
+    with memory_profiling(profiler):
+        for _ in range(3):
+            with memory_span('phase', 'loop'):
+                pass
+    assert profiler.phases['loop']['count'] == 3
+
+
+def test_spans_are_free_without_a_profiler() -> None:
+    with memory_span('phase', 'work'):
+        assert not tracemalloc.is_tracing()
+
+
+def test_profiled_run_reports_phases_files_and_sites(workspace: Workspace, tmp_path: Path) -> None:
+    profiler = MemoryProfiler(top=2)
+    with memory_profiling(profiler):
+        regenerate_all(SectionCache(), stats=RunStats(), workspace=workspace)
+    output = tmp_path / 'memprofile.json'
+    profiler.write(output)
+
+    report = json.loads(output.read_text(encoding='utf-8'))
+    assert report['version'] == MEMPROFILE_VERSION
+    assert {'docs', 'root', 'manifest', 'section_index', 'stats', 'offsets', 'references'} <= set(report['phases'])
+    assert len(report['files']) == 2 and len(report['docs']) == 2
+    assert all(item['path'].startswith(workspace.root.as_posix()) for item in report['files'])
+    for phase in report['phases'].values():
+        assert len(phase['top_sites']) <= 2
+        assert all(site['site'].startswith('scripts/claude_docs/') for site in phase['top_sites'])
+    lines = profiler.summary_lines()
+    assert lines[0].split() == ['phase', 'peak', 'KiB', 'retained', 'KiB']
+    assert any(line.startswith('docs ') for line in lines)
@@ -0,0 +1,97 @@
+"""섹션 바이트 범위(offsets.json)와 slice 부분 읽기가 추출기의 줄 범위와 일치하는지 확인."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+import generate_claude_docs
+from claude_docs import offsets
+from claude_docs.cache import SectionCache
+from claude_docs.extraction import extract_sections
+from claude_docs.fs import MemoryFileSystem, using_filesystem
+from claude_docs.model import Workspace
+from claude_docs.offsets import load_offset_index, read_byte_range, read_section, section_byte_ranges
+from claude_docs.pipeline import regenerate_all
+
+MIXED_SOURCES = {
+    # 한글(멀티바이트)과 CRLF 줄 끝이 섞인 파일
+    'src/mixed.ts': '// SECTION: 첫째 - 한글 제목\r\nconst a = "가나다";\r\n// SECTION: Second - 둘째\r\nconst b = 2;\r\n',
+    'sql/legacy.sql': '-- SECTION: Old - 구식 줄 끝\rSELECT 1;\r-- SECTION: New - 새 줄 끝\nSELECT 2;\n',
+}
+
+
+def _expected_slice(path: Path, start_line: int, end_line: int) -> bytes:
+    data = path.read_bytes()
+    lines = data.splitlines(keepends=True) if path.suffix == '.sql' else [
+        line.encode('utf-8') for line in data.decode('utf-8').splitlines(keepends=True)
+    ]
+    return b''.join(lines[start_line - 1:end_line])
+
+
+@pytest.fixture
+def generated(workspace: Workspace) -> Workspace:
+    for relative, text in MIXED_SOURCES.items():
+        workspace.resolve(relative).write_bytes(text.encode('utf-8'))
+    regenerate_all(SectionCache(), workspace=workspace)
+    return workspace
+
+
+@pytest.mark.parametrize('relative', ['src/app.ts', 'src/util.py', 'sql/schema.sql', *MIXED_SOURCES])
+def test_every_section_slice_matches_its_lines(generated: Workspace, relative: str) -> None:
+    path = generated.resolve(relative)
+    sections = extract_sections(path)
+    assert sections
+
+    for position, (start_line, end_line, title, _) in enumerate(sections, start=1):
+        expected = _expected_slice(path, start_line, end_line)
+        assert read_section(relative, str(position), generated) == expected
+        assert read_section(relative, title, generated) == expected
+
+
+def test_ranges_tile_the_file_from_the_first_section(generated: Workspace) -> None:
+    path = generated.resolve('src/mixed.ts')
+    ranges = section_byte_ranges(path, extract_sections(path))
+    assert ranges[0][0] == 0
+    assert ranges[0][0] + ranges[0][1] == ranges[1][0]
+    assert ranges[-1][0] + ranges[-1][1] == path.stat().st_size
+
+
+def test_slice_uses_the_recorded_offsets(generated: Workspace, monkeypatch: pytest.MonkeyPatch) -> None:
+    assert 'src/mixed.ts' in load_offset_index(generated)
+    monkeypatch.setattr(offsets, 'extract_sections', lambda path: pytest.fail('re-extracted a fresh file'))
+    assert read_section('src/mixed.ts', 'Second', generated) == '// SECTION: Second - 둘째\r\nconst b = 2;\r\n'.encode()
+
+
+def test_stale_record_is_recomputed(generated: Workspace) -> None:
+    path = generated.resolve('src/app.ts')
+    path.write_text('// SECTION: Banner - 머리말\n// 추가된 줄\n' + path.read_text(encoding='utf-8'), encoding='utf-8')
+
+    assert read_section('src/app.ts', 'App', generated) == _expected_slice(path, 3, 5)
+
+
+def test_selector_errors(generated: Workspace) -> None:
+    with pytest.raises(LookupError, match='out of range'):
+        read_section('src/app.ts', '3', generated)
+    with pytest.raises(LookupError, match='no section'):
+        read_section('src/app.ts', 'Missing', generated)
+    with pytest.raises(LookupError, match='matches 2 sections'):
+        read_section('src/app.ts', 'p', generated)
+
+
+def test_slice_command_writes_the_raw_bytes(generated: Workspace, capsysbinary: pytest.CaptureFixture[bytes]) -> None:
+    generate_claude_docs.main(['--root', str(generated.root), 'slice', 'src/mixed.ts', '첫째'])
+    assert capsysbinary.readouterr().out == '// SECTION: 첫째 - 한글 제목\r\nconst a = "가나다";\r\n'.encode()
+
+
+def test_memory_backend_reads_by_seek(tmp_path: Path) -> None:
+    backend = MemoryFileSystem()
+    path = tmp_path / 'data.bin'
+    backend.mkdir(tmp_path)
+    with using_filesystem(backend):
+        with backend.open(path, 'wb') as handle:
+            handle.write(b'0123456789')
+        assert read_byte_range(path, 3, 4) == b'3456'
+        assert read_byte_range(path, 8, 10) == b'89'
+        assert read_byte_range(path, 2, 0) == b''
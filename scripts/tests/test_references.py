@@ -0,0 +1,91 @@
+"""문서 간 참조 그래프, 끊어진 참조 보고, 역참조 인덱스(references.json) 확인."""
+
+from __future__ import annotations
+
+import io
+import json
+from dataclasses import replace
+
+import pytest
+
+from claude_docs import references
+from claude_docs.model import Workspace
+from claude_docs.references import (
+    REFERENCE_INDEX_PATH,
+    build_reference_graph,
+    entry_references,
+    load_referrers,
+    report_dangling_references,
+    update_reference_graph,
+)
+
+
+@pytest.fixture
+def linked(workspace: Workspace) -> Workspace:
+    docs = workspace.docs
+    docs['src/claude.md'] = replace(
+        docs['src/claude.md'],
+        structure=['lib/: 공용 유틸 (→ src/lib/claude.md)', '요청 흐름: 입력 → 검증 → 저장'],
+        references=['src/app.ts', 'docs/claude.md', 'src/missing.ts'],
+    )
+    # 파일은 있지만 레지스트리에 없는 claude.md는 생성되지 않으므로 끊어진 참조
+    workspace.resolve('build/claude.md').write_text('# stray\n', encoding='utf-8')
+    docs['docs/claude.md'] = replace(docs['docs/claude.md'], references=['src/claude.md', 'build/claude.md'])
+    return workspace
+
+
+def test_entry_references_collects_structure_links(linked: Workspace) -> None:
+    assert entry_references(linked.docs['src/claude.md']) == [
+        'src/app.ts', 'docs/claude.md', 'src/missing.ts', 'src/lib/claude.md',
+    ]
+
+
+def test_graph_reports_dangling_targets_and_referrers(linked: Workspace) -> None:
+    graph = build_reference_graph(linked)
+
+    assert graph.dangling() == {'docs/claude.md': ['build/claude.md'], 'src/claude.md': ['src/missing.ts']}
+    assert graph.referrers('src/app.ts') == ['src/claude.md']
+    assert graph.referrers('src/claude.md') == ['docs/claude.md']
+    assert graph.referrers('sql/schema.sql') == []
+
+
+def test_dangling_report_lists_each_edge(linked: Workspace) -> None:
+    stream = io.StringIO()
+    assert report_dangling_references(build_reference_graph(linked), stream) == 2
+    assert stream.getvalue().splitlines() == [
+        '경고: 끊어진 참조 2개', '- docs/claude.md → build/claude.md', '- src/claude.md → src/missing.ts',
+    ]
+    assert report_dangling_references(build_reference_graph(Workspace(root=linked.root, docs={})), io.StringIO()) == 0
+
+
+def test_index_is_reused_until_a_target_changes(linked: Workspace, monkeypatch: pytest.MonkeyPatch) -> None:
+    update_reference_graph(linked)
+    stored = json.loads(linked.resolve(REFERENCE_INDEX_PATH).read_text(encoding='utf-8'))
+    assert stored['reverse']['src/app.ts'] == ['src/claude.md']
+    assert stored['dangling'] == {'docs/claude.md': ['build/claude.md'], 'src/claude.md': ['src/missing.ts']}
+
+    writes = []
+    record = references.record_reference_graph
+    monkeypatch.setattr(references, 'record_reference_graph', lambda graph, ws: (writes.append(1), record(graph, ws)))
+    monkeypatch.setattr(references, 'entry_references', lambda entry: pytest.fail('re-parsed an unchanged registry'))
+    update_reference_graph(linked)
+    assert writes == []
+
+    linked.resolve('src/missing.ts').write_text('export {};\n', encoding='utf-8')
+    graph = update_reference_graph(linked)
+    assert writes == [1]
+    assert graph.dangling() == {'docs/claude.md': ['build/claude.md']}
+
+
+def test_registry_change_rebuilds_the_edges(linked: Workspace) -> None:
+    update_reference_graph(linked)
+    linked.docs['sql/claude.md'] = replace(linked.docs['sql/claude.md'], references=['src/app.ts'])
+
+    update_reference_graph(linked)
+
+    assert load_referrers('src/app.ts', linked) == ['sql/claude.md', 'src/claude.md']
+
+
+def test_referrers_without_an_index_build_the_graph(linked: Workspace) -> None:
+    assert not linked.resolve(REFERENCE_INDEX_PATH).exists()
+    assert load_referrers('./src/app.ts', linked) == ['src/claude.md']
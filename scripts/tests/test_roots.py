@@ -0,0 +1,28 @@
+"""--root 지정의 기본 이름과 루트 하나만 받는 명령 확인."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+import generate_claude_docs
+from claude_docs.model import Workspace, parse_root_spec
+
+
+def test_root_label_defaults_to_the_directory_name(workspace: Workspace) -> None:
+    assert parse_root_spec(str(workspace.root)).label == workspace.root.name
+    assert parse_root_spec(f"{workspace.root}=Sample").label == 'Sample'
+
+
+def test_root_must_be_a_directory(tmp_path: Path) -> None:
+    with pytest.raises(SystemExit, match='디렉터리가 아닙니다'):
+        parse_root_spec(str(tmp_path / 'missing'))
+
+
+@pytest.mark.parametrize('command', [['refs', 'src/app.ts'], ['slice', 'src/claude.md', 'App']])
+def test_single_root_commands_reject_several_roots(workspace: Workspace, tmp_path: Path, command: list[str]) -> None:
+    other = tmp_path / 'other'
+    other.mkdir()
+    with pytest.raises(SystemExit, match=f"{command[0]}: --root는 하나만"):
+        generate_claude_docs.main(['--root', str(workspace.root), '--root', str(other), *command])
@@ -0,0 +1,68 @@
+"""추출 배치 스케줄러(schedule_batches)의 순서, 하한, 빠짐없는 배분 확인."""
+
+from __future__ import annotations
+
+import pytest
+
+from claude_docs.cache import SectionCache
+from claude_docs.pipeline import MIN_BATCH_DIVISOR, WorkerPool, prefetch_sections, schedule_batches, worker_pool
+
+
+def _flatten(batches: list[list[int]]) -> list[int]:
+    return [index for batch in batches for index in batch]
+
+
+@pytest.mark.parametrize('workers', [1, 2, 4, 8])
+def test_every_index_is_scheduled_exactly_once(workers: int) -> None:
+    costs = [float((index * 37) % 11 + 1) for index in range(200)]
+    assert sorted(_flatten(schedule_batches(costs, workers))) == list(range(len(costs)))
+
+
+def test_batches_are_dispatched_longest_first() -> None:
+    costs = [1.0, 50.0, 3.0, 50.0, 20.0, 2.0, 8.0]
+    order = _flatten(schedule_batches(costs, 2))
+    assert [costs[index] for index in order] == sorted(costs, reverse=True)
+    # 비용이 같으면 인덱스 순서를 유지
+    assert order[:2] == [1, 3]
+
+
+def test_expensive_files_go_out_alone_and_batches_shrink() -> None:
+    costs = [100.0] + [1.0] * 100
+    batches = schedule_batches(costs, 4)
+    assert batches[0] == [0]
+    sizes = [sum(costs[index] for index in batch) for batch in batches[1:-1]]
+    assert sizes == sorted(sizes, reverse=True)
+
+
+def test_batches_never_drop_below_the_floor() -> None:
+    costs = [1.0] * 1000
+    workers = 4
+    batches = schedule_batches(costs, workers)
+    floor = sum(costs) / (workers * MIN_BATCH_DIVISOR)
+    # 다음 파일을 더하면 하한을 넘을 때만 배치를 끊음(마지막 배치는 남은 파일만큼)
+    for batch, following in zip(batches, batches[1:]):
+        assert sum(costs[index] for index in batch) + costs[following[0]] > floor
+    assert len(batches) <= workers * MIN_BATCH_DIVISOR * 2
+
+
+def test_empty_and_degenerate_inputs() -> None:
+    assert schedule_batches([], 4) == []
+    assert schedule_batches([5.0], 0) == [[0]]
+
+
+def test_worker_pool_reports_its_size() -> None:
+    with worker_pool(1) as pool:
+        assert pool is None
+    with worker_pool(2) as pool:
+        assert isinstance(pool, WorkerPool)
+        assert pool.workers == 2
+
+
+def test_prefetch_extracts_every_file_through_the_pool(workspace) -> None:
+    files = sorted((workspace.root / 'src').glob('*.ts')) + sorted((workspace.root / 'src' / 'lib').glob('*.ts'))
+    cache = SectionCache()
+    costs: dict[str, float] = {}
+    with worker_pool(2) as pool:
+        assert prefetch_sections(cache, files, pool, costs) == len(files)
+    assert set(costs) == {file.as_posix() for file in files}
+    assert cache.pending(files) == []
@@ -0,0 +1,66 @@
+"""실행 간 섹션 구조 diff(section-diff.json, --diff-report) 확인."""
+
+from __future__ import annotations
+
+import json
+
+from claude_docs.cache import SectionCache
+from claude_docs.indexes import SECTION_DIFF_PATH, diff_file_sections, format_section_diff
+from claude_docs.model import Workspace
+from claude_docs.pipeline import regenerate_all
+
+
+def test_renamed_section_is_paired_by_position() -> None:
+    old = [(1, 3, 'App', '진입점'), (4, 5, 'Helpers', '보조 함수')]
+    new = [(1, 3, 'Main', '진입점'), (4, 5, 'Helpers', '보조 함수')]
+
+    report = diff_file_sections(old, new)
+
+    assert report == {
+        'added': [], 'removed': [], 'renamed': [{'from': 'App', 'to': 'Main', 'range': [1, 3]}],
+        'shifted': [], 'unchanged': 1,
+    }
+
+
+def test_added_removed_and_shifted_sections() -> None:
+    old = [(1, 3, 'App', ''), (4, 5, 'Helpers', ''), (6, 8, 'Legacy', '')]
+    new = [(1, 2, 'Intro', ''), (3, 5, 'App', ''), (6, 7, 'Helpers', '')]
+
+    report = diff_file_sections(old, new)
+
+    assert report['added'] == ['Intro']
+    assert report['removed'] == ['Legacy']
+    assert report['renamed'] == []
+    assert [item['title'] for item in report['shifted']] == ['App', 'Helpers']
+    assert report['shifted'][0] == {'title': 'App', 'from': [1, 3], 'to': [3, 5]}
+
+
+def test_format_lists_each_change() -> None:
+    reports = {
+        'src/app.ts': {
+            'doc': 'src/claude.md', 'added': ['Extra'], 'removed': [], 'shifted': [],
+            'renamed': [{'from': 'App', 'to': 'Main', 'range': [1, 3]}],
+        },
+    }
+    assert format_section_diff(reports) == ['src/app.ts (src/claude.md): + 1 ~ 1', '  + Extra', '  ~ App → Main']
+    assert format_section_diff({}) == ['섹션 구조 변경 없음']
+
+
+def test_renamed_section_reaches_the_stored_diff(workspace: Workspace) -> None:
+    regenerate_all(SectionCache(), workspace=workspace)
+    source = workspace.resolve('src/app.ts')
+    source.write_text(source.read_text(encoding='utf-8').replace('SECTION: App -', 'SECTION: Main -'), encoding='utf-8')
+
+    assert regenerate_all(SectionCache(), workspace=workspace) == ['src/claude.md']
+
+    stored = json.loads(workspace.resolve(SECTION_DIFF_PATH).read_text(encoding='utf-8'))
+    assert list(stored) == ['src/app.ts']
+    assert stored['src/app.ts']['renamed'] == [{'from': 'App', 'to': 'Main', 'range': [1, 3]}]
+    # --diff-report는 저장된 diff를 그대로 형식화해 출력
+    assert format_section_diff(stored) == ['src/app.ts (src/claude.md): ~ 1', '  ~ App → Main']
+
+
+def test_unchanged_rerun_reports_no_changes(workspace: Workspace) -> None:
+    regenerate_all(SectionCache(), workspace=workspace)
+    assert regenerate_all(SectionCache(), workspace=workspace) == []
+    assert json.loads(workspace.resolve(SECTION_DIFF_PATH).read_text(encoding='utf-8')) == {}
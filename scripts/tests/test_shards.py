@@ -0,0 +1,77 @@
+"""--shard i/N 실행과 merge가 한 번의 전체 생성과 같은 결과를 내는지 확인."""
+
+from __future__ import annotations
+
+from dataclasses import replace
+
+import shutil
+
+import pytest
+
+from claude_docs.cache import SectionCache
+from claude_docs.manifest import find_stale_outputs
+from claude_docs.model import STATE_DIR, Workspace
+from claude_docs.pipeline import regenerate_all
+from claude_docs.shards import SHARD_DIR, merge_shards, regenerate_shard
+
+# 루트 경로나 실행 시각이 들어가지 않아 두 작업 트리 사이에서 그대로 비교할 수 있는 상태 파일
+COMPARABLE_STATE = ('sections.json', 'references.json', 'offsets.json')
+
+
+def _outputs(workspace: Workspace) -> dict[str, str]:
+    return {
+        path.relative_to(workspace.root).as_posix(): path.read_text(encoding='utf-8')
+        for path in sorted(workspace.root.rglob('*'))
+        if path.name in ('claude.md', 'CLAUDE.md')
+        or (path.parent.name == STATE_DIR.name and path.name in COMPARABLE_STATE)
+    }
+
+
+def _copy(workspace: Workspace, name: str) -> Workspace:
+    root = workspace.root.parent / name
+    shutil.copytree(workspace.root, root)
+    return replace(workspace, root=root)
+
+
+def _run_shards(workspace: Workspace, count: int) -> None:
+    for index in range(1, count + 1):
+        regenerate_shard(index, count, SectionCache(), workspace=workspace)
+
+
+@pytest.mark.parametrize('weight', ['bytes', 'files'])
+@pytest.mark.parametrize('count', [1, 2, 3])
+def test_sharded_run_matches_full_run(workspace: Workspace, count: int, weight: str) -> None:
+    sharded = _copy(workspace, f"sharded-{count}-{weight}")
+    regenerate_all(SectionCache(), workspace=workspace)
+    for index in range(1, count + 1):
+        regenerate_shard(index, count, SectionCache(), workspace=sharded, weight=weight)
+    merge_shards(SectionCache(), workspace=sharded, count=count)
+
+    assert _outputs(sharded) == _outputs(workspace)
+    assert find_stale_outputs(sharded) == []
+
+
+def test_merge_removes_merged_shards_and_ignores_other_counts(workspace: Workspace) -> None:
+    shard_dir = workspace.resolve(SHARD_DIR)
+    regenerate_shard(1, 3, SectionCache(), workspace=workspace)
+    _run_shards(workspace, 2)
+
+    with pytest.raises(SystemExit, match='merge --shards N'):
+        merge_shards(SectionCache(), workspace=workspace)
+    merge_shards(SectionCache(), workspace=workspace, count=2)
+
+    assert sorted(path.name for path in shard_dir.iterdir()) == ['1-of-3.json']
+    assert find_stale_outputs(workspace) == []
+
+
+def test_merge_reports_missing_shards(workspace: Workspace) -> None:
+    regenerate_shard(2, 3, SectionCache(), workspace=workspace)
+    with pytest.raises(SystemExit, match='1/3, 3/3'):
+        merge_shards(SectionCache(), workspace=workspace)
+    assert (workspace.resolve(SHARD_DIR) / '2-of-3.json').exists()
+
+
+def test_merge_without_shards_fails(workspace: Workspace) -> None:
+    with pytest.raises(SystemExit):
+        merge_shards(SectionCache(), workspace=workspace, count=2)
+    assert not workspace.resolve(SHARD_DIR).exists()
@@ -0,0 +1,61 @@
+"""supabase 마이그레이션용 SQL 섹션 추출."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from claude_docs.extraction import _extract_sql_sections, estimate_tokens, extract_sized_sections
+
+MIGRATION = """\
+-- =====================================
+-- 프로젝트 테이블
+-- 사용자별 프로젝트 목록
+CREATE TABLE IF NOT EXISTS public.projects (
+  id uuid primary key
+);
+
+-- 소유자 조회 함수
+create or replace function public.project_owner(project uuid)
+returns uuid language sql as $$ select null::uuid $$;
+
+-- 본인 프로젝트만 조회
+CREATE POLICY "owner can read" ON public.projects FOR SELECT USING (true);
+CREATE UNIQUE INDEX CONCURRENTLY projects_owner_idx ON public.projects (id);
+
+-- 수정 시각 갱신
+-- -------------------------------------
+CREATE TRIGGER set_updated_at BEFORE UPDATE ON public.projects
+  FOR EACH ROW EXECUTE FUNCTION public.touch();
+"""
+
+
+def test_statements_take_their_preceding_comment_block() -> None:
+    assert _extract_sql_sections(MIGRATION.splitlines()) == [
+        (4, 8, 'TABLE public.projects', '프로젝트 테이블 사용자별 프로젝트 목록'),
+        (9, 12, 'FUNCTION public.project_owner', '소유자 조회 함수'),
+        (13, 13, 'POLICY "owner can read"', '본인 프로젝트만 조회'),
+        (14, 17, 'INDEX projects_owner_idx', ''),
+        (18, 19, 'TRIGGER set_updated_at', '수정 시각 갱신'),
+    ]
+
+
+def test_section_markers_override_statements() -> None:
+    lines = ['-- SECTION: Schema - 테이블 정의', *MIGRATION.splitlines()[:7], '-- SECTION: Access - 권한과 트리거']
+    lines += MIGRATION.splitlines()[7:]
+    assert _extract_sql_sections(lines) == [
+        (1, 8, 'Schema', '테이블 정의'),
+        (9, 21, 'Access', '권한과 트리거'),
+    ]
+
+
+def test_sized_sections_measure_each_range(tmp_path: Path) -> None:
+    path = tmp_path / '20240101000000_init.sql'
+    path.write_text(MIGRATION, encoding='utf-8')
+    sections, sizes, line_count = extract_sized_sections(path, estimate_tokens)
+
+    lines = MIGRATION.splitlines()
+    assert line_count == len(lines) == 19
+    assert sections == _extract_sql_sections(lines)
+    for (start, end, _, _), (chars, tokens) in zip(sections, sizes):
+        text = '\n'.join(lines[start - 1:end]) + '\n'
+        assert (chars, tokens) == (len(text), estimate_tokens(text))
@@ -0,0 +1,80 @@
+"""--stream 실행이 일반 실행과 같은 문서·통계를 쓰고 문서별 상태를 남기지 않는지 확인."""
+
+from __future__ import annotations
+
+import pytest
+
+import generate_claude_docs
+from claude_docs import filemap
+from claude_docs.cache import SectionCache
+from claude_docs.indexes import SECTION_INDEX_PATH, load_directory_stats
+from claude_docs.manifest import MANIFEST_PATH, check_outputs
+from claude_docs.model import STATE_DIR, Entry, Workspace
+from claude_docs.offsets import OFFSET_INDEX_PATH, read_section
+from claude_docs.pipeline import regenerate_all
+
+
+def _outputs(workspace: Workspace) -> dict[str, bytes]:
+    return {doc: workspace.resolve(doc).read_bytes() for doc in workspace.docs}
+
+
+def test_streamed_run_matches_a_normal_run(workspace: Workspace) -> None:
+    regenerate_all(SectionCache(), workspace=workspace)
+    expected, expected_stats = _outputs(workspace), load_directory_stats(workspace)
+    for doc in workspace.docs:
+        if doc != 'CLAUDE.md':
+            workspace.resolve(doc).unlink()
+
+    written = regenerate_all(SectionCache(retain=False), stream=True, workspace=workspace)
+
+    assert written == sorted(doc for doc in workspace.docs if doc != 'CLAUDE.md')
+    assert _outputs(workspace) == expected
+    assert load_directory_stats(workspace) == expected_stats
+
+
+def test_streamed_run_drops_per_file_state(workspace: Workspace, capsys: pytest.CaptureFixture[str]) -> None:
+    regenerate_all(SectionCache(), workspace=workspace)
+    regenerate_all(SectionCache(retain=False), stream=True, workspace=workspace)
+
+    for state_path in (MANIFEST_PATH, SECTION_INDEX_PATH, OFFSET_INDEX_PATH):
+        assert not workspace.resolve(state_path).exists()
+    # 매니페스트가 없으면 --check는 렌더링한 내용으로 비교하고, slice는 필요할 때 추출
+    assert check_outputs([workspace]) == 0
+    assert read_section('src/app.ts', 'Helpers', workspace).startswith(b'// SECTION: Helpers')
+
+
+def test_names_sorted_in_spilled_runs_keep_the_listing_order(
+    workspace: Workspace, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    directory = workspace.resolve('many')
+    directory.mkdir()
+    names = [f"{prefix}{index:02d}.ts" for index in range(20) for prefix in ('a', 'B', 'c')]
+    for name in names:
+        (directory / name).write_text('', encoding='utf-8')
+    monkeypatch.setattr(filemap, 'NAME_SORT_RUN', 4)
+    monkeypatch.setattr(filemap, 'NAME_SORT_MAX_RUNS', 3)
+
+    entry = Entry('Many', [], [], [], [], [], [], file_map_path='many')
+
+    assert list(filemap.iter_tracked_names(entry, workspace.root)) == sorted(names, key=str.lower)
+
+
+@pytest.mark.parametrize('flags', [['--budget-ms', '100'], ['--shard', '1/2'], ['--diff-report'], ['merge']])
+def test_stream_rejects_modes_that_need_per_doc_state(workspace: Workspace, flags: list[str]) -> None:
+    with pytest.raises(SystemExit, match='--stream'):
+        generate_claude_docs.main(['--root', str(workspace.root), '--stream', *flags])
+
+
+def test_failed_streamed_run_keeps_the_previous_stats(workspace: Workspace, monkeypatch: pytest.MonkeyPatch) -> None:
+    regenerate_all(SectionCache(), workspace=workspace)
+    expected = load_directory_stats(workspace)
+
+    def fail(*args: object) -> bool:
+        raise OSError('disk full')
+
+    monkeypatch.setattr('claude_docs.pipeline.write_entry_streaming', fail)
+    with pytest.raises(OSError):
+        regenerate_all(SectionCache(retain=False), stream=True, workspace=workspace)
+
+    assert load_directory_stats(workspace) == expected
+    assert list(workspace.resolve(STATE_DIR).glob('*.tmp')) == []
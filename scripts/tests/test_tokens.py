@@ -0,0 +1,96 @@
+"""섹션별 문자 수·근사 토큰 수와 file map 합계 줄 확인."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from claude_docs.cache import SectionCache
+from claude_docs.extraction import (
+    estimate_tokens,
+    estimate_tokens_by_chars,
+    estimate_tokens_by_pieces,
+    extract_sized_sections,
+    format_file_map_bullets,
+    measure_sections,
+    resolve_tokenizer,
+)
+from claude_docs.model import Workspace
+from claude_docs.pipeline import regenerate_all
+
+
+@pytest.mark.parametrize(
+    ('text', 'heuristic', 'pieces', 'chars'),
+    [
+        ('', 0, 0, 0),
+        ('abcdefg', 2, 2, 2),
+        ('한글', 2, 2, 1),
+        ('hello world 12345', 5, 6, 5),
+        ('f(x);', 2, 5, 2),
+    ],
+)
+def test_tokenizer_estimates(text: str, heuristic: int, pieces: int, chars: int) -> None:
+    assert estimate_tokens(text) == heuristic
+    assert estimate_tokens_by_pieces(text) == pieces
+    assert estimate_tokens_by_chars(text) == chars
+
+
+def test_resolve_tokenizer() -> None:
+    assert resolve_tokenizer('pieces') is estimate_tokens_by_pieces
+    assert resolve_tokenizer('builtins:len')('abc') == 3
+    with pytest.raises(ValueError, match='unknown tokenizer'):
+        resolve_tokenizer('nope')
+
+
+def test_streamed_and_listed_lines_measure_the_same() -> None:
+    lines = ['# Title', 'intro', '## Child', 'body 본문', '', '## Sibling', 'tail']
+    # 중첩된 마크다운 섹션처럼 범위가 겹치는 경우도 포함
+    sections = [(1, 7, 'Title', ''), (3, 5, 'Child', ''), (6, 7, 'Sibling', '')]
+
+    listed = measure_sections(lines, sections, estimate_tokens)
+
+    assert listed == measure_sections(iter(lines), sections, estimate_tokens)
+    assert listed[1] == (len('## Child\nbody 본문\n\n'), estimate_tokens('## Child\nbody 본문\n\n'))
+
+
+def test_sizes_cover_each_section_text(tmp_path: Path) -> None:
+    path = tmp_path / 'sample.ts'
+    path.write_text('// SECTION: A - 첫째\nconst a = 1;\n// SECTION: B - 둘째\nconst 값 = 2;\n', encoding='utf-8')
+
+    sections, sizes, line_count = extract_sized_sections(path, len)
+
+    assert line_count == 4
+    assert [section[2] for section in sections] == ['A', 'B']
+    first, second = '// SECTION: A - 첫째\nconst a = 1;\n', '// SECTION: B - 둘째\nconst 값 = 2;\n'
+    # 토크나이저로 len을 주면 토큰 수도 문자 수와 같음
+    assert sizes == [(len(first), len(first)), (len(second), len(second))]
+
+
+def test_bullets_carry_the_sizes() -> None:
+    bullets = format_file_map_bullets('app.ts', [(1, 3, 'App', '진입점'), (4, 5, 'Helpers', '')], [(1234, 300), (10, 3)])
+    assert bullets == ['- app.ts 01~03 App - 진입점 [1,234자 · ~300 tok]', '- app.ts 04~05 Helpers [10자 · ~3 tok]']
+
+
+def test_file_map_summary_adds_up_the_directory(workspace: Workspace) -> None:
+    regenerate_all(SectionCache(tokenizer='chars'), workspace=workspace)
+
+    measured = [
+        extract_sized_sections(workspace.resolve(name), estimate_tokens_by_chars) for name in ('src/app.ts', 'src/util.py')
+    ]
+    chars = sum(size for _, sizes, _ in measured for size, _ in sizes)
+    tokens = sum(count for _, sizes, _ in measured for _, count in sizes)
+    lines = sum(line_count for _, _, line_count in measured)
+    text = workspace.resolve('src/claude.md').read_text(encoding='utf-8')
+
+    assert f"- 합계: 파일 2개 · 섹션 3개 · {lines:,}줄 · {chars:,}자 · ~{tokens:,} tok" in text
+    assert '- 확장자별: .py 1 · .ts 1' in text
+
+
+def test_tokenizer_changes_the_estimates(workspace: Workspace) -> None:
+    regenerate_all(SectionCache(tokenizer='chars'), workspace=workspace)
+    by_chars = workspace.resolve('src/claude.md').read_text(encoding='utf-8')
+    regenerate_all(SectionCache(tokenizer='pieces'), workspace=workspace)
+    by_pieces = workspace.resolve('src/claude.md').read_text(encoding='utf-8')
+
+    assert by_chars != by_pieces
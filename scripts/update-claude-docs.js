@@ -12,6 +12,7 @@
  * - 컴포넌트/훅/유틸리티 개수 자동 카운팅
  */
 
+const { execFileSync } = require('child_process');
 const fs = require('fs');
 const path = require('path');
 
@@ -20,32 +21,78 @@ class ClaudeDocUpdater {
     this.projectRoot = path.resolve(__dirname, '..');
     this.srcPath = path.join(this.projectRoot, 'src');
     this.mainClaudePath = path.join(this.projectRoot, 'claude.md');
+    this.generatorStatsPath = path.join(this.projectRoot, '.claude-docs', 'stats.json');
+    this.generatorStats = null;
   }
 
   /**
-   * 디렉토리 내 파일 개수 카운팅
+   * generate_claude_docs.py를 실행해 .claude-docs/stats.json을 최신으로 만든 뒤 다음 조회에서 다시 로드
+   * 상태 디렉토리는 git에서 제외되므로 새로 받은 저장소에는 통계가 없음
+   * 파이썬 실행 파일은 PYTHON 환경 변수로 바꿀 수 있음
    */
-  countFiles(dirPath, extensions = []) {
+  runGenerator() {
+    const python = process.env.PYTHON || 'python3';
+    const script = path.join(this.projectRoot, 'scripts', 'generate_claude_docs.py');
     try {
-      if (!fs.existsSync(dirPath)) return 0;
-
-      const files = fs.readdirSync(dirPath);
-      if (extensions.length === 0) {
-        return files.filter(file =>
-          !file.startsWith('.') &&
-          !file.includes('claude.md') &&
-          fs.statSync(path.join(dirPath, file)).isFile()
-        ).length;
-      }
+      execFileSync(python, [script], { cwd: this.projectRoot, stdio: ['ignore', 'ignore', 'inherit'] });
+    } catch (error) {
+      throw new Error(`문서 생성기 실행에 실패했습니다 (${python} ${path.relative(this.projectRoot, script)}: ${error.message})`);
+    }
+    this.generatorStats = null;
+  }
+
+  /**
+   * generate_claude_docs.py가 스캔 중 집계한 디렉토리별 통계를 프로세스당 한 번만 로드
+   * 파일이 없거나 형식·루트가 다르면 예외 → 생성기를 먼저 실행해야 함
+   */
+  loadGeneratorStats() {
+    if (this.generatorStats) return this.generatorStats;
 
-      return files.filter(file => {
-        const ext = path.extname(file).toLowerCase();
-        return extensions.includes(ext) && !file.includes('claude.md');
-      }).length;
+    const hint = 'python3 scripts/generate_claude_docs.py를 먼저 실행하세요.';
+    let data;
+    let mtimeMs;
+    try {
+      data = JSON.parse(fs.readFileSync(this.generatorStatsPath, 'utf8'));
+      mtimeMs = fs.statSync(this.generatorStatsPath).mtimeMs;
     } catch (error) {
-      console.error(`Error counting files in ${dirPath}:`, error.message);
-      return 0;
+      throw new Error(`생성기 통계를 읽을 수 없습니다 (${error.message}). ${hint}`);
+    }
+    if (data.version !== 2) {
+      throw new Error(`생성기 통계 형식이 다릅니다 (version ${data.version}). ${hint}`);
+    }
+    const root = fs.realpathSync(this.projectRoot).split(path.sep).join('/');
+    if (data.root !== root) {
+      throw new Error(`다른 루트(${data.root})의 생성기 통계입니다. ${hint}`);
+    }
+    this.generatorStats = { directories: data.directories, mtimeMs, hint };
+    return this.generatorStats;
+  }
+
+  /**
+   * 생성기 통계에서 디렉토리 항목 조회
+   * 통계는 디렉토리 바로 아래 파일만 집계하므로, 항목 추가·삭제로 바뀌는 디렉토리 mtime이 통계보다 새로우면 낡은 것으로 봄
+   */
+  directoryStats(dirPath) {
+    const { directories, mtimeMs, hint } = this.loadGeneratorStats();
+    const relative = path.relative(this.projectRoot, dirPath).split(path.sep).join('/');
+    if (!fs.existsSync(dirPath)) return null;
+    if (fs.statSync(dirPath).mtimeMs > mtimeMs) {
+      throw new Error(`${relative}가 생성기 통계 이후 변경되었습니다. ${hint}`);
+    }
+    if (!directories[relative]) {
+      throw new Error(`${relative}는 생성기 레지스트리에 없는 디렉토리입니다.`);
     }
+    return directories[relative];
+  }
+
+  /**
+   * 디렉토리 내 파일 개수 카운팅
+   */
+  countFiles(dirPath, extensions = []) {
+    const stats = this.directoryStats(dirPath);
+    if (!stats) return 0;
+    if (extensions.length === 0) return stats.files;
+    return extensions.reduce((total, ext) => total + (stats.extensions[ext] || 0), 0);
   }
 
   /**
@@ -76,29 +123,15 @@ class ClaudeDocUpdater {
    * 페이지 개수 카운팅
    */
   countPages() {
-    const appPath = path.join(this.srcPath, 'app');
-    let pageCount = 0;
-
-    // 루트 page.tsx
-    if (fs.existsSync(path.join(appPath, 'page.tsx'))) {
-      pageCount++;
-    }
-
-    // 하위 디렉토리의 page.tsx들
-    try {
-      const dirs = fs.readdirSync(appPath)
-        .filter(item => fs.statSync(path.join(appPath, item)).isDirectory());
-
-      dirs.forEach(dir => {
-        if (fs.existsSync(path.join(appPath, dir, 'page.tsx'))) {
-          pageCount++;
-        }
-      });
-    } catch (error) {
-      console.error('Error counting pages:', error.message);
-    }
-
-    return pageCount;
+    const { directories } = this.loadGeneratorStats();
+    // 루트와 바로 아래 디렉토리의 page.tsx (각 디렉토리의 신선도는 directoryStats가 확인)
+    return Object.keys(directories)
+      .filter(dir => dir === 'src/app' || (dir.startsWith('src/app/') && !dir.slice(8).includes('/')))
+      .filter(dir => {
+        const stats = this.directoryStats(path.join(this.projectRoot, dir));
+        return stats !== null && stats.names.includes('page.tsx');
+      })
+      .length;
   }
 
   /**
@@ -201,6 +234,7 @@ NEW_UI_Components/
 
     } catch (error) {
       console.error('❌ 메인 claude.md 업데이트 실패:', error.message);
+      process.exitCode = 1;
       return false;
     }
   }
@@ -497,6 +531,17 @@ if (require.main === module) {
 
   const args = process.argv.slice(2);
 
+  // 개수는 생성기 통계에서만 읽으므로 생성기를 먼저 실행하고, 그래도 통계를 읽지 못하면 아무것도 갱신하지 않고 종료
+  if (args.length === 0 || args[0] === '--dir') {
+    try {
+      updater.runGenerator();
+      updater.loadGeneratorStats();
+    } catch (error) {
+      console.error(`❌ ${error.message}`);
+      process.exit(1);
+    }
+  }
+
   if (args.length === 0) {
     // 전체 업데이트
     updater.updateAll();
@@ -152,6 +152,9 @@ class ClaudeDocWatcher {
       const updates = Array.from(this.updateQueue);
       this.updateQueue.clear();
 
+      // 바뀐 디렉토리의 통계는 낡은 것으로 거부되므로 생성기를 다시 실행해 통계부터 갱신
+      this.updater.runGenerator();
+
       // 메인 문서 업데이트
       if (updates.includes('main')) {
         this.updater.updateMainClaudeDoc();
@@ -218,7 +221,12 @@ class ClaudeDocWatcher {
     // 초기 업데이트 실행
     setTimeout(() => {
       console.log('🔄 초기 문서 업데이트 실행...');
-      this.updater.updateAll();
+      try {
+        this.updater.runGenerator();
+        this.updater.updateAll();
+      } catch (error) {
+        console.error('❌ 초기 업데이트 실패:', error.message);
+      }
       console.log('\n⏳ 파일 변경을 기다리는 중...\n');
     }, 2000);
   }